@@ -1,9 +1,13 @@
 import pprint
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
 
 import ape
 from ape.logging import logger
 
 from .addresses import CONVEX_VOTERPROXY
+from .ipfs import get_ipfs_hash_from_description
+from .vote_utils import make_vote
 
 
 def simulate(vote_id: int, voting_contract: str):
@@ -35,3 +39,56 @@ def simulate(vote_id: int, voting_contract: str):
     enacter = ape.accounts[CONVEX_VOTERPROXY]
     aragon.executeVote(vote_id, sender=enacter)
     logger.info("Vote Executed!")
+
+
+class SimulationHarness:
+    """Runs proposal scenarios from one shared chain snapshot.
+
+    The snapshot is taken once, after the (expensive) vote creator setup,
+    and every scenario is reverted back to it instead of re-forking and
+    re-locking CRV. Scenarios are therefore independent and cheap enough to
+    run hundreds of parameter sweeps in one session.
+
+    Args:
+        vote_creator (str): account holding enough veCRV to create votes
+    """
+
+    def __init__(self, vote_creator):
+        self.vote_creator = vote_creator
+        self._ipfs_hashes: Dict[str, str] = {}
+        self.snapshot_id = ape.chain.snapshot()
+
+    def create_vote(self, target: Dict, actions: List[Tuple], description: str = "test") -> int:
+        """Creates a vote and returns its id. Descriptions are uploaded to IPFS once."""
+        if description not in self._ipfs_hashes:
+            self._ipfs_hashes[description] = get_ipfs_hash_from_description(description)
+
+        tx = make_vote(
+            target=target,
+            actions=actions,
+            description=description,
+            vote_creator=self.vote_creator,
+            ipfs_hash=self._ipfs_hashes[description],
+        )
+        for log in tx.decode_logs():
+            return log.event_arguments["voteId"]
+
+    def pass_vote(self, target: Dict, actions: List[Tuple], description: str = "test") -> int:
+        """Creates a vote, passes and executes it, advancing the chain by `voteTime`."""
+        vote_id = self.create_vote(target, actions, description)
+        simulate(vote_id=vote_id, voting_contract=target["voting"])
+        return vote_id
+
+    def reset(self):
+        """Reverts the chain to the snapshot taken after setup."""
+        ape.chain.restore(self.snapshot_id)
+        # reverting consumes the snapshot on hardhat
+        self.snapshot_id = ape.chain.snapshot()
+
+    @contextmanager
+    def scenario(self):
+        """Runs the enclosed block on the snapshot, reverting afterwards."""
+        try:
+            yield self
+        finally:
+            self.reset()
@@ -1,6 +1,7 @@
+import struct
 import warnings
 from datetime import datetime
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import ape
 from ape.exceptions import ContractLogicError
@@ -33,22 +34,28 @@ def prepare_vote_script(target: Dict, actions: List[Tuple]) -> str:
     logger.info(f"Agent Contract: {agent.address}")
     logger.info(f"Voting Contract: {voting}")
 
-    evm_script = bytes.fromhex("00000001")
+    # collect the parts and join once: concatenating in the loop is quadratic
+    evm_script = [bytes.fromhex("00000001")]
+    agent_address = bytes.fromhex(agent.address[2:])
 
     for address, fn_name, *args in actions:
         contract = ape.Contract(address)
         fn = getattr(contract, fn_name)
         calldata = bytes(fn.encode_input(*args))
         agent_calldata = bytes(agent.execute.encode_input(address, 0, calldata))
-        length = bytes.fromhex(hex(len(agent_calldata.hex()) // 2)[2:].zfill(8))
-        evm_script = (
-            evm_script + bytes.fromhex(agent.address[2:]) + length + agent_calldata
-        )
+        evm_script.append(struct.pack(">20sI", agent_address, len(agent_calldata)))
+        evm_script.append(agent_calldata)
 
-    return evm_script
+    return b"".join(evm_script)
 
 
-def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator: str):
+def make_vote(
+    target: Dict,
+    actions: List[Tuple],
+    description: str,
+    vote_creator: str,
+    ipfs_hash: Optional[str] = None,
+):
     """Prepares EVM script and creates an on-chain AragonDAO vote.
 
     Args:
@@ -56,6 +63,7 @@ def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator
         actions (list(tuple)): ("target addr", "fn_name", *args)
         vote_creator (str): msg.sender address
         description (str): Description of the on-chain governance proposal
+        ipfs_hash (str): IPFS hash of `description` if already uploaded
 
     Returns:
         str: vote ID of the created vote.
@@ -66,7 +74,8 @@ def make_vote(target: Dict, actions: List[Tuple], description: str, vote_creator
     evm_script = prepare_vote_script(target, actions)
     logger.info(f"EVM script: {evm_script}")
 
-    ipfs_hash = get_ipfs_hash_from_description(description)
+    if ipfs_hash is None:
+        ipfs_hash = get_ipfs_hash_from_description(description)
     tx = aragon.newVote(
         evm_script,
         f"ipfs:{ipfs_hash}",
@@ -2,6 +2,7 @@ import ape
 import pytest
 
 from curve_dao.addresses import CRV, CURVE_DAO_OWNERSHIP, CURVE_DAO_PARAM, VOTING_ESCROW
+from curve_dao.simulate import SimulationHarness
 
 
 @pytest.fixture(scope="module")
@@ -48,3 +49,16 @@ def vote_deployer():
     crv_token.approve(voting_escrow.address, amount, sender=user)
     voting_escrow.create_lock(amount, locktime, sender=user)
     return user
+
+
+@pytest.fixture(scope="module")
+def simulation(vote_deployer):
+    """Chain snapshot taken once the vote deployer holds veCRV."""
+    return SimulationHarness(vote_deployer)
+
+
+@pytest.fixture
+def scenario(simulation):
+    """Proposal scenario reverted to the post-setup snapshot when the test ends."""
+    with simulation.scenario():
+        yield simulation
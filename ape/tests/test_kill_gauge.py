@@ -2,8 +2,6 @@ import ape
 import pytest
 
 from curve_dao.addresses import CRYPTOSWAP_OWNER_PROXY, CURVE_DAO_OWNERSHIP
-from curve_dao.simulate import simulate
-from curve_dao.vote_utils import make_vote
 
 
 @pytest.fixture(scope="module")
@@ -18,7 +16,7 @@ def tricrypto_ng_gauge():
     yield ape.Contract("0x4fc86cd0f9b650280fa783e3116258e0e0496a2c")
 
 
-def test_kill_factory_gauge(vote_deployer, crypto_factory_gauge):
+def test_kill_factory_gauge(scenario, crypto_factory_gauge):
     assert crypto_factory_gauge.is_killed() is False
 
     parameter_action = (
@@ -28,27 +26,13 @@ def test_kill_factory_gauge(vote_deployer, crypto_factory_gauge):
         True,
     )
 
-    tx = make_vote(
-        target=CURVE_DAO_OWNERSHIP,
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_OWNERSHIP["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_OWNERSHIP, [parameter_action])
 
     assert crypto_factory_gauge.is_killed() is True
 
 
-def test_kill_ng_gauge(vote_deployer, tricrypto_ng_gauge):
+def test_kill_ng_gauge(scenario, tricrypto_ng_gauge):
     assert tricrypto_ng_gauge.is_killed() is False
 
     parameter_action = (
@@ -57,21 +41,8 @@ def test_kill_ng_gauge(vote_deployer, tricrypto_ng_gauge):
         True,
     )
 
-    tx = make_vote(
-        target=CURVE_DAO_OWNERSHIP,  # tricrypto-ng factory admin is OWNERSHIP agent
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
+    # tricrypto-ng factory admin is OWNERSHIP agent
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_OWNERSHIP["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_OWNERSHIP, [parameter_action])
 
     assert tricrypto_ng_gauge.is_killed() is True
@@ -6,8 +6,6 @@ from curve_dao.addresses import (
     CURVE_DAO_OWNERSHIP,
     CURVE_DAO_PARAM,
 )
-from curve_dao.simulate import simulate
-from curve_dao.vote_utils import make_vote
 
 
 @pytest.fixture(scope="module")
@@ -24,7 +22,7 @@ def tricrypto_pool():
     # yield ape.Contract("0x4ebdf703948ddcea3b11f675b4d1fba9d2414a14")
 
 
-def test_crypto_factory_ramp_parameters(vote_deployer, crypto_factory_pool):
+def test_crypto_factory_ramp_parameters(scenario, crypto_factory_pool):
     week_seconds = 7 * 86400
     block = ape.chain.blocks[-1]
     last_timestamp = block.timestamp
@@ -45,22 +43,8 @@ def test_crypto_factory_ramp_parameters(vote_deployer, crypto_factory_pool):
     assert crypto_factory_pool.A() != future_A
     assert crypto_factory_pool.gamma() != future_gamma
 
-    tx = make_vote(
-        target=CURVE_DAO_PARAM,
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_PARAM["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_PARAM, [parameter_action])
 
     # need to advance another week to finish the ramp
     ape.chain.mine(deltatime=week_seconds)
@@ -69,7 +53,7 @@ def test_crypto_factory_ramp_parameters(vote_deployer, crypto_factory_pool):
     assert crypto_factory_pool.gamma() == future_gamma
 
 
-def test_ng_ramp_parameters(vote_deployer, tricrypto_pool):
+def test_ng_ramp_parameters(scenario, tricrypto_pool):
     week_seconds = 7 * 86400
     block = ape.chain.blocks[-1]
     last_timestamp = block.timestamp
@@ -89,22 +73,9 @@ def test_ng_ramp_parameters(vote_deployer, tricrypto_pool):
     assert tricrypto_pool.A() != future_A
     assert tricrypto_pool.gamma() != future_gamma
 
-    tx = make_vote(
-        target=CURVE_DAO_OWNERSHIP,  # tricrypto-ng factory admin is OWNERSHIP agent
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
+    # tricrypto-ng factory admin is OWNERSHIP agent
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_OWNERSHIP["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_OWNERSHIP, [parameter_action])
 
     # need to advance another week to finish the ramp
     ape.chain.mine(deltatime=week_seconds)
@@ -114,7 +85,7 @@ def test_ng_ramp_parameters(vote_deployer, tricrypto_pool):
 
 
 @pytest.mark.skip("Need to resolve aragon error toward end of test")
-def test_crypto_factory_commit_parameters(vote_deployer, crypto_factory_pool):
+def test_crypto_factory_commit_parameters(scenario, crypto_factory_pool):
     # new
     new_mid_fee = 35000000
     new_out_fee = 50000000
@@ -141,22 +112,8 @@ def test_crypto_factory_commit_parameters(vote_deployer, crypto_factory_pool):
     assert crypto_factory_pool.mid_fee() != new_mid_fee
     assert crypto_factory_pool.out_fee() != new_out_fee
 
-    tx = make_vote(
-        target=CURVE_DAO_PARAM,
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_PARAM["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_PARAM, [parameter_action])
 
     # admin actions delay is 3 days
     ape.chain.mine(deltatime=3 * 86400)
@@ -166,13 +123,13 @@ def test_crypto_factory_commit_parameters(vote_deployer, crypto_factory_pool):
     fn = getattr(owner_proxy, "apply_new_parameters")
     calldata = fn.as_transaction(crypto_factory_pool.address, sender=agent).data
     # FIXME: getting Aragon APP_AUTH_FAILED error here
-    agent.execute(owner_proxy.address, 0, calldata, sender=vote_deployer)
+    agent.execute(owner_proxy.address, 0, calldata, sender=scenario.vote_creator)
 
     assert crypto_factory_pool.mid_fee() == new_mid_fee
     assert crypto_factory_pool.out_fee() == new_out_fee
 
 
-def test_ng_commit_parameters(vote_deployer, tricrypto_pool):
+def test_ng_commit_parameters(scenario, tricrypto_pool):
     """
     TriCryptoINV
     A: 1707629
@@ -217,26 +174,13 @@ def test_ng_commit_parameters(vote_deployer, tricrypto_pool):
     assert tricrypto_pool.mid_fee() != new_mid_fee
     assert tricrypto_pool.out_fee() != new_out_fee
 
-    tx = make_vote(
-        target=CURVE_DAO_OWNERSHIP,  # tricrypto-ng factory admin is OWNERSHIP agent
-        actions=[parameter_action],
-        description="test",
-        vote_creator=vote_deployer,
-    )
-
-    for log in tx.decode_logs():
-        vote_id = log.event_arguments["voteId"]
-        break
-
+    # tricrypto-ng factory admin is OWNERSHIP agent
     # this advances the chain one week from vote creation
-    simulate(
-        vote_id=vote_id,
-        voting_contract=CURVE_DAO_OWNERSHIP["voting"],
-    )
+    scenario.pass_vote(CURVE_DAO_OWNERSHIP, [parameter_action])
 
     # admin actions delay is 3 days
     ape.chain.mine(deltatime=3 * 86400)
-    tricrypto_pool.apply_new_parameters(sender=vote_deployer)
+    tricrypto_pool.apply_new_parameters(sender=scenario.vote_creator)
 
     assert tricrypto_pool.mid_fee() == new_mid_fee
     assert tricrypto_pool.out_fee() == new_out_fee
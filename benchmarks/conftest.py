@@ -0,0 +1,62 @@
+import json
+import random
+from pathlib import Path
+
+import pytest
+from eth_utils import to_checksum_address
+
+from curve_dao.abi_cache import AbiCache
+from curve_dao.vote_record import VoteRecord
+
+# written by record_votes.py; "block" is the mainnet block its getVote results were read at
+VOTES_FILE = Path(__file__).parent / "data" / "votes.json"
+
+POOL_OWNER = "0xeCb456EA5365865EbAb8a2661B0c503410e9B347"
+GAUGE_OWNER = "0x2EF1Bc1961d3209E5743C91cd3fBfa0d08656bC3"
+CONTROLLER_FACTORY = "0xC9332fdCB1C491Dcc683bAe86Fe3cb70360738BC"
+
+
+@pytest.fixture(scope="session")
+def recorded():
+    data = json.loads(VOTES_FILE.read_text())
+    for vote in data["votes"]:
+        vote["script"] = bytes.fromhex(vote["script"][2:])
+        vote["record"] = VoteRecord(*vote["get_vote"], vote["script"])
+    return data
+
+
+@pytest.fixture(scope="session")
+def abi_cache(recorded, tmp_path_factory):
+    """Offline ABI cache holding the fixture ABIs, warmed like a repeat CLI run."""
+    abi_cache = AbiCache(root=tmp_path_factory.mktemp("abi"), offline=True)
+    for address, abi in recorded["abis"].items():
+        abi_cache.put(address, abi)
+        abi_cache.get_selector_index(address)
+    return abi_cache
+
+
+def synthetic_actions(num_actions: int, seed: int = 0):
+    """`prepare_evm_script` actions cycling through the functions of the fixture votes."""
+    rng = random.Random(seed)
+
+    def address():
+        return to_checksum_address(rng.randbytes(20))
+
+    makers = [
+        lambda: (GAUGE_OWNER, "set_killed", address(), rng.random() < 0.5),
+        lambda: (POOL_OWNER, "commit_new_fee", address(), rng.randrange(10**8), 5 * 10**9),
+        lambda: (
+            CONTROLLER_FACTORY,
+            "add_market",
+            address(),
+            rng.randrange(50, 500),
+            rng.randrange(10**16),
+            0,
+            address(),
+            address(),
+            9 * 10**16,
+            6 * 10**16,
+            rng.randrange(10**26),
+        ),
+    ]
+    return [makers[i % len(makers)]() for i in range(num_actions)]
@@ -0,0 +1,83 @@
+"""Records the benchmark fixture, data/votes.json, from mainnet.
+
+Every `getVote` result is read at a single pinned block, which is stored in
+the fixture, and the ABIs are the verified ones from Etherscan. Run it under
+a cassette to keep the raw responses alongside:
+
+    $ CURVE_DAO_CASSETTE=benchmarks/data/cassette CURVE_DAO_CASSETTE_MODE=record \
+        python3 -m benchmarks.record_votes --block 21000000
+"""
+import json
+
+import click
+from eth_abi import decode
+from eth_utils import to_checksum_address
+
+from curve_dao.abi_cache import AbiCache
+from curve_dao.evm_script import parse_evm_script
+from curve_dao.rpc import RpcClient
+from curve_dao.session import default_rpc_url
+from curve_dao.voting_reader import VotingReader
+
+from .conftest import VOTES_FILE
+
+FIXTURE_VOTES = [("ownership", 223), ("ownership", 404), ("parameter", 69)]
+
+
+def record_votes(rpc: RpcClient, block: int, abi_cache: AbiCache) -> dict:
+    votes = []
+    addresses = set()
+    for vote_type, vote_id in FIXTURE_VOTES:
+        reader = VotingReader.for_vote_type(rpc, vote_type, block_identifier=block)
+        (vote,) = reader.get_votes([vote_id])
+        if vote is None:
+            raise click.ClickException(f"{vote_type} vote {vote_id} does not exist at {block}")
+
+        script = bytes(vote.script)
+        for agent, calldata in parse_evm_script(script):
+            target = decode(["address", "uint256", "bytes"], bytes(calldata[4:]))[0]
+            addresses.update(to_checksum_address(a) for a in (agent, target))
+
+        get_vote = [
+            vote.open,
+            vote.executed,
+            vote.start_date,
+            vote.snapshot_block,
+            vote.support_required,
+            vote.min_accept_quorum,
+            vote.yea,
+            vote.nay,
+            vote.voting_power,
+        ]
+        votes.append(
+            {
+                "vote_type": vote_type,
+                "vote_id": vote_id,
+                "get_vote": get_vote,
+                "script": "0x" + script.hex(),
+            }
+        )
+
+    return {
+        "_source": f"Recorded from mainnet at block {block} with benchmarks/record_votes.py.",
+        "block": block,
+        "abis": {address: abi_cache.get_abi(address) for address in sorted(addresses)},
+        "votes": votes,
+    }
+
+
+@click.command()
+@click.option("--rpc-url", default=None, help="Mainnet node, defaults to Alchemy.")
+@click.option("--block", type=int, default=None, help="Block to read at, defaults to latest.")
+def main(rpc_url, block):
+    rpc = RpcClient(rpc_url or default_rpc_url())
+    if block is None:
+        block = int(rpc.call("eth_blockNumber"), 16)
+
+    fixture = record_votes(rpc, block, AbiCache())
+    VOTES_FILE.write_text(json.dumps(fixture, indent=2) + "\n")
+    click.echo(f"Recorded {len(fixture['votes'])} votes at block {block} to {VOTES_FILE}")
+
+
+if __name__ == "__main__":
+    main()
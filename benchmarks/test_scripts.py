@@ -0,0 +1,79 @@
+import pytest
+from eth_abi import decode
+
+from curve_dao.addresses import CURVE_DAO_OWNERSHIP
+from curve_dao.decoder_utils import decode_input, decode_value
+from curve_dao.evm_script import parse_evm_script
+from curve_dao.vote_utils import decode_vote_script, prepare_evm_script
+
+from .conftest import CONTROLLER_FACTORY, synthetic_actions
+
+SCRIPT_SIZES = [1, 10, 100, 1000]
+
+
+def vote(recorded, vote_id):
+    return next(v for v in recorded["votes"] if v["vote_id"] == vote_id)
+
+
+def agent_calls(script):
+    """(target, calldata) of the calls each agent action makes."""
+    return [
+        decode(["address", "uint256", "bytes"], bytes(calldata[4:]))[::2]
+        for _, calldata in parse_evm_script(script)
+    ]
+
+
+@pytest.mark.parametrize("vote_id", [223, 404, 69])
+def test_decode_vote_script(benchmark, recorded, abi_cache, vote_id):
+    actions = benchmark(decode_vote_script, vote(recorded, vote_id)["script"], abi_cache)
+
+    assert all(action["function"] != "execute" for action in actions)
+
+
+def test_prepare_evm_script(benchmark, recorded, abi_cache):
+    recorded_vote = vote(recorded, 223)
+    actions = []
+    for target, calldata in agent_calls(recorded_vote["script"]):
+        abi, inputs = decode_input(target, calldata, abi_cache)
+        actions.append((target, abi["name"], *inputs))
+
+    script = benchmark(prepare_evm_script, CURVE_DAO_OWNERSHIP, actions, abi_cache)
+
+    assert script == recorded_vote["script"]
+
+
+@pytest.mark.parametrize("num_actions", SCRIPT_SIZES)
+def test_prepare_evm_script_scaling(benchmark, abi_cache, num_actions):
+    actions = synthetic_actions(num_actions)
+
+    script = benchmark(prepare_evm_script, CURVE_DAO_OWNERSHIP, actions, abi_cache)
+
+    assert len(parse_evm_script(script)) == num_actions
+
+
+@pytest.mark.parametrize("num_actions", SCRIPT_SIZES)
+def test_decode_vote_script_scaling(benchmark, abi_cache, num_actions):
+    script = prepare_evm_script(CURVE_DAO_OWNERSHIP, synthetic_actions(num_actions), abi_cache)
+
+    actions = benchmark(decode_vote_script, script, abi_cache)
+
+    assert len(actions) == num_actions
+
+
+def test_decode_input(benchmark, recorded, abi_cache):
+    target, calldata = agent_calls(vote(recorded, 404)["script"])[1]
+    assert target == CONTROLLER_FACTORY.lower()
+
+    abi, inputs = benchmark(decode_input, target, calldata, abi_cache)
+
+    assert abi["name"] == "add_market" and inputs[1] == 100
+
+
+def test_decode_value(benchmark, recorded, abi_cache):
+    target, calldata = agent_calls(vote(recorded, 404)["script"])[1]
+    abi = abi_cache.get_selector_index(target)["0x" + calldata[:4].hex()]
+    raw_inputs = decode([i["type"] for i in abi["inputs"]], calldata[4:])
+
+    values = benchmark(lambda: [decode_value(v) for v in raw_inputs])
+
+    assert values[0] == "0x18084fbA666a33d37592fA2633fD49a74DD93a88"
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .selectors import build_function_signature, build_selector_index
+from .transport import get_session
+
+ETHERSCAN_API = "https://api.etherscan.io/v2/api"
+MAINNET_CHAIN_ID = 1
+
+# verified, non-proxy ABIs never change for a given address. Proxies can be
+# upgraded and unverified contracts can be verified later, so those entries
+# are refreshed once they are older than the TTL.
+DEFAULT_TTL = 7 * 86400
+
+
+class MissingAbi(Exception):
+    """Exception raised when no ABI is available for an address."""
+
+
+def default_cache_dir() -> Path:
+    cache_dir = os.getenv("CURVE_DAO_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / ".cache" / "curve-dao"
+
+
+class AbiCache:
+    """On-disk ABI store keyed by chain id and address.
+
+    ABIs are stored once under their sha256 content hash in `abi/blobs/`, and
+    every address gets a small index entry in `abi/<chain id>/<address>.json`
+    pointing at the blob, plus the implementation address for proxies. Every
+    address is fetched from Etherscan at most once per process.
+
+    Each blob has its 4-byte selector index persisted next to it, and
+    `abi/selectors.json` collects the functions of every ABI ever stored so
+    calldata to unknown contracts can still be decoded by signature.
+
+    Args:
+        root (Path): cache directory, defaults to `$CURVE_DAO_CACHE_DIR`
+            or `~/.cache/curve-dao`
+        chain_id (int): chain the addresses live on
+        api_key (str): Etherscan API key, defaults to `$ETHERSCAN_API_KEY`
+        ttl (int): seconds after which proxy and unverified entries are refetched
+        offline (bool): never hit Etherscan, serve whatever is on disk
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        chain_id: int = MAINNET_CHAIN_ID,
+        api_key: Optional[str] = None,
+        ttl: int = DEFAULT_TTL,
+        offline: bool = False,
+    ):
+        self.root = Path(root or default_cache_dir()) / "abi"
+        self.chain_id = chain_id
+        self.api_key = api_key or os.getenv("ETHERSCAN_API_KEY")
+        self.ttl = ttl
+        self.offline = offline
+        self._entries: Dict[str, Dict] = {}
+        self._blobs: Dict[str, List[Dict]] = {}
+        self._selector_indexes: Dict[str, Dict[str, Dict]] = {}
+        self._global_selectors: Optional[Dict[str, List[Dict]]] = None
+
+    def get_abi(self, address: str) -> List[Dict]:
+        """Returns the ABI of a contract, following proxies to their implementation."""
+        entry = self._get_entry(address)
+        abi = self._load_blob(entry["abi"]) if entry["abi"] else []
+
+        implementation = entry.get("implementation")
+        if implementation and implementation.lower() != address.lower():
+            try:
+                impl_abi = self.get_abi(implementation)
+            except MissingAbi:
+                impl_abi = []
+            impl_entries = {json.dumps(i, sort_keys=True) for i in impl_abi}
+            abi = impl_abi + [
+                i for i in abi if json.dumps(i, sort_keys=True) not in impl_entries
+            ]
+
+        if not abi:
+            raise MissingAbi(f"No verified ABI for {address}")
+
+        return abi
+
+    def get_selector_index(self, address: str) -> Dict[str, Dict]:
+        """Returns a selector -> ABI entry mapping for `address`, including proxies."""
+        key = address.lower()
+        if key in self._selector_indexes:
+            return self._selector_indexes[key]
+
+        entry = self._get_entry(address)
+        index = {}
+        implementation = entry.get("implementation")
+        if implementation and implementation.lower() != key:
+            try:
+                index.update(self.get_selector_index(implementation))
+            except MissingAbi:
+                pass
+
+        if entry["abi"]:
+            abi = self._load_blob(entry["abi"])
+            for selector, position in self._load_blob_selectors(entry["abi"]).items():
+                index.setdefault(selector, abi[position])
+
+        if not index:
+            raise MissingAbi(f"No verified ABI for {address}")
+
+        self._selector_indexes[key] = index
+        return index
+
+    def lookup_selector(self, selector: str) -> Optional[Dict]:
+        """Returns the first known function, across all cached ABIs, matching `selector`."""
+        matches = self._load_global_selectors().get(selector)
+        return matches[0] if matches else None
+
+    def get_implementation(self, address: str) -> Optional[str]:
+        return self._get_entry(address).get("implementation")
+
+    def load_contract(self, address: str, name: str = "Contract"):
+        """Returns a boa contract handle at `address` built from the cached ABI."""
+        # boa and vyper take seconds to import; only load them for contract handles
+        import boa
+
+        abi = self.get_abi(address)
+        return boa.loads_abi(json.dumps(abi), name=name).at(address)
+
+    def put(
+        self,
+        address: str,
+        abi: Optional[List[Dict]],
+        implementation: Optional[str] = None,
+    ) -> Dict:
+        """Stores an ABI for `address`. `abi=None` records a known-unverified contract."""
+        blob_hash = self._store_blob(abi) if abi is not None else None
+        entry = {
+            "abi": blob_hash,
+            "implementation": implementation,
+            "fetched_at": int(time.time()),
+        }
+        path = self._entry_path(address)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, json.dumps(entry))
+        self._entries[address.lower()] = entry
+        self._selector_indexes.pop(address.lower(), None)
+        return entry
+
+    def invalidate(self, address: Optional[str] = None):
+        """Drops the index entry of `address`, or of every address on this chain.
+
+        Blobs are left in place: they are content-addressed and may be shared.
+        """
+        if address is None:
+            for path in self._chain_dir().glob("*.json"):
+                path.unlink()
+            self._entries.clear()
+            self._selector_indexes.clear()
+            return
+
+        self._entries.pop(address.lower(), None)
+        self._selector_indexes.pop(address.lower(), None)
+        self._entry_path(address).unlink(missing_ok=True)
+
+    def _get_entry(self, address: str) -> Dict:
+        key = address.lower()
+        if key in self._entries:
+            return self._entries[key]
+
+        entry = None
+        path = self._entry_path(address)
+        if path.exists():
+            entry = json.loads(path.read_text())
+            if not self.offline and self._is_stale(entry):
+                entry = None
+            else:
+                self._entries[key] = entry
+
+        if entry is None:
+            if self.offline:
+                raise MissingAbi(f"ABI for {address} is not in the local cache")
+            entry = self._fetch(address)
+
+        return entry
+
+    def _is_stale(self, entry: Dict) -> bool:
+        if entry["abi"] is not None and not entry.get("implementation"):
+            return False
+        return time.time() - entry["fetched_at"] > self.ttl
+
+    def _fetch(self, address: str) -> Dict:
+        response = get_session().get(
+            ETHERSCAN_API,
+            params={
+                "chainid": self.chain_id,
+                "module": "contract",
+                "action": "getsourcecode",
+                "address": address,
+                "apikey": self.api_key,
+            },
+            timeout=10,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") != "1":
+            raise MissingAbi(f"Etherscan error for {address}: {data.get('result')}")
+
+        result = data["result"][0]
+        abi = None
+        if result["ABI"] != "Contract source code not verified":
+            abi = json.loads(result["ABI"])
+
+        implementation = None
+        if result.get("Proxy") == "1" and result.get("Implementation"):
+            implementation = result["Implementation"]
+
+        return self.put(address, abi, implementation)
+
+    def _store_blob(self, abi: List[Dict]) -> str:
+        blob = json.dumps(abi, sort_keys=True, separators=(",", ":"))
+        blob_hash = hashlib.sha256(blob.encode()).hexdigest()
+        path = self._blob_path(blob_hash)
+        self._blobs[blob_hash] = abi
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write(path, blob)
+            self._add_global_selectors(abi)
+        return blob_hash
+
+    def _load_blob(self, blob_hash: str) -> List[Dict]:
+        if blob_hash not in self._blobs:
+            self._blobs[blob_hash] = json.loads(self._blob_path(blob_hash).read_text())
+        return self._blobs[blob_hash]
+
+    def _load_blob_selectors(self, blob_hash: str) -> Dict[str, int]:
+        path = self.root / "blobs" / f"{blob_hash}.selectors.json"
+        if path.exists():
+            return json.loads(path.read_text())
+
+        selectors = build_selector_index(self._load_blob(blob_hash))
+        _atomic_write(path, json.dumps(selectors))
+        return selectors
+
+    def _load_global_selectors(self) -> Dict[str, List[Dict]]:
+        if self._global_selectors is None:
+            path = self.root / "selectors.json"
+            self._global_selectors = (
+                json.loads(path.read_text()) if path.exists() else {}
+            )
+        return self._global_selectors
+
+    def _add_global_selectors(self, abi: List[Dict]):
+        global_selectors = self._load_global_selectors()
+        added = False
+        for selector, position in build_selector_index(abi).items():
+            matches = global_selectors.setdefault(selector, [])
+            # keep one entry per signature; argument names may differ between
+            # contracts but the decoding is the same
+            signatures = {build_function_signature(i) for i in matches}
+            if build_function_signature(abi[position]) not in signatures:
+                matches.append(abi[position])
+                added = True
+
+        if added:
+            _atomic_write(self.root / "selectors.json", json.dumps(global_selectors))
+
+    def _chain_dir(self) -> Path:
+        return self.root / str(self.chain_id)
+
+    def _entry_path(self, address: str) -> Path:
+        return self._chain_dir() / f"{address.lower()}.json"
+
+    def _blob_path(self, blob_hash: str) -> Path:
+        return self.root / "blobs" / f"{blob_hash}.json"
+
+
+def _atomic_write(path: Path, content: str):
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(content)
+    os.replace(tmp_path, path)
+
+
+_DEFAULT_CACHE: Optional[AbiCache] = None
+
+
+def get_abi_cache() -> AbiCache:
+    """Returns the process-wide ABI cache used when none is passed explicitly."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = AbiCache()
+    return _DEFAULT_CACHE
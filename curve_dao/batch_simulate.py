@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+import boa
+
+from .abi_cache import AbiCache, get_abi_cache
+from .addresses import get_dao_voting_contract
+from .rpc import RpcClient
+from .session import DaoSession, default_rpc_url
+from .simulate import SimulationReport, simulate
+from .transport import reset_session
+
+
+def simulate_votes(
+    vote_type: str,
+    vote_ids: Iterable[int],
+    rpc_url: Optional[str] = None,
+    block_number: Optional[int] = None,
+    abi_cache: Optional[AbiCache] = None,
+    workers: Optional[int] = None,
+    profile: bool = False,
+) -> List[SimulationReport]:
+    """Simulates many votes concurrently, each from the same untouched fork.
+
+    Every worker process forks mainnet once at `block_number` and simulates
+    each of its votes inside an anchor that is rolled back afterwards, so
+    votes never see each other's effects and a batch takes about as long
+    as its slowest vote.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        vote_ids (iterable(int)): votes to simulate
+        rpc_url (str): mainnet node, defaults to Alchemy with `$ALCHEMY_API_KEY`
+        block_number (int): block to fork at, defaults to the latest block
+        abi_cache (AbiCache): ABI store shared with the workers through disk
+        workers (int): simulation processes, defaults to the number of CPUs
+        profile (bool): include a gas and opcode profile in every report
+
+    Returns:
+        list(SimulationReport): one report per vote, in order
+    """
+    rpc_url = rpc_url or default_rpc_url()
+    abi_cache = abi_cache or get_abi_cache()
+    if block_number is None:
+        block_number = int(RpcClient(rpc_url).call("eth_blockNumber"), 16)
+
+    # workers only read the ABI cache, so fetch what they need up front
+    abi_cache.get_abi(get_dao_voting_contract(vote_type))
+
+    jobs = [(vote_type, vote_id, profile) for vote_id in vote_ids]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(rpc_url, block_number, str(abi_cache.root.parent)),
+    ) as executor:
+        return list(executor.map(_simulate_vote_job, jobs))
+
+
+_WORKER_SESSION: Optional[DaoSession] = None
+
+
+def _init_worker(rpc_url: str, block_number: int, cache_dir: str):
+    global _WORKER_SESSION
+    # don't share the parent's pooled connections with it or the other workers
+    reset_session()
+    _WORKER_SESSION = DaoSession(
+        rpc_url,
+        block_identifier=block_number,
+        abi_cache=AbiCache(root=cache_dir, offline=True),
+    )
+    _WORKER_SESSION.fork()
+
+
+def _simulate_vote_job(job) -> SimulationReport:
+    vote_type, vote_id, profile = job
+    started = time.perf_counter()
+
+    with boa.env.anchor():
+        try:
+            return simulate(vote_id, vote_type, _WORKER_SESSION, profile=profile)
+        except Exception as e:
+            return SimulationReport(
+                vote_type,
+                vote_id,
+                _WORKER_SESSION.block_number,
+                error=str(e),
+                duration=time.perf_counter() - started,
+            )
@@ -0,0 +1,152 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .abi_cache import AbiCache, MissingAbi
+from .decoder_utils import decode_abi
+from .evm_script import AGENT_EXECUTE_SELECTOR, AGENT_EXECUTE_TYPES, parse_evm_script
+from .ipfs import get_descriptions_from_ipfs_hashes, get_ipfs_hashes_from_votes
+from .rpc import RpcClient
+from .selectors import selector_from_calldata
+from .vote_events import get_vote_event_store
+from .vote_record import VoteRecord
+from .vote_utils import decode_vote_script
+from .voting_reader import VotingReader
+
+# votes fetched per aggregated read
+CHUNK_SIZE = 200
+
+
+def decode_votes(
+    vote_type: str,
+    vote_ids: Iterable[int],
+    rpc: RpcClient,
+    abi_cache: AbiCache,
+    block_identifier="latest",
+    workers: Optional[int] = None,
+    descriptions: bool = False,
+) -> Iterator[Dict]:
+    """Decodes many votes, yielding one JSON-serializable dict per vote in order.
+
+    Vote records are fetched in aggregated reads, one round-trip per chunk of
+    votes. Before decoding, the ABIs of every target in a chunk are fetched
+    once in this process, so the worker processes decode entirely offline
+    from the shared disk cache.
+
+    Args:
+        vote_type (str): ownership / parameter
+        vote_ids (iterable(int)): votes to decode
+        rpc (RpcClient): node to read vote records from
+        abi_cache (AbiCache): ABI store shared with the workers through disk
+        block_identifier (int | str): block the vote records are read at
+        workers (int): decoding processes, defaults to the number of CPUs
+        descriptions (bool): also resolve each vote's IPFS description
+
+    Yields:
+        dict: vote record fields and decoded actions, or an `error`
+    """
+    reader = VotingReader.for_vote_type(rpc, vote_type, block_identifier=block_identifier)
+    vote_ids = list(vote_ids)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start in range(0, len(vote_ids), CHUNK_SIZE):
+            chunk_ids = vote_ids[start : start + CHUNK_SIZE]
+            votes = reader.get_votes(chunk_ids)
+
+            _warm_abi_cache(abi_cache, [v.script for v in votes if v is not None])
+
+            jobs = [
+                (vote_type, vote_id, vote, str(abi_cache.root.parent))
+                for vote_id, vote in zip(chunk_ids, votes)
+            ]
+            results = executor.map(_decode_vote_job, jobs, chunksize=8)
+
+            # fetched while the workers decode
+            vote_descriptions = {}
+            if descriptions:
+                vote_descriptions = _fetch_descriptions(vote_type, chunk_ids, votes, rpc)
+
+            for result in results:
+                if result["vote_id"] in vote_descriptions:
+                    result["description"] = vote_descriptions[result["vote_id"]]
+                yield result
+
+
+def _fetch_descriptions(vote_type, vote_ids, votes, rpc) -> Dict:
+    existing_votes = {i: v for i, v in zip(vote_ids, votes) if v is not None}
+    ipfs_hashes = get_ipfs_hashes_from_votes(
+        vote_type, existing_votes, rpc, get_vote_event_store()
+    )
+    descriptions = get_descriptions_from_ipfs_hashes(ipfs_hashes.values())
+    return {vote_id: descriptions[h] for vote_id, h in ipfs_hashes.items()}
+
+
+def _warm_abi_cache(abi_cache: AbiCache, scripts: Iterable[bytes]):
+    for target in _script_targets(scripts):
+        try:
+            abi_cache.get_selector_index(target)
+        except MissingAbi:
+            # decode_input falls back to the global selector table
+            pass
+
+
+def _script_targets(scripts: Iterable[bytes]) -> Set[str]:
+    targets = set()
+    for script in scripts:
+        try:
+            actions = parse_evm_script(script)
+        except ValueError:
+            continue
+
+        for target, calldata in actions:
+            targets.add(target)
+            if selector_from_calldata(calldata) == AGENT_EXECUTE_SELECTOR:
+                inner_target, _, _ = decode_abi(AGENT_EXECUTE_TYPES, bytes(calldata[4:]))
+                targets.add(inner_target)
+
+    return targets
+
+
+def _decode_vote_job(job) -> Dict:
+    vote_type, vote_id, vote, cache_dir = job
+    result = {"vote_type": vote_type, "vote_id": vote_id}
+    if vote is None:
+        result["error"] = "vote does not exist"
+        return result
+
+    result.update(_vote_fields(vote))
+    try:
+        result["actions"] = decode_script_actions(
+            vote.script, AbiCache(root=cache_dir, offline=True)
+        )
+    except (MissingAbi, ValueError) as e:
+        result["error"] = str(e)
+
+    return result
+
+
+def decode_script_actions(script: bytes, abi_cache: AbiCache) -> List[Dict]:
+    """Decodes an EVM script into actions without the rich console formatting."""
+    return [
+        {
+            "agent": action["agent"],
+            "target": action["target"],
+            "function": action["function"],
+            "inputs": dict(action["inputs"]),
+        }
+        for action in decode_vote_script(script, abi_cache)
+    ]
+
+
+def _vote_fields(vote: VoteRecord) -> Dict:
+    return {
+        "open": vote.open,
+        "executed": vote.executed,
+        "start_date": vote.start_date,
+        "snapshot_block": vote.snapshot_block,
+        "support_required": vote.support_required,
+        "min_accept_quorum": vote.min_accept_quorum,
+        "yea": vote.yea,
+        "nay": vote.nay,
+        "voting_power": vote.voting_power,
+        "script": "0x" + bytes(vote.script).hex(),
+    }
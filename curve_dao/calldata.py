@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional, Tuple
+
+from .abi_cache import AbiCache, get_abi_cache
+from .evm_script import AGENT_EXECUTE_SELECTOR, AGENT_EXECUTE_TYPES
+from .selectors import build_function_selector, get_type_strings
+
+try:
+    from eth_abi import encode
+except ImportError:
+    from eth_abi import encode_abi as encode
+
+
+class MissingFunction(Exception):
+    """Exception raised when a contract has no function matching a call."""
+
+
+class CalldataEncoder:
+    """Encodes contract calls from cached ABIs, without building contract objects.
+
+    The selector and argument types of every (address, function, argument
+    count) are resolved from the ABI once and reused, so encoding a call is
+    a single `eth_abi.encode`.
+
+    Args:
+        abi_cache (AbiCache): ABI store, defaults to the process-wide cache
+    """
+
+    def __init__(self, abi_cache: Optional[AbiCache] = None):
+        self.abi_cache = abi_cache or get_abi_cache()
+        self._functions: Dict[Tuple[str, str, int], Tuple[bytes, List[str]]] = {}
+
+    def encode(self, address: str, fn_name: str, *args) -> bytes:
+        """Returns the calldata of `address.fn_name(*args)`.
+
+        Raises:
+            MissingAbi: if no ABI is available for `address`
+            MissingFunction: if `fn_name` does not take `len(args)` arguments,
+                or is overloaded with that many
+        """
+        selector, types = self._get_function(address, fn_name, len(args))
+        return selector + encode(types, list(args))
+
+    def _get_function(self, address: str, fn_name: str, num_args: int):
+        key = (address.lower(), fn_name, num_args)
+        if key not in self._functions:
+            matches = [
+                abi
+                for abi in self.abi_cache.get_abi(address)
+                if abi.get("type") == "function"
+                and abi["name"] == fn_name
+                and len(abi["inputs"]) == num_args
+            ]
+            if len(matches) != 1:
+                raise MissingFunction(
+                    f"{address} has {len(matches)} functions {fn_name} "
+                    f"taking {num_args} arguments"
+                )
+            self._functions[key] = (
+                bytes.fromhex(build_function_selector(matches[0])[2:]),
+                get_type_strings(matches[0]["inputs"]),
+            )
+
+        return self._functions[key]
+
+
+def encode_agent_execute(target: str, calldata: bytes, value: int = 0) -> bytes:
+    """Returns the calldata of `Agent.execute(target, value, calldata)`."""
+    return bytes.fromhex(AGENT_EXECUTE_SELECTOR[2:]) + encode(
+        AGENT_EXECUTE_TYPES, [target, value, bytes(calldata)]
+    )
@@ -0,0 +1,188 @@
+import base64
+import hashlib
+import io
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from .abi_cache import _atomic_write
+
+RECORD = "record"
+REPLAY = "replay"
+
+# query parameters that carry credentials; never keyed on nor written to disk
+SECRET_PARAMS = {"apikey", "api_key", "key"}
+# e.g. the API key in Alchemy URLs: https://eth-mainnet.g.alchemy.com/v2/<key>
+SECRET_PATH = re.compile(r"(/v[0-9]+/)[0-9A-Za-z_-]{16,}$")
+
+
+class MissingInteraction(requests.ConnectionError):
+    """Exception raised when a replayed request is not in the cassette."""
+
+
+class Cassette:
+    """Directory of recorded HTTP interactions, one JSON file per distinct request.
+
+    Requests are keyed by method, URL and body, with credentials and
+    JSON-RPC ids left out, so a replayed session matches the recorded one
+    whatever ids its client picks. Interactions are written one file each,
+    which lets several processes record into the same cassette.
+
+    Args:
+        path (Path): cassette directory
+        mode (str): `replay` serves recorded responses and fails on anything
+            else, `record` also sends and records requests it has not seen
+    """
+
+    def __init__(self, path: Path, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = Path(path)
+        self.mode = mode
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def put(self, key: str, interaction: Dict):
+        self.path.mkdir(parents=True, exist_ok=True)
+        _atomic_write(self._path(key), json.dumps(interaction, indent=1))
+
+    def _path(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+
+class CassetteAdapter(HTTPAdapter):
+    """Transport adapter serving requests from a `Cassette`, recording misses in record mode."""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        url, body = _normalize(request)
+        key = hashlib.sha256(
+            json.dumps([request.method, url, body], sort_keys=True).encode()
+        ).hexdigest()
+
+        interaction = self.cassette.get(key)
+        if interaction is None:
+            if self.cassette.mode != RECORD:
+                raise MissingInteraction(
+                    f"{request.method} {url} is not in the cassette", request=request
+                )
+            # read the whole body so it can be stored, then serve it like a replay
+            response = super().send(
+                request, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+            interaction = _interaction(request.method, url, body, response)
+            self.cassette.put(key, interaction)
+
+        return self._build(request, interaction, body)
+
+    def _build(self, request, interaction: Dict, body: Any) -> requests.Response:
+        content = _load_body(interaction)
+        if isinstance(body, (list, dict)):
+            try:
+                content = json.dumps(_with_ids(json.loads(content), request)).encode()
+            except ValueError:
+                pass
+
+        raw = HTTPResponse(
+            body=io.BytesIO(content),
+            headers=interaction["headers"],
+            status=interaction["status"],
+            reason=interaction["reason"],
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def _normalize(request) -> Tuple[str, Any]:
+    """URL without credentials, and the body without JSON-RPC ids or multipart boundaries."""
+    scheme, netloc, path, query, _ = urlsplit(request.url)
+    query = urlencode([(k, v) for k, v in parse_qsl(query) if k.lower() not in SECRET_PARAMS])
+    url = urlunsplit((scheme, netloc, SECRET_PATH.sub(r"\1<key>", path), query, ""))
+
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+
+    content_type = request.headers.get("Content-Type", "")
+    if "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].encode()
+        return url, body.replace(boundary, b"<boundary>").decode("latin-1")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return url, body.decode("latin-1")
+
+    if isinstance(payload, list):
+        return url, [_without_id(call) for call in payload]
+    return url, _without_id(payload)
+
+
+def _without_id(payload):
+    if isinstance(payload, dict):
+        return {k: v for k, v in payload.items() if k != "id"}
+    return payload
+
+
+def _with_ids(payload, request):
+    """Gives a recorded JSON-RPC response the ids of the request being replayed."""
+    sent = json.loads(request.body)
+    if isinstance(sent, list) and isinstance(payload, list):
+        return [dict(result, id=call.get("id")) for call, result in zip(sent, payload)]
+    if isinstance(sent, dict) and isinstance(payload, dict) and "id" in sent:
+        return dict(payload, id=sent["id"])
+    return payload
+
+
+def _interaction(method: str, url: str, body: Any, response: requests.Response) -> Dict:
+    content = response.content
+    if isinstance(body, list):
+        try:
+            results = json.loads(content)
+        except ValueError:
+            results = None
+        if isinstance(results, list):
+            # batch responses may come in any order: store them in request order
+            by_id = {result.get("id"): result for result in results}
+            sent = json.loads(response.request.body)
+            content = json.dumps([by_id.get(call.get("id")) for call in sent]).encode()
+
+    # `content` is already decompressed and complete
+    headers = {
+        k: v
+        for k, v in response.headers.items()
+        if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+    }
+    interaction = {
+        "method": method,
+        "url": url,
+        "request": body,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": headers,
+    }
+    try:
+        interaction["body"] = content.decode()
+    except UnicodeDecodeError:
+        interaction["body_base64"] = base64.b64encode(content).decode()
+    return interaction
+
+
+def _load_body(interaction: Dict) -> bytes:
+    if "body_base64" in interaction:
+        return base64.b64decode(interaction["body_base64"])
+    return interaction["body"].encode()
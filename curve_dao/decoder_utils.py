@@ -1,47 +1,22 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, List, Optional, Tuple
 
-import boa
-import os
 from hexbytes import HexBytes
-from eth_hash.auto import keccak
 from eth_utils import humanize_hash, is_hex_address, to_checksum_address
 
+from .abi_cache import AbiCache, MissingAbi, get_abi_cache
+from .selectors import (  # noqa: F401
+    build_function_selector,
+    build_function_signature,
+    get_type_strings,
+    selector_from_calldata,
+)
+
 try:
     from eth_abi import decode_abi
 except ImportError:
     from eth_abi import decode as decode_abi
 
 
-def get_type_strings(abi_params: List, substitutions: Optional[Dict] = None) -> List:
-    types_list = []
-    if substitutions is None:
-        substitutions = {}
-
-    for i in abi_params:
-        if i["type"].startswith("tuple"):
-            params = get_type_strings(i.components, substitutions)
-            array_size = i["type"][5:]
-            types_list.append(f"({','.join(params)}){array_size}")
-        else:
-            type_str = i["type"]
-            for orig, sub in substitutions.items():
-                if type_str.startswith(orig):
-                    type_str = type_str.replace(orig, sub)
-            types_list.append(type_str)
-
-    return types_list
-
-
-def build_function_signature(abi: Dict) -> str:
-    types_list = get_type_strings(abi["inputs"])
-    return f"{abi["name"]}({','.join(types_list)})"
-
-
-def build_function_selector(abi: Dict) -> str:
-    sig = build_function_signature(abi)
-    return "0x" + keccak(sig.encode()).hex()[:8]
-
-
 def decode_address(raw_address):
     if isinstance(raw_address, int):
         raw_address = hex(raw_address)
@@ -106,25 +81,24 @@ def decode_calldata(
 
 
 # works
-def decode_input(target: str, calldata: bytes
+def decode_input(target: str, calldata: bytes, abi_cache: Optional[AbiCache] = None
 ) -> Tuple[str, Any]:
 
     if not isinstance(calldata, HexBytes):
         calldata = HexBytes(calldata)
 
-    fn_selector = calldata[:4].hex()  # type: ignore
-    
-    boa.env.fork(f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv("ALCHEMY_API_KEY")}")
-    abi = boa.from_etherscan_abi(target, api_key=os.getenv("ETHERSCAN_API_KEY"))
-
-    abi = next( 
-        (
-            i
-            for i in abi
-            if i["type"] == "function" and build_function_selector(i) == fn_selector
-        ),
-        None,
-    )
+    fn_selector = selector_from_calldata(calldata)
+    abi_cache = abi_cache or get_abi_cache()
+
+    try:
+        abi = abi_cache.get_selector_index(target).get(fn_selector)
+    except MissingAbi:
+        abi = None
+
+    # unknown or unverified target: fall back to any known Curve contract
+    # exposing a function with the same selector
+    if abi is None:
+        abi = abi_cache.lookup_selector(fn_selector)
 
     if abi is None:
         raise ValueError("Four byte selector does not match the ABI for this contract")
@@ -0,0 +1,76 @@
+import struct
+from typing import List, Sequence, Tuple
+
+from eth_utils import to_checksum_address
+
+# Aragon CallsScript executor id
+CALLSCRIPT_ID = bytes.fromhex("00000001")
+
+# 20-byte target address followed by the uint32 calldata length
+ACTION_HEADER = struct.Struct(">20sI")
+
+# Agent.execute(address,uint256,bytes)
+AGENT_EXECUTE_SELECTOR = "0xb61d27f6"
+AGENT_EXECUTE_TYPES = ["address", "uint256", "bytes"]
+
+
+def build_evm_script(actions: Sequence[Tuple[str, bytes]]) -> bytes:
+    """Packs actions into an Aragon CallsScript.
+
+    The script is written into a single pre-sized buffer, so building it is
+    linear in its size however many actions there are.
+
+    Args:
+        actions (list(tuple)): (target address, calldata) per action
+
+    Returns:
+        bytes: EVM script
+    """
+    size = len(CALLSCRIPT_ID) + sum(
+        ACTION_HEADER.size + len(calldata) for _, calldata in actions
+    )
+    script = bytearray(size)
+    script[:4] = CALLSCRIPT_ID
+
+    idx = 4
+    for target, calldata in actions:
+        ACTION_HEADER.pack_into(script, idx, bytes.fromhex(target[2:]), len(calldata))
+        idx += ACTION_HEADER.size
+        script[idx : idx + len(calldata)] = calldata
+        idx += len(calldata)
+
+    return bytes(script)
+
+
+def parse_evm_script(script: bytes) -> List[Tuple[str, memoryview]]:
+    """Splits an Aragon CallsScript into its actions.
+
+    Calldata is returned as read-only views into `script`, nothing is copied.
+
+    Args:
+        script (bytes): EVM script as stored in the voting contract
+
+    Returns:
+        list(tuple): (checksummed target address, calldata) per action
+    """
+    script = memoryview(script).toreadonly()
+    if script[:4] != CALLSCRIPT_ID:
+        raise ValueError(f"Unsupported EVM script executor: 0x{script[:4].hex()}")
+
+    idx = 4
+    size = len(script)
+    actions = []
+    while idx < size:
+        if idx + ACTION_HEADER.size > size:
+            raise ValueError("EVM script truncated in action header")
+
+        target, length = ACTION_HEADER.unpack_from(script, idx)
+        idx += ACTION_HEADER.size
+
+        if idx + length > size:
+            raise ValueError("EVM script truncated in action calldata")
+
+        actions.append((to_checksum_address(target), script[idx : idx + length]))
+        idx += length
+
+    return actions
@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Sequence, Tuple
+
+from boa.rpc import TIMEOUT, EthereumRPC, RPCError
+
+from .transport import get_session
+
+
+class ForkRPC(EthereumRPC):
+    """Node connection of the boa fork, sent through the process-wide session.
+
+    boa's `EthereumRPC` posts with an HTTP session of its own; this one goes
+    through `transport.get_session()`, so the fork shares pooled connections
+    with the rest of the traffic and is recorded to, or replayed from, the
+    cassette like it.
+
+    Args:
+        url (str): node the fork reads state from
+    """
+
+    def fetch(self, method: str, params: Any) -> Any:
+        payload = {"jsonrpc": "2.0", "method": method, "params": params, "id": 0}
+        return _unwrap(self._post(payload))
+
+    def fetch_multi(self, payloads: Sequence[Tuple[str, Any]]) -> List[Any]:
+        request = [
+            {"jsonrpc": "2.0", "method": method, "params": params, "id": i}
+            for i, (method, params) in enumerate(payloads)
+        ]
+        results = {item["id"]: _unwrap(item) for item in self._post(request)}
+        return [results[i] for i in range(len(payloads))]
+
+    def _post(self, payload):
+        response = get_session().post(self.identifier, json=payload, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+
+def _unwrap(response: Dict) -> Any:
+    # boa's fork tells missing node features apart by the error it gets
+    if "error" in response:
+        raise RPCError.from_json(response["error"])
+    return response["result"]
@@ -1,11 +1,43 @@
+import asyncio
 import json
 import os
-import requests
+import random
+import tarfile
+from contextlib import contextmanager
+from typing import Dict, Iterable, List
 
-import boa
+import requests
+import urllib3
 
 from .addresses import get_dao_voting_contract
+from .decoder_utils import decode_abi
+from .ipfs_store import CidMismatch, IpfsStore, get_ipfs_store
+from .rpc import RpcClient, RpcError
+from .session import DaoSession
+from .transport import get_session
+from .vote_events import (
+    BLOCK_RANGE,
+    START_VOTE_DATA_TYPES,
+    START_VOTE_TOPIC,
+    VoteEventStore,
+    get_vote_event_store,
+)
+
+INFURA_IPFS_API = "https://ipfs.infura.io:5001/api/v0"
+PUBLIC_IPFS_GATEWAYS = [
+    "https://ipfs.io/ipfs",
+    "https://dweb.link/ipfs",
+    "https://gateway.pinata.cloud/ipfs",
+]
+# seconds before the second round of gateway requests, doubled every round
+RETRY_BACKOFF = 0.5
+# descriptions are read in chunks and never held beyond this size
+MAX_DESCRIPTION_SIZE = 16 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
 
+class DescriptionError(str):
+    """Message returned in place of a description that could not be fetched."""
 
 
 def get_ipfs_hash_from_description(description: str):
@@ -15,8 +47,8 @@ def get_ipfs_hash_from_description(description: str):
     set up an IPFS project to generate project id and project secret!
     """
     text = json.dumps({"text": description})
-    response = requests.post(
-        "https://ipfs.infura.io:5001/api/v0/add",
+    response = get_session().post(
+        f"{INFURA_IPFS_API}/add",
         files={"file": text},
         auth=(os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET")),
     )
@@ -27,62 +59,252 @@ def get_ipfs_hash_from_description(description: str):
 
 
 def get_description_from_ipfs_hash(ipfs_hash: str):
+    return get_descriptions_from_ipfs_hashes([ipfs_hash])[ipfs_hash]
+
+
+def get_descriptions_from_ipfs_hashes(ipfs_hashes: Iterable[str], **kwargs) -> Dict:
+    """Fetches many vote descriptions concurrently. See `fetch_descriptions`."""
+    return asyncio.run(fetch_descriptions(ipfs_hashes, **kwargs))
+
+
+async def fetch_descriptions(
+    ipfs_hashes: Iterable[str],
+    concurrency: int = 8,
+    retries: int = 3,
+    timeout: int = 5,
+    store: IpfsStore = None,
+) -> Dict:
+    """Resolves IPFS hashes to vote descriptions, `concurrency` at a time.
+
+    Descriptions already in the local IPFS store are served from disk.
+    Everything else is tried on Infura first and then on the public gateways,
+    with jittered exponential backoff between rounds, and stored once its
+    content matches the hash. Requests share one pooled HTTP session. Hashes
+    that can't be resolved map to an error message, as
+    `get_description_from_ipfs_hash` always did; it is a `DescriptionError`,
+    so callers can tell it apart from a description.
+
+    Returns:
+        dict: description (or error message) per IPFS hash
+    """
+    store = store or get_ipfs_store()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(ipfs_hash):
+        description = _from_store(store, ipfs_hash)
+        if description is not None:
+            return description
+
+        async with semaphore:
+            return await _fetch_description(ipfs_hash, retries, timeout, store)
+
+    ipfs_hashes = list(dict.fromkeys(ipfs_hashes))
+    descriptions = await asyncio.gather(*(fetch(h) for h in ipfs_hashes))
+    return dict(zip(ipfs_hashes, descriptions))
+
+
+async def _fetch_description(ipfs_hash: str, retries: int, timeout: int, store: IpfsStore):
+    sources = [(_get_from_infura, INFURA_IPFS_API)] + [
+        (_get_from_public_gateway, gateway) for gateway in PUBLIC_IPFS_GATEWAYS
+    ]
+
+    error = None
+    for attempt in range(retries):
+        if attempt:
+            backoff = RETRY_BACKOFF * 2 ** (attempt - 1)
+            await asyncio.sleep(backoff + random.uniform(0, backoff))
+
+        for get_file, gateway in sources:
+            try:
+                content = await asyncio.to_thread(get_file, gateway, ipfs_hash, timeout)
+                description = json.loads(content)
+            except requests.Timeout:
+                error = "IPFS timed out.  Possibly the description is no longer pinned."
+            except requests.ConnectionError as e:
+                error = f"IPFS connection error: {e}"
+            except requests.RequestException as e:
+                error = f"IPFS request error: {e}"
+            except ValueError as e:
+                error = f"IPFS returned an invalid description: {e}"
+            else:
+                _store_verified(store, ipfs_hash, content)
+                return description
+
+    return DescriptionError(error)
+
+
+def _from_store(store: IpfsStore, ipfs_hash: str):
+    content = store.get(ipfs_hash)
+    if content is None:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        # seeded files only have to match their CID: plain text descriptions are fine
+        return content.decode(errors="replace")
+
+
+def _store_verified(store: IpfsStore, ipfs_hash: str, content: bytes):
     try:
-        response = requests.post(
-            f"https://ipfs.infura.io:5001/api/v0/get?arg={ipfs_hash}",
-            auth=(os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET")),
-            timeout=5,
-        )
+        store.put(ipfs_hash, content)
+    except CidMismatch:
+        # served, but can't be proven to be the pinned file: don't keep it
+        pass
+
+
+def _get_from_infura(api: str, ipfs_hash: str, timeout: int) -> bytes:
+    with get_session().post(
+        f"{api}/get?arg={ipfs_hash}",
+        auth=(os.getenv("IPFS_PROJECT_ID"), os.getenv("IPFS_PROJECT_SECRET")),
+        timeout=timeout,
+        stream=True,
+    ) as response, _raw_read_errors():
         response.raise_for_status()
-    except requests.Timeout:
-        return "IPFS timed out.  Possibly the description is no longer pinned."
-    except requests.ConnectionError as e:
-        return f"IPFS connection error: {e}"
-    except requests.HTTPError as e:
-        return f"IPFS request error: {e}"
-
-    response_string = response.content.decode("utf-8")
-    json_string = []
-    in_json = False
-    for c in response_string:
-        if c == "{":
-            in_json = True
-        if in_json:
-            json_string.append(c)
-        if c == "}":
-            break
-    json_string = "".join(json_string)
-    return json.loads(json_string)
-
-
-def get_ipfs_hash_from_vote_id(vote_type, vote_id):
-    voting_contract_address = get_dao_voting_contract(vote_type)
-
-    # voting_contract = ape.project.Voting.at(voting_contract_address)
-    #voting = "contracts/Voting.json"
-
-    boa.env.fork(f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv("ALCHEMY_API_KEY")}")
-
-    voting_contract_address = get_dao_voting_contract(vote_type)
-    voting_contract = boa.from_etherscan(voting_contract_address, name="test", api_key=os.getenv("ETHERSCAN_API_KEY"))
-
-    # can't do ["snapshotBlock"], need to do [3] instead
-    snapshot_block = voting_contract.getVote(vote_id)[3]
-
-    # how to query events in boa? need this for voteID and metadata
-    vote_events = voting_contract.StartVote.query(
-        "voteId",
-        "metadata",
-        start_block=snapshot_block - 1,
-        stop_block=snapshot_block + 1,
+        response.raw.decode_content = True
+
+        # the API wraps the file in a tar archive: read it as a stream and
+        # stop at the first regular file
+        try:
+            with tarfile.open(fileobj=response.raw, mode="r|") as tar:
+                for member in tar:
+                    if member.isfile():
+                        if member.size > MAX_DESCRIPTION_SIZE:
+                            raise ValueError(f"description is {member.size} bytes")
+                        return _read_limited(tar.extractfile(member))
+        except tarfile.TarError as e:
+            raise ValueError(f"malformed tar stream: {e}")
+
+    raise ValueError("no file in IPFS response")
+
+
+def _get_from_public_gateway(gateway: str, ipfs_hash: str, timeout: int) -> bytes:
+    with (
+        get_session().get(f"{gateway}/{ipfs_hash}", timeout=timeout, stream=True) as response,
+        _raw_read_errors(),
+    ):
+        response.raise_for_status()
+        response.raw.decode_content = True
+        return _read_limited(response.raw)
+
+
+@contextmanager
+def _raw_read_errors():
+    """Raises failures reading `response.raw` as the `requests` exceptions `iter_content` would."""
+    try:
+        yield
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.Timeout(e)
+    except urllib3.exceptions.ProtocolError as e:
+        raise requests.ConnectionError(e)
+    except urllib3.exceptions.HTTPError as e:
+        raise requests.RequestException(e)
+
+
+def _read_limited(fileobj) -> bytes:
+    content = bytearray()
+    while chunk := fileobj.read(READ_CHUNK_SIZE):
+        content += chunk
+        if len(content) > MAX_DESCRIPTION_SIZE:
+            raise ValueError(f"description exceeds {MAX_DESCRIPTION_SIZE} bytes")
+    return bytes(content)
+
+
+def get_ipfs_hash_from_vote_id(
+    vote_type, vote_id, session: DaoSession = None, event_store: VoteEventStore = None
+):
+    event_store = event_store or get_vote_event_store()
+    ipfs_hash = event_store.get_ipfs_hash(vote_type, vote_id)
+    if ipfs_hash is not None:
+        return ipfs_hash
+
+    session = session or DaoSession()
+    vote = session.get_vote(vote_type, vote_id)
+    ipfs_hashes = get_ipfs_hashes_from_votes(vote_type, {vote_id: vote}, session.rpc)
+    if vote_id not in ipfs_hashes:
+        raise ValueError(f"No StartVote event found for vote {vote_id}")
+
+    return ipfs_hashes[vote_id]
+
+
+def get_ipfs_hashes_from_votes(
+    vote_type: str,
+    votes: Dict,
+    rpc: RpcClient,
+    event_store: VoteEventStore = None,
+    block_range: int = BLOCK_RANGE,
+) -> Dict:
+    """Reads the IPFS hashes of many votes from their StartVote logs.
+
+    Votes already in the event store are answered locally. The rest are read
+    with one eth_getLogs call per `block_range` blocks that hold a StartVote,
+    halving the range whenever the node refuses one, as `VoteEventIndexer`
+    does, so votes spread over years never turn into one unbounded query.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        votes (dict): VoteRecord per vote id
+        rpc (RpcClient): node to read logs from
+        event_store (VoteEventStore): local StartVote index to consult first
+        block_range (int): widest block range per eth_getLogs request
+
+    Returns:
+        dict: IPFS hash per vote id, for every vote whose log was found
+    """
+    ipfs_hashes = {}
+    if event_store is not None:
+        for vote_id in votes:
+            ipfs_hash = event_store.get_ipfs_hash(vote_type, vote_id)
+            if ipfs_hash is not None:
+                ipfs_hashes[vote_id] = ipfs_hash
+        votes = {i: v for i, v in votes.items() if i not in ipfs_hashes}
+
+    # StartVote is emitted in the block after the vote's snapshot block
+    pending = sorted(votes, key=lambda vote_id: votes[vote_id].snapshot_block)
+    while pending:
+        from_block = votes[pending[0]].snapshot_block
+        to_block = from_block + max(block_range, 2) - 1
+        window = [i for i in pending if votes[i].snapshot_block + 1 <= to_block]
+        try:
+            vote_events = _get_start_vote_logs(rpc, vote_type, window, from_block, to_block)
+        except RpcError:
+            if block_range <= 2:
+                raise
+            # too wide a range for this node
+            block_range //= 2
+            continue
+
+        for log in vote_events:
+            vote_id = int(log["topics"][1], 16)
+            if log["topics"][0] != START_VOTE_TOPIC or vote_id not in window:
+                continue
+            metadata = decode_abi(START_VOTE_DATA_TYPES, bytes.fromhex(log["data"][2:]))[0]
+            ipfs_hashes[vote_id] = metadata[5:]
+        pending = pending[len(window) :]
+
+    return ipfs_hashes
+
+
+def _get_start_vote_logs(
+    rpc: RpcClient, vote_type: str, vote_ids: List[int], from_block: int, to_block: int
+) -> List[Dict]:
+    # boa contracts can't query events, so fetch the StartVote logs directly
+    return rpc.call(
+        "eth_getLogs",
+        [
+            {
+                "address": get_dao_voting_contract(vote_type),
+                "fromBlock": hex(from_block),
+                "toBlock": hex(to_block),
+                "topics": [
+                    START_VOTE_TOPIC,
+                    ["0x" + vote_id.to_bytes(32, "big").hex() for vote_id in vote_ids],
+                ],
+            }
+        ],
     )
-    vote_row = vote_events.loc[vote_events["voteId"] == vote_id]
-    ipfs_hash = vote_row["metadata"].iloc[0]
-    ipfs_hash = ipfs_hash[5:]
-    return ipfs_hash
 
 
-def get_description_from_vote_id(vote_id, target):
-    ipfs_hash = get_ipfs_hash_from_vote_id(target, vote_id)
+def get_description_from_vote_id(vote_id, target, session: DaoSession = None):
+    ipfs_hash = get_ipfs_hash_from_vote_id(target, vote_id, session)
     description = get_description_from_ipfs_hash(ipfs_hash)
-    return description
\ No newline at end of file
+    return description
@@ -0,0 +1,161 @@
+import base64
+import hashlib
+import os
+import tarfile
+from pathlib import Path
+from typing import Optional
+
+from .abi_cache import default_cache_dir
+
+# files up to this size are a single UnixFS leaf with the default chunker
+MAX_SINGLE_CHUNK = 256 * 1024
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+# multicodec / multihash prefixes
+CID_V1 = 0x01
+DAG_PB = 0x70
+RAW = 0x55
+SHA2_256 = bytes([0x12, 0x20])
+
+
+class CidMismatch(Exception):
+    """Exception raised when content does not hash to the CID it is stored under."""
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _unixfs_file_node(content: bytes) -> bytes:
+    """dag-pb node that `ipfs add` builds for a single-chunk file."""
+    unixfs = b"\x08\x02"  # Type: File
+    if content:
+        unixfs += b"\x12" + _varint(len(content)) + content
+    unixfs += b"\x18" + _varint(len(content))  # filesize
+    return b"\x0a" + _varint(len(unixfs)) + unixfs
+
+
+def _b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return BASE58_ALPHABET[0] * leading_zeros + encoded
+
+
+def compute_cids(content: bytes) -> set:
+    """Returns the CIDs `ipfs add` can produce for `content` with default chunking.
+
+    Covers CIDv0 and CIDv1 (dag-pb and raw leaves). Only single-chunk files
+    are supported: vote descriptions are a few KiB at most.
+    """
+    if len(content) > MAX_SINGLE_CHUNK:
+        return set()
+
+    dag_pb_digest = SHA2_256 + hashlib.sha256(_unixfs_file_node(content)).digest()
+    raw_digest = SHA2_256 + hashlib.sha256(content).digest()
+
+    cids = {_b58encode(dag_pb_digest)}
+    for codec, digest in ((DAG_PB, dag_pb_digest), (RAW, raw_digest)):
+        cid = bytes([CID_V1, codec]) + digest
+        cids.add("b" + base64.b32encode(cid).decode().lower().rstrip("="))
+
+    return cids
+
+
+def verify_cid(cid: str, content: bytes) -> bool:
+    return cid in compute_cids(content)
+
+
+class IpfsStore:
+    """Local store of IPFS files keyed by CID, checked against the CID on every read.
+
+    Args:
+        root (Path): cache directory, defaults to `$CURVE_DAO_CACHE_DIR`
+            or `~/.cache/curve-dao`
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or default_cache_dir()) / "ipfs"
+
+    def get(self, cid: str) -> Optional[bytes]:
+        path = self._path(cid)
+        if not path.exists():
+            return None
+
+        content = path.read_bytes()
+        if not verify_cid(cid, content):
+            # corrupted on disk: drop it so it gets fetched again
+            path.unlink()
+            return None
+
+        return content
+
+    def put(self, cid: str, content: bytes):
+        if not verify_cid(cid, content):
+            raise CidMismatch(f"Content does not match CID {cid}")
+
+        path = self._path(cid)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def import_archive(self, archive: Path) -> int:
+        """Seeds the store from a directory or tar archive of files named by CID.
+
+        Files may carry an extension (e.g. `<cid>.json`). Files that don't
+        match their CID are skipped.
+
+        Returns:
+            int: number of files imported
+        """
+        archive = Path(archive)
+        if archive.is_dir():
+            files = (
+                (path.name, path.read_bytes()) for path in archive.iterdir() if path.is_file()
+            )
+        else:
+            files = _tar_files(archive)
+
+        imported = 0
+        for name, content in files:
+            try:
+                self.put(name.split(".")[0], content)
+            except CidMismatch:
+                continue
+            imported += 1
+
+        return imported
+
+    def _path(self, cid: str) -> Path:
+        return self.root / cid[-2:] / cid
+
+
+def _tar_files(archive: Path):
+    with tarfile.open(archive, mode="r|*") as tar:
+        for member in tar:
+            if member.isfile():
+                yield Path(member.name).name, tar.extractfile(member).read()
+
+
+_DEFAULT_STORE: Optional[IpfsStore] = None
+
+
+def get_ipfs_store() -> IpfsStore:
+    """Returns the process-wide IPFS store used when none is passed explicitly."""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = IpfsStore()
+    return _DEFAULT_STORE
@@ -0,0 +1,53 @@
+from typing import List, Optional, Sequence, Tuple, Union
+
+from .addresses import MULTICALL3
+from .decoder_utils import decode_abi
+from .rpc import RpcClient
+
+try:
+    from eth_abi import encode
+except ImportError:
+    from eth_abi import encode_abi as encode
+
+# Multicall3.aggregate3((address,bool,bytes)[])
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+
+# calls per aggregate3; keeps each eth_call well under node gas caps
+CHUNK_SIZE = 250
+
+
+def aggregate(
+    rpc: RpcClient,
+    calls: Sequence[Tuple[str, bytes]],
+    block_identifier: Union[int, str] = "latest",
+    chunk_size: int = CHUNK_SIZE,
+) -> List[Optional[bytes]]:
+    """Executes `(target, calldata)` read calls through Multicall3.
+
+    Calls are packed into `aggregate3` eth_calls of `chunk_size`, and all
+    chunks go out in a single JSON-RPC batch request, so any number of reads
+    costs one round-trip.
+
+    Returns:
+        list: return data per call, `None` where the call reverted
+    """
+    if isinstance(block_identifier, int):
+        block_identifier = hex(block_identifier)
+
+    eth_calls = []
+    for start in range(0, len(calls), chunk_size):
+        chunk = calls[start : start + chunk_size]
+        calldata = AGGREGATE3_SELECTOR + encode(
+            ["(address,bool,bytes)[]"],
+            [[(target, True, data) for target, data in chunk]],
+        )
+        eth_calls.append(
+            ("eth_call", [{"to": MULTICALL3, "data": "0x" + calldata.hex()}, block_identifier])
+        )
+
+    results = []
+    for response in rpc.batch(eth_calls):
+        (call_results,) = decode_abi(["(bool,bytes)[]"], bytes.fromhex(response[2:]))
+        results.extend(data if success else None for success, data in call_results)
+
+    return results
@@ -0,0 +1,215 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import boa
+from eth_utils import to_checksum_address
+
+from .addresses import get_dao_voting_contract
+from .evm_script import parse_evm_script
+from .session import DaoSession
+from .state_diff import is_action_frame
+
+BLOCK_GAS_LIMIT = 30_000_000
+# scripts using more than this share of a block are flagged
+WARN_FRACTION = 0.5
+HOT_CONTRACTS = 10
+
+
+class ExecutionProfiler:
+    """Counts the opcodes executed by each computation (call frame).
+
+    Every opcode of the computation class is wrapped while recording. Gas is
+    read from the frames themselves afterwards, so the wrappers only count.
+
+    Args:
+        computation_class: py-evm computation class to patch, defaults to the
+            one boa's environment executes with
+    """
+
+    def __init__(self, computation_class=None):
+        self.computation_class = computation_class
+        # id(computation) -> opcode counts
+        self.opcodes: Dict[int, Counter] = {}
+        # keeps recorded computations alive so their ids stay unique
+        self._computations: List = []
+
+    @contextmanager
+    def record(self):
+        computation_class = (
+            self.computation_class or boa.env.evm.vm.state.computation_class
+        )
+        original_opcodes = dict(computation_class.opcodes)
+
+        for opcode, opcode_fn in original_opcodes.items():
+            computation_class.opcodes[opcode] = self._wrap(opcode, opcode_fn)
+        try:
+            yield self
+        finally:
+            computation_class.opcodes.clear()
+            computation_class.opcodes.update(original_opcodes)
+
+    def _wrap(self, opcode: int, opcode_fn):
+        mnemonic = getattr(opcode_fn, "mnemonic", hex(opcode))
+
+        def profiled(computation):
+            key = id(computation)
+            if key not in self.opcodes:
+                self.opcodes[key] = Counter()
+                self._computations.append(computation)
+            self.opcodes[key][mnemonic] += 1
+            return opcode_fn(computation=computation)
+
+        return profiled
+
+    def profile(
+        self,
+        computation,
+        actions: Sequence[Tuple[str, bytes]] = (),
+        block_gas_limit: int = BLOCK_GAS_LIMIT,
+    ) -> Dict:
+        """Profiles `executeVote`, attributing gas to the script action that spent it.
+
+        Args:
+            computation: root computation of the recorded transaction
+            actions (list(tuple)): (target, calldata) of each script action
+            block_gas_limit (int): gas limit the transaction has to fit in
+
+        Returns:
+            dict: see `_report`; gas spent outside the actions is `overhead_gas`
+        """
+        frames: List[Optional[object]] = [None] * len(actions)
+        matched = [0]
+
+        def find_actions(frame):
+            for child in frame.children:
+                if matched[0] < len(actions) and is_action_frame(child, actions[matched[0]]):
+                    frames[matched[0]] = child
+                    matched[0] += 1
+                else:
+                    find_actions(child)
+
+        find_actions(computation)
+        report = self._report(computation.get_gas_used(), frames, actions, block_gas_limit)
+        report["overhead_gas"] = report["gas_used"] - sum(
+            a["gas_used"] for a in report["actions"]
+        )
+        report["hot_contracts"] = _hot_contracts([self._call_tree(computation)])
+        return report
+
+    def profile_frames(
+        self,
+        frames: Sequence,
+        actions: Sequence[Tuple[str, bytes]],
+        block_gas_limit: int = BLOCK_GAS_LIMIT,
+    ) -> Dict:
+        """Profiles actions executed one by one, one root computation per action."""
+        gas_used = sum(frame.get_gas_used() for frame in frames)
+        report = self._report(gas_used, frames, actions, block_gas_limit)
+        report["hot_contracts"] = _hot_contracts(
+            [action["calls"] for action in report["actions"] if action["calls"]]
+        )
+        return report
+
+    def _report(self, gas_used, frames, actions, block_gas_limit) -> Dict:
+        action_reports = []
+        for (target, _), frame in zip(actions, frames):
+            tree = self._call_tree(frame) if frame is not None else None
+            action_reports.append(
+                {
+                    "target": target,
+                    "gas_used": tree["gas_used"] if tree else 0,
+                    "opcodes": dict(_total_opcodes(tree)) if tree else {},
+                    "calls": tree,
+                }
+            )
+
+        return {
+            "gas_used": gas_used,
+            "block_gas_limit": block_gas_limit,
+            "near_block_gas_limit": gas_used > block_gas_limit * WARN_FRACTION,
+            "actions": action_reports,
+        }
+
+    def _call_tree(self, frame) -> Dict:
+        """Call tree with inclusive gas, and the gas each frame spent itself."""
+        children = [self._call_tree(child) for child in frame.children]
+        gas_used = frame.get_gas_used()
+        return {
+            "address": to_checksum_address(frame.msg.to),
+            "gas_used": gas_used,
+            "self_gas": gas_used - sum(child["gas_used"] for child in children),
+            "reverted": frame.is_error,
+            "opcodes": dict(self.opcodes.get(id(frame), {})),
+            "children": children,
+        }
+
+
+def _total_opcodes(tree: Dict) -> Counter:
+    total = Counter(tree["opcodes"])
+    for child in tree["children"]:
+        total.update(_total_opcodes(child))
+    return total
+
+
+def _hot_contracts(trees: List[Dict]) -> List[Dict]:
+    """Contracts ranked by the gas their own code spent, across all calls to them."""
+    gas: Counter = Counter()
+    calls: Counter = Counter()
+
+    def visit(tree):
+        gas[tree["address"]] += tree["self_gas"]
+        calls[tree["address"]] += 1
+        for child in tree["children"]:
+            visit(child)
+
+    for tree in trees:
+        visit(tree)
+
+    return [
+        {"address": address, "self_gas": self_gas, "calls": calls[address]}
+        for address, self_gas in gas.most_common(HOT_CONTRACTS)
+    ]
+
+
+def profile_script(
+    vote_type: str,
+    script: bytes,
+    session: Optional[DaoSession] = None,
+    block_gas_limit: int = BLOCK_GAS_LIMIT,
+) -> Dict:
+    """Profiles an EVM script on a fork before it is proposed.
+
+    Each action is executed in order from the voting contract, as
+    `executeVote` would, and the fork is rolled back afterwards. The voting
+    contract's own overhead is not included.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        script (bytes): EVM script to profile
+        session (DaoSession): fork to execute on, defaults to a new session
+        block_gas_limit (int): gas limit the script has to fit in
+
+    Returns:
+        dict: total and per-action gas, opcode counts, call trees, hot
+            contracts, and whether the script is near the block gas limit
+    """
+    session = session or DaoSession()
+    session.fork()
+    voting = get_dao_voting_contract(vote_type)
+    actions = parse_evm_script(script)
+
+    profiler = ExecutionProfiler()
+    frames = []
+    with boa.env.anchor(), profiler.record():
+        for target, calldata in actions:
+            frames.append(
+                boa.env.execute_code(
+                    to_address=target,
+                    sender=voting,
+                    gas=block_gas_limit,
+                    data=bytes(calldata),
+                )
+            )
+
+    return profiler.profile_frames(frames, actions, block_gas_limit)
@@ -0,0 +1,67 @@
+import itertools
+from typing import Any, List, Sequence, Tuple
+
+from .transport import get_session
+
+
+class RpcError(Exception):
+    """Exception raised when a JSON-RPC request returns an error."""
+
+
+class RpcClient:
+    """Minimal JSON-RPC client for reads that don't need a forked EVM (logs, block numbers)."""
+
+    def __init__(self, url: str, timeout: int = 30):
+        self.url = url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, params: List = None) -> Any:
+        payload = {
+            "jsonrpc": "2.0",
+            "id": next(self._ids),
+            "method": method,
+            "params": params or [],
+        }
+        response = get_session().post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return _unwrap(response.json())
+
+    def batch(
+        self,
+        calls: Sequence[Tuple[str, List]],
+        batch_size: int = 100,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Sends `(method, params)` calls as JSON-RPC batch requests.
+
+        Results are returned in the order of `calls`. With `return_exceptions`,
+        a failed call yields its `RpcError` in place of a result instead of
+        raising, so one reverting call doesn't sink the whole batch.
+        """
+        results = []
+        for start in range(0, len(calls), batch_size):
+            chunk = calls[start : start + batch_size]
+            payload = [
+                {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+                for method, params in chunk
+            ]
+            response = get_session().post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            responses = {r["id"]: r for r in response.json()}
+
+            for request in payload:
+                try:
+                    results.append(_unwrap(responses[request["id"]]))
+                except RpcError as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+
+        return results
+
+
+def _unwrap(response: dict) -> Any:
+    if "error" in response:
+        raise RpcError(f"{response['error'].get('code')}: {response['error'].get('message')}")
+    return response["result"]
@@ -0,0 +1,50 @@
+from typing import Dict, List, Optional
+
+from eth_hash.auto import keccak
+
+
+def get_type_strings(abi_params: List, substitutions: Optional[Dict] = None) -> List:
+    types_list = []
+    if substitutions is None:
+        substitutions = {}
+
+    for i in abi_params:
+        if i["type"].startswith("tuple"):
+            params = get_type_strings(i["components"], substitutions)
+            array_size = i["type"][5:]
+            types_list.append(f"({','.join(params)}){array_size}")
+        else:
+            type_str = i["type"]
+            for orig, sub in substitutions.items():
+                if type_str.startswith(orig):
+                    type_str = type_str.replace(orig, sub)
+            types_list.append(type_str)
+
+    return types_list
+
+
+def build_function_signature(abi: Dict) -> str:
+    types_list = get_type_strings(abi["inputs"])
+    return f"{abi['name']}({','.join(types_list)})"
+
+
+def build_function_selector(abi: Dict) -> str:
+    sig = build_function_signature(abi)
+    return "0x" + keccak(sig.encode()).hex()[:8]
+
+
+def build_selector_index(abi: List[Dict]) -> Dict[str, int]:
+    """Maps the 4-byte selector of every function in `abi` to its position in `abi`.
+
+    Positions rather than entries are returned so the index can be persisted
+    next to the ABI without duplicating it.
+    """
+    index = {}
+    for position, entry in enumerate(abi):
+        if entry.get("type") == "function":
+            index.setdefault(build_function_selector(entry), position)
+    return index
+
+
+def selector_from_calldata(calldata: bytes) -> str:
+    return "0x" + bytes(calldata[:4]).hex()
@@ -0,0 +1,78 @@
+import os
+from typing import Dict, Optional, Tuple, Union
+
+from .abi_cache import AbiCache, get_abi_cache
+from .addresses import get_dao_voting_contract
+from .rpc import RpcClient
+from .vote_record import VoteRecord
+from .voting_reader import VotingParams, VotingReader
+
+
+def default_rpc_url() -> str:
+    return f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv('ALCHEMY_API_KEY')}"
+
+
+class DaoSession:
+    """Mainnet fork and contract handles shared by everything a CLI invocation does.
+
+    The fork happens once, lazily, on first use, and is pinned to a single
+    block so every read in the session sees the same state and reuses the
+    storage slots boa has already pulled from the node.
+
+    Args:
+        rpc_url (str): mainnet node, defaults to Alchemy with `$ALCHEMY_API_KEY`
+        block_identifier (int | str): block to pin the fork to
+        abi_cache (AbiCache): ABI store, defaults to the process-wide cache
+    """
+
+    def __init__(
+        self,
+        rpc_url: Optional[str] = None,
+        block_identifier: Union[int, str] = "safe",
+        abi_cache: Optional[AbiCache] = None,
+    ):
+        self.rpc_url = rpc_url or default_rpc_url()
+        self.block_identifier = block_identifier
+        self.abi_cache = abi_cache or get_abi_cache()
+        self.rpc = RpcClient(self.rpc_url)
+        self.block_number: Optional[int] = None
+        self._forked = False
+        self._voting_contracts: Dict[str, object] = {}
+        self._votes: Dict[Tuple[str, int], VoteRecord] = {}
+        self._voting_params: Dict[str, VotingParams] = {}
+
+    def fork(self):
+        if self._forked:
+            return
+
+        import boa
+
+        from .fork_rpc import ForkRPC
+
+        boa.env.fork_rpc(ForkRPC(self.rpc_url), block_identifier=self.block_identifier)
+        self.block_number = boa.env.evm.patch.block_number
+        self._forked = True
+
+    def voting_contract(self, vote_type: str):
+        if vote_type not in self._voting_contracts:
+            self.fork()
+            self._voting_contracts[vote_type] = self.abi_cache.load_contract(
+                get_dao_voting_contract(vote_type), name="AragonVoting"
+            )
+        return self._voting_contracts[vote_type]
+
+    def get_vote(self, vote_type: str, vote_id: int) -> VoteRecord:
+        """Returns the vote, calling `getVote` at most once per vote in this session."""
+        key = (vote_type, vote_id)
+        if key not in self._votes:
+            voting_contract = self.voting_contract(vote_type)
+            self._votes[key] = VoteRecord.from_tuple(voting_contract.getVote(vote_id))
+        return self._votes[key]
+
+    def get_voting_params(self, vote_type: str) -> VotingParams:
+        """Returns the voting contract settings, read in one aggregated call per session."""
+        if vote_type not in self._voting_params:
+            block = self.block_number if self.block_number is not None else self.block_identifier
+            reader = VotingReader.for_vote_type(self.rpc, vote_type, block_identifier=block)
+            self._voting_params[vote_type] = reader.get_params()
+        return self._voting_params[vote_type]
@@ -1,37 +1,106 @@
-import pprint
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
-import ape
-from ape.logging import logger
+import boa
 
 from .addresses import CONVEX_VOTERPROXY
+from .evm_script import parse_evm_script
+from .profile import ExecutionProfiler
+from .session import DaoSession
+from .state_diff import StorageRecorder, format_log
+from .vote_record import VoteRecord
 
+logger = logging.getLogger(__name__)
 
-def simulate(vote_id: int, voting_contract: str):
-    """Simulate passing vote on mainnet-fork"""
-    logger.info("--------- SIMULATE VOTE ---------")
 
-    aragon = ape.project.Voting.at(voting_contract)
+@dataclass(slots=True)
+class SimulationReport:
+    """Outcome of simulating the passing and execution of one vote."""
 
-    # print vote details to console first:
-    logger.info("Vote stats before Convex Vote:")
-    vote_stats = aragon.getVote(vote_id)
-    logger.info(pprint.pformat(vote_stats, indent=4))
+    vote_type: str
+    vote_id: int
+    block_number: int
+    executed: bool = False
+    error: Optional[str] = None
+    gas_used: Optional[int] = None
+    logs: List[Dict] = field(default_factory=list)
+    state_diff: List[Dict] = field(default_factory=list)
+    profile: Optional[Dict] = None
+    duration: float = 0.0
 
-    # vote
-    logger.info("Simulate Convex 'yes' vote")
-    aragon.vote(vote_id, True, False, sender=ape.accounts[CONVEX_VOTERPROXY])
 
-    # sleep for a week so it has time to pass
-    num_seconds = aragon.voteTime()
-    ape.chain.mine(deltatime=num_seconds)
+def simulate(
+    vote_id: int,
+    vote_type: str,
+    session: Optional[DaoSession] = None,
+    profile: bool = False,
+) -> SimulationReport:
+    """Simulate passing vote on mainnet-fork.
 
-    # get vote stats:
-    logger.info("Vote stats after 1 week:")
-    vote_stats = aragon.getVote(vote_id)
-    logger.info(pprint.pformat(vote_stats, indent=4))
+    Runs in-process on boa's pyevm fork: the Convex voter proxy votes yes
+    while the vote is open, time travels to the end of the voting period,
+    and the vote is executed. The fork is left in its post-execution state;
+    wrap the call in `boa.env.anchor()` to roll it back.
+
+    Args:
+        vote_id (int): vote to pass and execute
+        vote_type (str): ownership / parameter / emergency
+        session (DaoSession): fork to simulate on, defaults to a new session
+        profile (bool): also count opcodes and break gas down per action and
+            call, at the cost of a slower execution
+
+    Returns:
+        SimulationReport: gas used, events emitted and storage written by
+            `executeVote`, the latter two also grouped per script action
+
+    Raises:
+        ValueError: if the vote is already executed or cannot pass
+        BoaError: if voting or execution reverts
+    """
+    session = session or DaoSession()
+    started = time.perf_counter()
+    voting = session.voting_contract(vote_type)
+
+    vote = VoteRecord.from_tuple(voting.getVote(vote_id))
+    logger.info("Vote stats before Convex vote: %s", vote)
+    if vote.executed:
+        raise ValueError(f"Vote {vote_id} is already executed")
+
+    if vote.open:
+        logger.info("Simulate Convex 'yes' vote")
+        with boa.env.prank(CONVEX_VOTERPROXY):
+            voting.vote(vote_id, True, False)
+        # sleep until the vote closes
+        boa.env.time_travel(seconds=vote.start_date + voting.voteTime() - boa.env.timestamp)
+        logger.info("Vote stats after voting period: %s", voting.getVote(vote_id))
+
+    if not voting.canExecute(vote_id):
+        raise ValueError(f"Vote {vote_id} did not pass")
 
     # moment of truth - execute the vote!
-    logger.info("Simulate proposal execution")
-    enacter = ape.accounts[CONVEX_VOTERPROXY]
-    aragon.executeVote(vote_id, sender=enacter)
-    logger.info("Vote Executed!")
+    recorder = StorageRecorder()
+    profiler = ExecutionProfiler()
+    with recorder.record():
+        if profile:
+            with profiler.record():
+                voting.executeVote(vote_id)
+        else:
+            voting.executeVote(vote_id)
+    computation = voting._computation
+    logger.info("Vote executed!")
+
+    actions = parse_evm_script(vote.script)
+
+    return SimulationReport(
+        vote_type,
+        vote_id,
+        session.block_number,
+        executed=True,
+        gas_used=computation.get_gas_used(),
+        logs=[format_log(log) for log in computation.get_log_entries()],
+        state_diff=recorder.diff(computation, actions),
+        profile=profiler.profile(computation, actions) if profile else None,
+        duration=time.perf_counter() - started,
+    )
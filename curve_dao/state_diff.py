@@ -0,0 +1,141 @@
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import boa
+from eth_utils import to_checksum_address
+
+SSTORE = 0x55
+
+
+class StorageRecorder:
+    """Records every SSTORE executed by the EVM, per computation (call frame).
+
+    The SSTORE opcode of the computation class is wrapped while recording, so
+    writes are captured as they happen instead of re-reading contracts after
+    execution. Writes made in frames that later revert are discarded by
+    `diff`, which only follows frames that completed.
+
+    Args:
+        computation_class: py-evm computation class to patch, defaults to the
+            one boa's environment executes with
+    """
+
+    def __init__(self, computation_class=None):
+        self.computation_class = computation_class
+        # id(computation) -> [(address, slot, before, after)]
+        self.writes: Dict[int, List[Tuple[str, int, int, int]]] = {}
+        # keeps recorded computations alive so their ids stay unique
+        self._computations: List = []
+
+    @contextmanager
+    def record(self):
+        computation_class = (
+            self.computation_class or boa.env.evm.vm.state.computation_class
+        )
+        original_sstore = computation_class.opcodes[SSTORE]
+
+        def sstore(computation):
+            slot, value = computation.stack_pop_ints(2)
+            computation.stack_push_int(value)
+            computation.stack_push_int(slot)
+
+            address = computation.msg.storage_address
+            before = computation.state.get_storage(address, slot)
+            original_sstore(computation=computation)
+
+            key = id(computation)
+            if key not in self.writes:
+                self.writes[key] = []
+                self._computations.append(computation)
+            self.writes[key].append((to_checksum_address(address), slot, before, value))
+
+        # named like the opcode it replaces, for a profiler wrapping it in turn
+        sstore.mnemonic = getattr(original_sstore, "mnemonic", "SSTORE")
+        computation_class.opcodes[SSTORE] = sstore
+        try:
+            yield self
+        finally:
+            computation_class.opcodes[SSTORE] = original_sstore
+
+    def diff(self, computation, actions: Sequence[Tuple[str, bytes]] = ()) -> List[Dict]:
+        """Groups storage writes and events under the EVM script action that caused them.
+
+        Action frames are matched in script order by target and calldata; the
+        first group holds everything outside them (e.g. the voting contract
+        marking the vote as executed).
+
+        Args:
+            computation: root computation of the recorded transaction
+            actions (list(tuple)): (target, calldata) of each script action
+
+        Returns:
+            list(dict): `target`, `storage` (address -> slot -> before/after)
+                and `logs`, for the vote itself followed by each action
+        """
+        groups = [_Group(None)] + [_Group(target) for target, _ in actions]
+        matched = [0]
+
+        def collect(frame, group):
+            group.add_writes(self.writes.get(id(frame), []))
+            group.logs.extend(frame._log_entries)
+            for child in frame.children:
+                if child.is_error:
+                    continue
+                child_group = group
+                if matched[0] < len(actions) and is_action_frame(child, actions[matched[0]]):
+                    matched[0] += 1
+                    child_group = groups[matched[0]]
+                collect(child, child_group)
+
+        collect(computation, groups[0])
+        return [group.as_dict() for group in groups]
+
+
+class _Group:
+    def __init__(self, target: Optional[str]):
+        self.target = target
+        self.storage: Dict[str, Dict[int, List[int]]] = {}
+        self.logs: List[Tuple] = []
+
+    def add_writes(self, writes):
+        for address, slot, before, after in writes:
+            slots = self.storage.setdefault(address, {})
+            if slot in slots:
+                slots[slot][1] = after
+            else:
+                slots[slot] = [before, after]
+
+    def as_dict(self) -> Dict:
+        storage = {}
+        for address, slots in self.storage.items():
+            changed = {
+                hex(slot): {"before": hex(before), "after": hex(after)}
+                for slot, (before, after) in slots.items()
+                if before != after
+            }
+            if changed:
+                storage[address] = changed
+
+        return {
+            "target": self.target,
+            "storage": storage,
+            "logs": [format_log(log[1:]) for log in sorted(self.logs, key=lambda log: log[0])],
+        }
+
+
+def is_action_frame(frame, action: Tuple[str, bytes]) -> bool:
+    target, calldata = action
+    return (
+        to_checksum_address(frame.msg.to) == to_checksum_address(target)
+        and bytes(frame.msg.data) == bytes(calldata)
+    )
+
+
+def format_log(log) -> Dict:
+    """Formats a py-evm `(address, topics, data)` log entry as JSON-RPC does."""
+    address, topics, data = log
+    return {
+        "address": to_checksum_address(address),
+        "topics": ["0x" + topic.to_bytes(32, "big").hex() for topic in topics],
+        "data": "0x" + bytes(data).hex(),
+    }
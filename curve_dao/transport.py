@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# connections kept alive per host; matches the largest concurrency we use
+POOL_SIZE = 32
+
+_SESSION: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Returns the process-wide HTTP session, reusing connections across requests.
+
+    JSON-RPC, Etherscan and IPFS traffic all goes through this session, and
+    so does the boa fork (see `fork_rpc.ForkRPC`). When `$CURVE_DAO_CASSETTE`
+    is set it is recorded to, or replayed from, that cassette; see
+    `use_cassette`.
+    """
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+
+        cassette = os.getenv("CURVE_DAO_CASSETTE")
+        if cassette:
+            use_cassette(cassette, os.getenv("CURVE_DAO_CASSETTE_MODE", "replay"))
+    return _SESSION
+
+
+def reset_session():
+    """Drops the process-wide session without closing it.
+
+    For forked child processes: their copy of the session holds the parent's
+    keep-alive sockets, which must not be read or written from two processes.
+    The next `get_session` call opens fresh connections.
+    """
+    global _SESSION
+    _SESSION = None
+
+
+def use_cassette(path: Path, mode: str = "replay"):
+    """Routes the process-wide session through a record/replay cassette.
+
+    Args:
+        path (Path): cassette directory
+        mode (str): `replay` to run entirely from the cassette, `record` to
+            also hit the network for requests it doesn't hold yet
+
+    Returns:
+        Cassette: the cassette now serving the session
+    """
+    from .cassette import Cassette, CassetteAdapter
+
+    cassette = Cassette(path, mode)
+    adapter = CassetteAdapter(cassette, pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session = get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return cassette
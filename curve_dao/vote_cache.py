@@ -0,0 +1,188 @@
+import json
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+from .abi_cache import _atomic_write, default_cache_dir
+from .addresses import get_dao_voting_contract
+from .ipfs import DescriptionError, get_description_from_ipfs_hash, get_ipfs_hashes_from_votes
+from .rpc import RpcError
+from .session import DaoSession
+from .vote_events import get_vote_event_store
+from .vote_record import VoteRecord, is_value_pct
+from .vote_utils import MissingVote, decode_vote_script
+from .voting_reader import VotingReader
+
+
+class VoteCache:
+    """On-disk store of vote results keyed by voting contract and vote id.
+
+    Each entry holds the `getVote` record, the decoded script, the IPFS hash
+    and the description of a vote. The script and description are fixed
+    when a vote is created; the record is too once the vote is final, see
+    `is_final`. `ipfs_hash` is only set once it has been looked up, and is
+    `None` for final votes whose StartVote log could not be found.
+    `description` is only set once it has been fetched, and holds the error
+    message for final votes whose description could not be fetched.
+
+    Args:
+        root (Path): cache directory, defaults to `$CURVE_DAO_CACHE_DIR`
+            or `~/.cache/curve-dao`
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or default_cache_dir()) / "votes"
+
+    def get(self, voting: str, vote_id: int) -> Optional[Dict]:
+        path = self._path(voting, vote_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())
+
+    def put(self, voting: str, vote_id: int, entry: Dict):
+        path = self._path(voting, vote_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, json.dumps(entry))
+
+    def _path(self, voting: str, vote_id: int) -> Path:
+        return self.root / voting.lower() / f"{vote_id}.json"
+
+
+def is_final(vote: VoteRecord) -> bool:
+    """Whether the vote can no longer change: executed, or closed without passing."""
+    if vote.executed:
+        return True
+    if vote.open:
+        return False
+    return not (
+        is_value_pct(vote.yea, vote.yea + vote.nay, vote.support_required)
+        and is_value_pct(vote.yea, vote.voting_power, vote.min_accept_quorum)
+    )
+
+
+def get_vote_result(
+    vote_type: str,
+    vote_id: int,
+    session: Optional[DaoSession] = None,
+    cache: Optional[VoteCache] = None,
+) -> Dict:
+    """Returns the record, decoded actions and description of a vote, from the cache if possible.
+
+    Final votes are served from disk without touching the node. Other votes
+    only have their record refreshed, with a single `getVote` eth_call and
+    no fork; the script is decoded and the StartVote log read once per vote.
+    Like the descriptions themselves, the IPFS hash is best effort: if it
+    can't be read the description is `None` and the lookup is retried on the
+    next call. The description itself is fetched by `get_vote_description`.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        vote_id (int): vote to look up
+        session (DaoSession): node and ABI store to fill the cache from
+        cache (VoteCache): vote result store, defaults to the process-wide one
+
+    Returns:
+        dict: `vote` (VoteRecord), `vote_time`, `actions` (formatted decoded
+            actions), `ipfs_hash` and `final`
+
+    Raises:
+        MissingVote: if the vote does not exist
+    """
+    cache = cache or get_vote_cache()
+    voting = get_dao_voting_contract(vote_type)
+    entry = cache.get(voting, vote_id)
+    updated = False
+
+    if entry is None or not entry["final"]:
+        session = session or DaoSession()
+        reader = VotingReader(session.rpc, voting, session.block_identifier)
+        (vote,) = reader.get_votes([vote_id])
+        if vote is None:
+            raise MissingVote(f"Vote {vote_id} does not exist")
+
+        if entry is None:
+            entry = {
+                "vote_time": session.get_voting_params(vote_type).vote_time,
+                "actions": [
+                    action["formatted_output"]
+                    for action in decode_vote_script(vote.script, session.abi_cache)
+                ],
+            }
+        entry["vote"] = _vote_to_json(vote)
+        entry["final"] = is_final(vote)
+        updated = True
+
+    result = _load_entry(entry)
+    if "ipfs_hash" not in entry:
+        session = session or DaoSession()
+        try:
+            ipfs_hashes = get_ipfs_hashes_from_votes(
+                vote_type, {vote_id: result["vote"]}, session.rpc, get_vote_event_store()
+            )
+        except (RpcError, requests.RequestException):
+            ipfs_hashes = None
+
+        if ipfs_hashes is not None and (vote_id in ipfs_hashes or entry["final"]):
+            # a final vote without a StartVote log won't get one later
+            entry["ipfs_hash"] = ipfs_hashes.get(vote_id)
+            updated = True
+
+    if updated:
+        cache.put(voting, vote_id, entry)
+
+    result["ipfs_hash"] = entry.get("ipfs_hash")
+    return result
+
+
+def get_vote_description(vote_type: str, vote_id: int, cache: Optional[VoteCache] = None):
+    """Returns the description of a vote looked up by `get_vote_result`.
+
+    Descriptions are fetched from IPFS once per vote and kept in its cache
+    entry. If the fetch fails the error message is returned instead, and is
+    only kept for final votes, whose description is not retried.
+
+    Args:
+        vote_type (str): ownership / parameter / emergency
+        vote_id (int): vote to look up
+        cache (VoteCache): vote result store, defaults to the process-wide one
+
+    Returns:
+        description, error message, or `None` if the vote has no known IPFS hash
+    """
+    cache = cache or get_vote_cache()
+    voting = get_dao_voting_contract(vote_type)
+    entry = cache.get(voting, vote_id)
+    if entry is None or entry.get("ipfs_hash") is None:
+        return None
+    if "description" in entry:
+        return entry["description"]
+
+    description = get_description_from_ipfs_hash(entry["ipfs_hash"])
+    if not isinstance(description, DescriptionError) or entry["final"]:
+        entry["description"] = description
+        cache.put(voting, vote_id, entry)
+    return description
+
+
+def _vote_to_json(vote: VoteRecord) -> Dict:
+    vote_json = {field.name: getattr(vote, field.name) for field in fields(VoteRecord)}
+    vote_json["script"] = "0x" + bytes(vote.script).hex()
+    return vote_json
+
+
+def _load_entry(entry: Dict) -> Dict:
+    vote = entry["vote"] | {"script": bytes.fromhex(entry["vote"]["script"][2:])}
+    return entry | {"vote": VoteRecord(**vote)}
+
+
+_DEFAULT_CACHE: Optional[VoteCache] = None
+
+
+def get_vote_cache() -> VoteCache:
+    """Returns the process-wide vote cache used when none is passed explicitly."""
+    global _DEFAULT_CACHE
+    if _DEFAULT_CACHE is None:
+        _DEFAULT_CACHE = VoteCache()
+    return _DEFAULT_CACHE
@@ -0,0 +1,314 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from eth_hash.auto import keccak
+from eth_utils import to_checksum_address
+
+from .abi_cache import default_cache_dir
+from .addresses import VOTE_TYPES, get_dao_voting_contract
+from .decoder_utils import decode_abi
+from .rpc import RpcClient, RpcError
+
+START_VOTE_TOPIC = "0x" + keccak(
+    b"StartVote(uint256,address,string,uint256,uint256,uint256,uint256)"
+).hex()
+CAST_VOTE_TOPIC = "0x" + keccak(b"CastVote(uint256,address,bool,uint256)").hex()
+EXECUTE_VOTE_TOPIC = "0x" + keccak(b"ExecuteVote(uint256)").hex()
+EVENT_NAMES = {
+    START_VOTE_TOPIC: "StartVote",
+    CAST_VOTE_TOPIC: "CastVote",
+    EXECUTE_VOTE_TOPIC: "ExecuteVote",
+}
+
+# non-indexed StartVote fields: metadata, minBalance, minTime, totalSupply, creatorVotingPower
+START_VOTE_DATA_TYPES = ["string", "uint256", "uint256", "uint256", "uint256"]
+CAST_VOTE_DATA_TYPES = ["bool", "uint256"]
+
+# before the Curve DAO voting contracts were deployed (August 2020)
+GENESIS_BLOCK = 10_600_000
+# blocks per eth_getLogs request; halved whenever the node refuses a range
+BLOCK_RANGE = 10_000
+# blocks behind head considered final
+CONFIRMATIONS = 12
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS start_vote (
+    voting TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    creator TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    min_balance TEXT NOT NULL,
+    min_time TEXT NOT NULL,
+    total_supply TEXT NOT NULL,
+    creator_voting_power TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    PRIMARY KEY (voting, vote_id)
+);
+CREATE TABLE IF NOT EXISTS cast_vote (
+    voting TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    voter TEXT NOT NULL,
+    supports INTEGER NOT NULL,
+    stake TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    PRIMARY KEY (tx_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS cast_vote_by_vote ON cast_vote (voting, vote_id);
+CREATE INDEX IF NOT EXISTS cast_vote_by_voter ON cast_vote (voter);
+CREATE TABLE IF NOT EXISTS execute_vote (
+    voting TEXT NOT NULL,
+    vote_id INTEGER NOT NULL,
+    block_number INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    PRIMARY KEY (voting, vote_id)
+);
+CREATE TABLE IF NOT EXISTS checkpoint (
+    voting TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+class VoteEventStore:
+    """SQLite store of StartVote, CastVote and ExecuteVote events.
+
+    Amounts are stored as decimal strings: they overflow SQLite integers.
+
+    Args:
+        path (Path): database file, defaults to `events.sqlite` in the cache dir
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        path = Path(path or default_cache_dir() / "events.sqlite")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def get_checkpoint(self, vote_type: str) -> Optional[int]:
+        """Returns the last block fully indexed for a voting contract."""
+        row = self.db.execute(
+            "SELECT block_number FROM checkpoint WHERE voting = ?", (_voting(vote_type),)
+        ).fetchone()
+        return row["block_number"] if row else None
+
+    def get_start_vote(self, vote_type: str, vote_id: int) -> Optional[Dict]:
+        row = self.db.execute(
+            "SELECT * FROM start_vote WHERE voting = ? AND vote_id = ?",
+            (_voting(vote_type), vote_id),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_ipfs_hash(self, vote_type: str, vote_id: int) -> Optional[str]:
+        start_vote = self.get_start_vote(vote_type, vote_id)
+        return start_vote["metadata"][5:] if start_vote else None
+
+    def get_casts(self, vote_type: str, vote_id: int) -> List[Dict]:
+        """Returns every CastVote of a vote, in chain order."""
+        rows = self.db.execute(
+            "SELECT * FROM cast_vote WHERE voting = ? AND vote_id = ? "
+            "ORDER BY block_number, log_index",
+            (_voting(vote_type), vote_id),
+        )
+        return [dict(row) for row in rows]
+
+    def get_voter_history(self, voter: str) -> List[Dict]:
+        """Returns every CastVote of a voter across all voting contracts."""
+        rows = self.db.execute(
+            "SELECT * FROM cast_vote WHERE voter = ? ORDER BY block_number, log_index",
+            (to_checksum_address(voter),),
+        )
+        return [dict(row) for row in rows]
+
+    def is_executed(self, vote_type: str, vote_id: int) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM execute_vote WHERE voting = ? AND vote_id = ?",
+            (_voting(vote_type), vote_id),
+        ).fetchone()
+        return row is not None
+
+    def add_logs(self, vote_type: str, logs: Iterable[Dict], checkpoint: int):
+        """Stores decoded logs and moves the checkpoint in one transaction.
+
+        An interrupted sync therefore never leaves events past the checkpoint,
+        and re-indexing a range is idempotent.
+        """
+        voting = _voting(vote_type)
+        with self.db:
+            for log in logs:
+                self._add_log(voting, log)
+            self.db.execute(
+                "INSERT OR REPLACE INTO checkpoint (voting, block_number) VALUES (?, ?)",
+                (voting, checkpoint),
+            )
+
+    def _add_log(self, voting: str, log: Dict):
+        event = decode_vote_log(log)
+
+        if event["event"] == "StartVote":
+            self.db.execute(
+                "INSERT OR REPLACE INTO start_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    voting,
+                    event["vote_id"],
+                    event["creator"],
+                    event["metadata"],
+                    str(event["min_balance"]),
+                    str(event["min_time"]),
+                    str(event["total_supply"]),
+                    str(event["creator_voting_power"]),
+                    event["block_number"],
+                    event["tx_hash"],
+                ),
+            )
+        elif event["event"] == "CastVote":
+            self.db.execute(
+                "INSERT OR REPLACE INTO cast_vote VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    voting,
+                    event["vote_id"],
+                    event["voter"],
+                    int(event["supports"]),
+                    str(event["stake"]),
+                    event["block_number"],
+                    event["tx_hash"],
+                    event["log_index"],
+                ),
+            )
+        elif event["event"] == "ExecuteVote":
+            self.db.execute(
+                "INSERT OR REPLACE INTO execute_vote VALUES (?, ?, ?, ?)",
+                (voting, event["vote_id"], event["block_number"], event["tx_hash"]),
+            )
+
+
+class VoteEventIndexer:
+    """Incrementally copies voting contract events from a node into a VoteEventStore.
+
+    Args:
+        rpc (RpcClient): node to read logs from
+        store (VoteEventStore): where events and checkpoints are kept
+        block_range (int): blocks per eth_getLogs request
+        confirmations (int): blocks behind head that are left unindexed
+    """
+
+    def __init__(
+        self,
+        rpc: RpcClient,
+        store: VoteEventStore,
+        block_range: int = BLOCK_RANGE,
+        confirmations: int = CONFIRMATIONS,
+    ):
+        self.rpc = rpc
+        self.store = store
+        self.block_range = block_range
+        self.confirmations = confirmations
+
+    def sync(self, vote_types: Iterable[str] = VOTE_TYPES, to_block: Optional[int] = None):
+        """Indexes every voting contract from its checkpoint up to `to_block`.
+
+        Returns:
+            dict: logs indexed per vote type
+        """
+        if to_block is None:
+            to_block = int(self.rpc.call("eth_blockNumber"), 16) - self.confirmations
+
+        return {vote_type: self.sync_contract(vote_type, to_block) for vote_type in vote_types}
+
+    def sync_contract(self, vote_type: str, to_block: int) -> List[Dict]:
+        indexed = []
+        for logs in self.follow(vote_type, to_block):
+            indexed.extend(logs)
+        return indexed
+
+    def follow(self, vote_type: str, to_block: int) -> Iterator[List[Dict]]:
+        """Yields the logs of a voting contract one block range at a time.
+
+        A range is stored, and the checkpoint moved past it, only when the
+        next one is requested, so a consumer that stops or crashes while
+        handling a range sees it again on the next run.
+        """
+        checkpoint = self.store.get_checkpoint(vote_type)
+        from_block = GENESIS_BLOCK if checkpoint is None else checkpoint + 1
+
+        while from_block <= to_block:
+            stop_block = min(from_block + self.block_range - 1, to_block)
+            try:
+                logs = self._get_logs(vote_type, from_block, stop_block)
+            except RpcError:
+                if self.block_range == 1:
+                    raise
+                # too many results or too wide a range for this node
+                self.block_range //= 2
+                continue
+
+            yield logs
+            self.store.add_logs(vote_type, logs, stop_block)
+            from_block = stop_block + 1
+
+    def _get_logs(self, vote_type: str, from_block: int, to_block: int) -> List[Dict]:
+        return self.rpc.call(
+            "eth_getLogs",
+            [
+                {
+                    "address": get_dao_voting_contract(vote_type),
+                    "fromBlock": hex(from_block),
+                    "toBlock": hex(to_block),
+                    "topics": [[START_VOTE_TOPIC, CAST_VOTE_TOPIC, EXECUTE_VOTE_TOPIC]],
+                }
+            ],
+        )
+
+
+def decode_vote_log(log: Dict) -> Dict:
+    """Decodes a StartVote, CastVote or ExecuteVote log into a flat dict of its fields."""
+    topic = log["topics"][0]
+    event = {
+        "event": EVENT_NAMES[topic],
+        "vote_id": int(log["topics"][1], 16),
+        "block_number": int(log["blockNumber"], 16),
+        "tx_hash": log["transactionHash"],
+        "log_index": int(log["logIndex"], 16),
+    }
+    data = bytes.fromhex(log["data"][2:])
+
+    if topic == START_VOTE_TOPIC:
+        metadata, min_balance, min_time, total_supply, creator_voting_power = decode_abi(
+            START_VOTE_DATA_TYPES, data
+        )
+        event.update(
+            creator=_topic_address(log["topics"][2]),
+            metadata=metadata,
+            min_balance=min_balance,
+            min_time=min_time,
+            total_supply=total_supply,
+            creator_voting_power=creator_voting_power,
+        )
+    elif topic == CAST_VOTE_TOPIC:
+        supports, stake = decode_abi(CAST_VOTE_DATA_TYPES, data)
+        event.update(voter=_topic_address(log["topics"][2]), supports=supports, stake=stake)
+
+    return event
+
+
+def _voting(vote_type: str) -> str:
+    return get_dao_voting_contract(vote_type).lower()
+
+
+def _topic_address(topic: str) -> str:
+    return to_checksum_address("0x" + topic[-40:])
+
+
+_DEFAULT_STORE: Optional[VoteEventStore] = None
+
+
+def get_vote_event_store() -> VoteEventStore:
+    """Returns the process-wide event store used when none is passed explicitly."""
+    global _DEFAULT_STORE
+    if _DEFAULT_STORE is None:
+        _DEFAULT_STORE = VoteEventStore()
+    return _DEFAULT_STORE
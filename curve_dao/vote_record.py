@@ -0,0 +1,41 @@
+from dataclasses import dataclass, fields
+from typing import Sequence
+
+# Aragon percentages are scaled by 1e18
+PCT_BASE = 10**18
+
+DEFAULT_VOTE_TIME = 604800
+
+
+@dataclass(frozen=True, slots=True)
+class VoteRecord:
+    """Result of `Voting.getVote(voteId)`, with named fields in ABI order."""
+
+    open: bool
+    executed: bool
+    start_date: int
+    snapshot_block: int
+    support_required: int
+    min_accept_quorum: int
+    yea: int
+    nay: int
+    voting_power: int
+    script: bytes
+
+    @classmethod
+    def from_tuple(cls, vote: Sequence) -> "VoteRecord":
+        if len(vote) != len(fields(cls)):
+            raise ValueError(f"getVote returned {len(vote)} values, expected {len(fields(cls))}")
+        return cls(*vote)
+
+
+def is_value_pct(value: int, total: int, pct: int) -> bool:
+    """`Voting._isValuePct`: whether `value / total` is strictly above the 1e18-scaled `pct`."""
+    if total == 0:
+        return False
+    return value * PCT_BASE // total > pct
+
+
+def value_pct(value: int, total: int) -> int:
+    """`value / total` scaled by 1e18 and rounded down like the voting contract, 0 if `total` is 0."""
+    return value * PCT_BASE // total if total else 0
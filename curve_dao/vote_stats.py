@@ -0,0 +1,186 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .vote_record import DEFAULT_VOTE_TIME, PCT_BASE, VoteRecord
+from .voting_reader import VotingReader
+
+# votes fetched per aggregated read
+CHUNK_SIZE = 200
+
+OPEN = 0
+PASSED = 1
+FAILED_SUPPORT = 2
+FAILED_QUORUM = 3
+FAILED_BOTH = 4
+NO_VOTES = 5
+
+OUTCOME_LABELS = {
+    OPEN: "open",
+    PASSED: "passed",
+    FAILED_SUPPORT: "failed: support",
+    FAILED_QUORUM: "failed: quorum",
+    FAILED_BOTH: "failed: support and quorum",
+    NO_VOTES: "no votes",
+}
+
+
+def vote_columns(
+    votes: Sequence[VoteRecord], vote_ids: Optional[Sequence[int]] = None
+) -> Dict[str, np.ndarray]:
+    """Turns vote records into one array per field.
+
+    Token amounts and thresholds exceed int64, so they are held as exact
+    Python integers in object arrays.
+
+    Args:
+        votes (list(VoteRecord)): votes to analyse; `None` entries are dropped
+        vote_ids (list(int)): id of each vote, defaults to its position
+
+    Returns:
+        dict: `vote_id`, `open`, `executed`, `start_date`, `support_required`,
+            `min_accept_quorum`, `yea`, `nay` and `voting_power` arrays
+    """
+    if vote_ids is None:
+        vote_ids = range(len(votes))
+    rows = [(i, v) for i, v in zip(vote_ids, votes) if v is not None]
+
+    def column(field, dtype):
+        return np.array([getattr(v, field) for _, v in rows], dtype=dtype)
+
+    return {
+        "vote_id": np.array([i for i, _ in rows], dtype=np.int64),
+        "open": column("open", bool),
+        "executed": column("executed", bool),
+        "start_date": column("start_date", np.int64),
+        "support_required": column("support_required", object),
+        "min_accept_quorum": column("min_accept_quorum", object),
+        "yea": column("yea", object),
+        "nay": column("nay", object),
+        "voting_power": column("voting_power", object),
+    }
+
+
+def compute_vote_stats(
+    columns: Dict[str, np.ndarray], vote_time: int = DEFAULT_VOTE_TIME
+) -> Dict[str, np.ndarray]:
+    """Computes the outcome of every vote in one vectorized pass.
+
+    Follows the voting contract with exact integer arithmetic: support is
+    `yea * 1e18 // (yea + nay)` and quorum is `yea * 1e18 // votingPower`,
+    each of which must be strictly above the vote's own threshold. The
+    fractions returned alongside are for reporting only.
+
+    Args:
+        columns (dict): arrays as returned by `vote_columns`
+        vote_time (int): voting period in seconds
+
+    Returns:
+        dict: `outcome` codes; exact 1e18-scaled `support_pct`, `quorum_pct`,
+            `participation_pct`, `support_margin_pct` and `quorum_margin_pct`;
+            the same as 0 - 1 `support`, `quorum`, `participation`,
+            `support_margin` and `quorum_margin` floats; `end`, and
+            `passed_not_executed`
+    """
+    yea = columns["yea"]
+    total = yea + columns["nay"]
+    voting_power = columns["voting_power"]
+    has_votes = (total > 0).astype(bool)
+    has_power = (voting_power > 0).astype(bool)
+
+    # divide by 1 where there is nothing to divide, and zero the result
+    support_pct = np.where(has_votes, yea * PCT_BASE // np.where(has_votes, total, 1), 0)
+    quorum_pct = np.where(has_power, yea * PCT_BASE // np.where(has_power, voting_power, 1), 0)
+    participation_pct = np.where(
+        has_power, total * PCT_BASE // np.where(has_power, voting_power, 1), 0
+    )
+
+    support_margin_pct = support_pct - columns["support_required"]
+    quorum_margin_pct = quorum_pct - columns["min_accept_quorum"]
+    support_met = has_votes & (support_margin_pct > 0).astype(bool)
+    quorum_met = has_power & (quorum_margin_pct > 0).astype(bool)
+
+    outcome = np.select(
+        [
+            columns["open"],
+            ~has_votes | ~has_power,
+            support_met & quorum_met,
+            quorum_met,
+            support_met,
+        ],
+        [OPEN, NO_VOTES, PASSED, FAILED_SUPPORT, FAILED_QUORUM],
+        default=FAILED_BOTH,
+    )
+
+    def fraction(pct):
+        return pct.astype(np.float64) / PCT_BASE
+
+    return {
+        "vote_id": columns["vote_id"],
+        "outcome": outcome,
+        "support_pct": support_pct,
+        "quorum_pct": quorum_pct,
+        "participation_pct": participation_pct,
+        "support_margin_pct": support_margin_pct,
+        "quorum_margin_pct": quorum_margin_pct,
+        "support": fraction(support_pct),
+        "quorum": fraction(quorum_pct),
+        "participation": fraction(participation_pct),
+        "support_margin": fraction(support_margin_pct),
+        "quorum_margin": fraction(quorum_margin_pct),
+        "start": columns["start_date"],
+        "end": columns["start_date"] + vote_time,
+        "passed_not_executed": (outcome == PASSED) & ~columns["executed"],
+    }
+
+
+def summarize_vote_stats(stats: Dict[str, np.ndarray]) -> Dict:
+    """Aggregates per-vote stats into totals, medians and timing figures."""
+    outcome = stats["outcome"]
+    closed = outcome != OPEN
+    counted = closed & (outcome != NO_VOTES)
+    starts = np.sort(stats["start"])
+    gaps = np.diff(starts)
+
+    def median(values):
+        return float(np.median(values)) if len(values) else None
+
+    return {
+        "votes": int(len(outcome)),
+        "outcomes": {
+            label: int(np.count_nonzero(outcome == code))
+            for code, label in OUTCOME_LABELS.items()
+        },
+        "pass_rate": float(np.mean(outcome[closed] == PASSED)) if closed.any() else None,
+        "passed_not_executed": int(np.count_nonzero(stats["passed_not_executed"])),
+        "median_support": median(stats["support"][counted]),
+        "median_quorum": median(stats["quorum"][counted]),
+        "median_participation": median(stats["participation"][counted]),
+        "median_support_margin": median(stats["support_margin"][counted]),
+        "median_quorum_margin": median(stats["quorum_margin"][counted]),
+        "first_start": int(starts[0]) if len(starts) else None,
+        "last_start": int(starts[-1]) if len(starts) else None,
+        "median_seconds_between_votes": median(gaps),
+    }
+
+
+def read_vote_stats(
+    reader: VotingReader, vote_ids: Iterable[int], chunk_size: int = CHUNK_SIZE
+) -> Dict[str, np.ndarray]:
+    """Reads votes in aggregated chunks and computes their stats.
+
+    Args:
+        reader (VotingReader): voting contract to read from
+        vote_ids (iterable(int)): votes to analyse
+        chunk_size (int): votes per aggregated read
+
+    Returns:
+        dict: per-vote stats as returned by `compute_vote_stats`
+    """
+    vote_ids = list(vote_ids)
+    votes: List[Optional[VoteRecord]] = []
+    for start in range(0, len(vote_ids), chunk_size):
+        votes.extend(reader.get_votes(vote_ids[start : start + chunk_size]))
+
+    vote_time = reader.get_params().vote_time
+    return compute_vote_stats(vote_columns(votes, vote_ids), vote_time)
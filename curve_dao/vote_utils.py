@@ -1,25 +1,23 @@
 import warnings
 from datetime import datetime
 from typing import Dict, List, Tuple
-import sys
-import os
-from rich.console import Console as RichConsole
 
-import boa
-
-from .addresses import get_dao_voting_contract
+from .abi_cache import AbiCache, get_abi_cache
+from .calldata import CalldataEncoder, encode_agent_execute
 from .decoder_utils import decode_input
+from .evm_script import AGENT_EXECUTE_SELECTOR, build_evm_script, parse_evm_script
+from .selectors import selector_from_calldata
 from .ipfs import get_ipfs_hash_from_description
+from .session import DaoSession
+from .vote_record import DEFAULT_VOTE_TIME, PCT_BASE, VoteRecord, is_value_pct, value_pct
 
 warnings.filterwarnings("ignore")
 
-logger = RichConsole(file=sys.stdout)
-
 class MissingVote(Exception):
     """Exception raised when a vote ID is invalid."""
 
 
-def get_evm_script(target, actions):
+def get_evm_script(target, actions, abi_cache: AbiCache = None):
     """Prepares EVM script and creates an on-chain AragonDAO vote.
 
     Args:
@@ -32,56 +30,44 @@ def get_evm_script(target, actions):
         str: vote ID of the created vote.
     """
 
-    aragon_voting = boa.from_etherscan(target["voting"], name="AragonVoting", api_key=os.getenv("ETHERSCAN_API_KEY"))
+    abi_cache = abi_cache or get_abi_cache()
+    aragon_voting = abi_cache.load_contract(target["voting"], name="AragonVoting")
 
     #vote_creator = boa.env.eoa
     #assert aragon_voting.canCreateNewVote(vote_creator), "dev: user cannot create new vote"
 
-    evm_script = prepare_evm_script(target, actions)
+    evm_script = prepare_evm_script(target, actions, abi_cache)
     return evm_script
 
 
 
-def prepare_evm_script(target: Dict, actions: List[Tuple]):
+def prepare_evm_script(target: Dict, actions: List[Tuple], abi_cache: AbiCache = None):
     """Generates EVM script to be executed by AragonDAO contracts.
 
     Args:
         target (dict): CURVE_DAO_OWNERSHIP / CURVE_DAO_PARAMS / EMERGENCY_DAO
         actions (list(tuple)): ("target addr", "fn_name", *args)
+        abi_cache (AbiCache): ABI store, defaults to the process-wide cache
 
     Returns:
         str: Generated EVM script.
     """
-    aragon_agent = boa.from_etherscan(target["agent"], name="AragonAgent", api_key=os.getenv("ETHERSCAN_API_KEY"))
-    aragon_voting = boa.from_etherscan(target["voting"], name="AragonVoting", api_key=os.getenv("ETHERSCAN_API_KEY"))
-
-    evm_script = bytes.fromhex("00000001")
+    encoder = CalldataEncoder(abi_cache)
 
+    agent_actions = []
     for action in actions:
         address, fn_name, *args = action
-        contract = boa.from_etherscan(address=address, name="TargetContract", api_key=os.getenv("ETHERSCAN_API_KEY"))
-        contract_function = getattr(contract, fn_name)
-        
-        calldata = contract_function.prepare_calldata(*args)
-        agent_calldata = aragon_agent.execute.prepare_calldata(address, 0, calldata)
-        
-        length = bytes.fromhex(hex(len(agent_calldata.hex()) // 2)[2:].zfill(8))
-        evm_script = evm_script + bytes.fromhex(aragon_agent.address[2:]) + length + agent_calldata
+        calldata = encoder.encode(address, fn_name, *args)
+        agent_actions.append((target["agent"], encode_agent_execute(address, calldata)))
 
-
-    return evm_script
+    return build_evm_script(agent_actions)
 
 
 # working.
-def get_vote_script(vote_id: str, vote_type: str) -> str:
+def get_vote_script(vote_id: str, vote_type: str, session: DaoSession = None) -> str:
     
     try:
-        boa.env.fork(f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv("ALCHEMY_API_KEY")}")
-        voting_contract_address = get_dao_voting_contract(vote_type)
-        voting_contract = boa.from_etherscan(voting_contract_address, name="test", api_key=os.getenv("ETHERSCAN_API_KEY"))
-        vote = voting_contract.getVote(vote_id)
-        script = vote[9]
-        return script
+        return (session or DaoSession()).get_vote(vote_type, vote_id).script
     # to borad of an exception. what to do here?
     except Exception as e:
         raise MissingVote(f"Could not grab vote script: {e}")
@@ -89,61 +75,58 @@ def get_vote_script(vote_id: str, vote_type: str) -> str:
 
 
 # working
-def get_vote_data(vote_id: str, vote_type: str) -> str:
+def get_vote_data(vote_id: str, vote_type: str, session: DaoSession = None) -> str:
+
+    session = session or DaoSession()
+    vote = session.get_vote(vote_type, vote_id)
 
-    boa.env.fork(f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv("ALCHEMY_API_KEY")}")
-    voting_contract_address = get_dao_voting_contract(vote_type)
-    voting_contract = boa.from_etherscan(voting_contract_address, name="test", api_key=os.getenv("ETHERSCAN_API_KEY"))
-    vote_data = voting_contract.getVote(vote_id)
+    return vote_data(vote, session.get_voting_params(vote_type).vote_time)
 
+
+def vote_data(vote: VoteRecord, vote_time: int) -> Dict:
+    """Vote tallies and thresholds in the shape `decode_vote_data` expects."""
     return {
-        "yea": vote_data[6],
-        "nay": vote_data[7],
-        "votingPower": vote_data[8],
-        "open": vote_data[0],
-        "executed": vote_data[1],
-        "startDate": vote_data[2],
+        "yea": vote.yea,
+        "nay": vote.nay,
+        "votingPower": vote.voting_power,
+        "open": vote.open,
+        "executed": vote.executed,
+        "startDate": vote.start_date,
+        "supportRequired": vote.support_required,
+        "minAcceptQuorum": vote.min_accept_quorum,
+        "voteTime": vote_time,
     }
 
 
 # working 
-def decode_vote_script(script):
-    idx = 4
-
-    votes = []
-    while idx < len(script):
+def decode_vote_script(script, abi_cache: AbiCache = None):
+    """Decodes the actions of an Aragon EVM script.
 
-        boa.env.fork(f"https://eth-mainnet.g.alchemy.com/v2/{os.getenv("ALCHEMY_API_KEY")}")
+    Decoding is pure: no chain state is read and ABIs only come from
+    `abi_cache`. Pass `AbiCache(offline=True)` to decode without any network
+    access, e.g. when auditing historical votes in a sandbox.
 
-        # can just replace ape.Contract(...) with boa.from_etherscan(script[idx : idx + 20], name="target")
-        # works; get target contract address
-        target = script[idx : idx + 20]
-        target = target.hex()
-        target = "0x" + target
-        idx += 20
+    Args:
+        script (bytes): EVM script as stored in the voting contract
+        abi_cache (AbiCache): ABI store, defaults to the process-wide cache
 
-        boa.env.fork("https://eth-mainnet.g.alchemy.com/v2/plo7qLFX6AtZLU6Nk5Fl8TREW8qPq8S2")
-        voting_contract = boa.from_etherscan(target, name="test", api_key=os.getenv("ETHERSCAN_API_KEY"))
-        length = int(script[idx : idx + 4].hex(), 16)
-        idx += 4
+    Returns:
+        list(dict): decoded actions
+    """
+    abi_cache = abi_cache or get_abi_cache()
 
-        # get calldata to execute for the dao:
-        calldata = script[idx : idx + length]
-        idx += length
+    votes = []
+    for target, calldata in parse_evm_script(script):
 
-        # target and calldata matching
-        # fix decode input
-        fn, inputs = decode_input(target, calldata)
+        fn, inputs = decode_input(target, calldata, abi_cache)
         agent = None
 
-        # print decoded vote:
-        # target is either target_addr or target_contract. idk... yet...
-        if "0x" + str(calldata[:4].hex()) == "0xb61d27f6":
+        # calls via the agent wrap the actual call in Agent.execute:
+        if selector_from_calldata(calldata) == AGENT_EXECUTE_SELECTOR:
             agent = target
             target = inputs[0]
 
-            # decode_input does not work here because we need to fetch the abi of the target contract.
-            fn, inputs = decode_input(target, inputs[2])
+            fn, inputs = decode_input(target, inputs[2], abi_cache)
             inputs_with_names = get_inputs_with_names(fn, inputs)
             formatted_inputs = format_fn_inputs(inputs_with_names)
             formatted_output = (
@@ -177,30 +160,39 @@ def decode_vote_script(script):
 
 # works
 def decode_vote_data(data: dict, vote_type: str):
+    """Evaluates a vote the way the voting contract does.
+
+    Support (`yea / (yea + nay)`) and quorum (`yea / votingPower`) are
+    computed with the contract's 1e18-scaled integer arithmetic and must be
+    strictly above the thresholds the vote was created with.
+
+    Args:
+        data (dict): vote tallies and thresholds as returned by `get_vote_data`
+        vote_type (str): ownership / parameter / emergency
+
+    Returns:
+        dict: vote results, with `support` and `quorum` scaled by 1e18
+    """
     yes = round(data["yea"] / 1e18, 2)
     no = round(data["nay"] / 1e18, 2)
     total_votes = data["yea"] + data["nay"]
     total_voting_power = data["votingPower"]
+    vote_time = data.get("voteTime", DEFAULT_VOTE_TIME)
 
-    VOTE_TIME = 604800
-
-    # Handle edge case where there are no votes at all
-    if total_votes == 0 or total_voting_power == 0:
-        quorum = 0
-        support = 0
-    else:
-        quorum = total_votes / total_voting_power
-        support = data["yea"] / total_votes
+    support = value_pct(data["yea"], total_votes)
+    quorum = value_pct(data["yea"], total_voting_power)
 
-    required_support = 0.51 if vote_type == "ownership" else 0.30
-    required_quorum = 0.30 if vote_type == "ownership" else 0.15
+    required_support = data["supportRequired"]
+    required_quorum = data["minAcceptQuorum"]
+    support_met = is_value_pct(data["yea"], total_votes, required_support)
+    quorum_met = is_value_pct(data["yea"], total_voting_power, required_quorum)
 
     if data["open"]:  # Voting is ongoing
         pass_status = "[yellow]Voting Ongoing[/]"
     else:  # Voting is closed
         if total_votes == 0 or total_voting_power == 0:
             pass_status = "[red]Vote Invalid: No Votes[/]"
-        elif support >= required_support and quorum >= required_quorum:
+        elif support_met and quorum_met:
             # Check if the vote has been executed
             execution_status = (
                 "[green]Executed[/]" if data["executed"] else "[red]Not Executed[/]"
@@ -209,16 +201,16 @@ def decode_vote_data(data: dict, vote_type: str):
                 f"[green]Vote Passed[/] ([grey]Execution Status[/]: {execution_status})"
             )
         else:
-            if support < required_support and quorum < required_quorum:
+            if not support_met and not quorum_met:
                 failure_reason = "Both Support and Quorum Not Met"
-            elif support < required_support:
+            elif not support_met:
                 failure_reason = "Support Not Met"
             else:
                 failure_reason = "Quorum Not Met"
             pass_status = f"[red]Vote Failed: {failure_reason}[/]"
 
     start = datetime.utcfromtimestamp(data["startDate"]).strftime("%Y-%m-%d %H:%M:%S")
-    end = datetime.utcfromtimestamp(data["startDate"] + VOTE_TIME).strftime(
+    end = datetime.utcfromtimestamp(data["startDate"] + vote_time).strftime(
         "%Y-%m-%d %H:%M:%S"
     )
 
@@ -228,13 +220,13 @@ def decode_vote_data(data: dict, vote_type: str):
         f" ├─ [grey]Voting End Time[/]: {end}\n"
         f" ├─ [green]Votes For[/]: {yes}\n"
         f" ├─ [red]Votes Against[/]: {no}\n"
-        f" ├─ [blue]Support[/]: {round(support * 100, 2)}% (Required: {int(required_support * 100)}%)\n"
-        f" └─ [purple]Quorum[/]: {round(quorum * 100, 2)}% (Minimum: {int(required_quorum * 100)}%)\n"
+        f" ├─ [blue]Support[/]: {_format_pct(support)} (Required: {_format_pct(required_support)})\n"
+        f" └─ [purple]Quorum[/]: {_format_pct(quorum)} (Minimum: {_format_pct(required_quorum)})\n"
     )
 
     results = {
         "start": data["startDate"],
-        "end": data["startDate"] + VOTE_TIME,
+        "end": data["startDate"] + vote_time,
         "votingPower": data["votingPower"],
         "open": data["open"],
         "executed": data["executed"],
@@ -242,12 +234,19 @@ def decode_vote_data(data: dict, vote_type: str):
         "no": data["nay"],
         "support": support,
         "quorum": quorum,
+        "passed": support_met and quorum_met,
         "formatted_output": formatted_output,
     }
 
     return results
 
 
+def _format_pct(pct: int) -> str:
+    """Formats a 1e18-scaled percentage with two decimals, rounded down."""
+    basis_points = pct * 10000 // PCT_BASE
+    return f"{basis_points // 100}.{basis_points % 100:02d}%"
+
+
 
 def get_inputs_with_names(abi, inputs):
     arg_names = []
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Union
+
+from eth_hash.auto import keccak
+
+from .addresses import get_dao_voting_contract
+from .decoder_utils import decode_abi
+from .multicall import aggregate
+from .rpc import RpcClient, RpcError
+from .vote_record import VoteRecord
+
+GET_VOTE_TYPES = [
+    "bool",
+    "bool",
+    "uint64",
+    "uint64",
+    "uint64",
+    "uint64",
+    "uint256",
+    "uint256",
+    "uint256",
+    "bytes",
+]
+
+
+def _selector(signature: str) -> bytes:
+    return keccak(signature.encode())[:4]
+
+
+def _uint(vote_id: int) -> bytes:
+    return vote_id.to_bytes(32, "big")
+
+
+@dataclass(frozen=True, slots=True)
+class VotingParams:
+    """Contract-wide settings of an Aragon voting contract."""
+
+    votes_length: int
+    vote_time: int
+    support_required_pct: int
+    min_accept_quorum_pct: int
+
+
+class VotingReader:
+    """Reads Aragon voting state over plain JSON-RPC without a forked EVM.
+
+    Reads are aggregated through Multicall3, so fetching any number of votes
+    costs one round-trip. Multicall3 only exists from mainnet block 14353601;
+    for older blocks pass `use_multicall=False` to fall back to one JSON-RPC
+    batch of plain eth_calls.
+
+    Args:
+        rpc (RpcClient): node to read from
+        voting (str): voting contract address
+        block_identifier (int | str): block all reads are made at
+        use_multicall (bool): aggregate through Multicall3 instead of JSON-RPC batches
+    """
+
+    def __init__(
+        self,
+        rpc: RpcClient,
+        voting: str,
+        block_identifier: Union[int, str] = "latest",
+        use_multicall: bool = True,
+    ):
+        self.rpc = rpc
+        self.voting = voting
+        self.block_identifier = (
+            hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+        )
+        self.use_multicall = use_multicall
+
+    @classmethod
+    def for_vote_type(cls, rpc: RpcClient, vote_type: str, **kwargs) -> "VotingReader":
+        return cls(rpc, get_dao_voting_contract(vote_type), **kwargs)
+
+    def votes_length(self) -> int:
+        (result,) = self._read([_selector("votesLength()")])
+        return decode_abi(["uint256"], result)[0]
+
+    def get_params(self) -> VotingParams:
+        results = self._read(
+            [
+                _selector("votesLength()"),
+                _selector("voteTime()"),
+                _selector("supportRequiredPct()"),
+                _selector("minAcceptQuorumPct()"),
+            ]
+        )
+        return VotingParams(*(decode_abi(["uint256"], r)[0] for r in results))
+
+    def get_votes(self, vote_ids: Iterable[int]) -> List[Optional[VoteRecord]]:
+        """Returns a VoteRecord per vote id, `None` for votes that don't exist."""
+        selector = _selector("getVote(uint256)")
+        results = self._read([selector + _uint(vote_id) for vote_id in vote_ids])
+
+        votes = []
+        for result in results:
+            if result is None:
+                # VOTING_NO_VOTE revert
+                votes.append(None)
+                continue
+            votes.append(VoteRecord.from_tuple(decode_abi(GET_VOTE_TYPES, result)))
+
+        return votes
+
+    def can_execute(self, vote_ids: Iterable[int]) -> List[bool]:
+        selector = _selector("canExecute(uint256)")
+        results = self._read([selector + _uint(vote_id) for vote_id in vote_ids])
+        return [r is not None and decode_abi(["bool"], r)[0] for r in results]
+
+    def _read(self, calls: Sequence[bytes]) -> List[Optional[bytes]]:
+        if self.use_multicall:
+            return aggregate(
+                self.rpc, [(self.voting, c) for c in calls], self.block_identifier
+            )
+
+        results = self.rpc.batch(
+            [("eth_call", self._call_params(c)) for c in calls], return_exceptions=True
+        )
+        return [None if isinstance(r, RpcError) else bytes.fromhex(r[2:]) for r in results]
+
+    def _call_params(self, calldata: bytes) -> List:
+        return [{"to": self.voting, "data": "0x" + calldata.hex()}, self.block_identifier]
@@ -0,0 +1,91 @@
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from .abi_cache import AbiCache, MissingAbi, get_abi_cache
+from .bulk import decode_script_actions
+from .vote_events import VOTE_TYPES, VoteEventIndexer, decode_vote_log
+from .voting_reader import VotingReader
+
+# seconds between polls once caught up with the chain, about one block
+POLL_INTERVAL = 12
+
+
+class VoteWatcher:
+    """Follows the voting contracts and turns their new events into JSON-serializable dicts.
+
+    Events are read through the indexer, so the watcher resumes from the
+    event store's checkpoints after a restart, and `index-events` lookups
+    stay current while it runs. A block range is only checkpointed once all
+    of its events have been consumed, and only one range is held in memory
+    at a time, however far behind the watcher starts.
+
+    The script of a new vote is read with one aggregated `getVote` per range
+    and decoded once, into its StartVote event.
+
+    Args:
+        indexer (VoteEventIndexer): event source and checkpoint store
+        abi_cache (AbiCache): ABI store new scripts are decoded with
+        vote_types (iterable(str)): voting contracts to follow
+        poll_interval (float): seconds to wait for new blocks once caught up
+    """
+
+    def __init__(
+        self,
+        indexer: VoteEventIndexer,
+        abi_cache: Optional[AbiCache] = None,
+        vote_types: Iterable[str] = VOTE_TYPES,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.indexer = indexer
+        self.abi_cache = abi_cache or get_abi_cache()
+        self.vote_types = list(vote_types)
+        self.poll_interval = poll_interval
+
+    def head(self) -> int:
+        """Returns the latest block considered final."""
+        return int(self.indexer.rpc.call("eth_blockNumber"), 16) - self.indexer.confirmations
+
+    def start_at(self, block_number: int):
+        """Makes contracts that were never indexed start at `block_number`, not genesis."""
+        for vote_type in self.vote_types:
+            if self.indexer.store.get_checkpoint(vote_type) is None:
+                self.indexer.store.add_logs(vote_type, [], block_number - 1)
+
+    def poll(self, to_block: Optional[int] = None) -> Iterator[Dict]:
+        """Yields the events of each followed contract up to `to_block`, in chain order."""
+        to_block = self.head() if to_block is None else to_block
+        for vote_type in self.vote_types:
+            for logs in self.indexer.follow(vote_type, to_block):
+                yield from self._events(vote_type, logs)
+
+    def watch(self) -> Iterator[Dict]:
+        """Yields events as they land, forever."""
+        while True:
+            yield from self.poll()
+            time.sleep(self.poll_interval)
+
+    def _events(self, vote_type: str, logs: List[Dict]) -> Iterator[Dict]:
+        events = [decode_vote_log(log) for log in logs]
+
+        new_votes = [e["vote_id"] for e in events if e["event"] == "StartVote"]
+        scripts = {}
+        if new_votes:
+            reader = VotingReader.for_vote_type(self.indexer.rpc, vote_type)
+            for vote_id, vote in zip(new_votes, reader.get_votes(new_votes)):
+                if vote is not None:
+                    scripts[vote_id] = vote.script
+
+        for event in events:
+            event["vote_type"] = vote_type
+            if event["event"] == "StartVote" and event["vote_id"] in scripts:
+                self._add_actions(event, scripts[event["vote_id"]])
+            yield event
+
+    def _add_actions(self, event: Dict, script: bytes):
+        event["script"] = "0x" + bytes(script).hex()
+        try:
+            event["actions"] = decode_script_actions(script, self.abi_cache)
+        except (MissingAbi, ValueError, requests.RequestException) as e:
+            event["error"] = str(e)
@@ -1,22 +1,22 @@
+import functools
+import json
 import sys
 import warnings
 import click
-from rich.console import Console as RichConsole
 
-# need to find a way how to query events for ipfs hash
-from curve_dao.ipfs import get_description_from_vote_id
-
-from curve_dao.vote_utils import (
-    MissingVote,
-    decode_vote_data,
-    decode_vote_script,
-    get_vote_data,
-    get_vote_script,
-)
+# only constants at module level: every backend (boa, rich, eth_abi, numpy,
+# ...) is imported by the commands that need it, so `--help` and the light
+# commands don't pay for the heavy ones
+from curve_dao.addresses import VOTE_TYPES
 
 warnings.filterwarnings("ignore")
 
-RICH_CONSOLE = RichConsole(file=sys.stdout)
+
+@functools.cache
+def rich_console():
+    from rich.console import Console as RichConsole
+
+    return RichConsole(file=sys.stdout)
 
 
 @click.group(
@@ -52,39 +52,426 @@ def decode(vote_type: str, vote_id: int):
     """
     Function to decode Curve DAO votes.
 
-    Decoding with: $ python3 scripts/decode_executable.py --vote-type ownership --vote-id 100
+    Decoding with: $ python3 scripts/decode_executable.py decode --vote-type ownership --vote-id 100
     """
 
-    RICH_CONSOLE.log(f"Decoding {vote_type} VoteID: {vote_id}")
+    from curve_dao.session import DaoSession
+    from curve_dao.vote_cache import get_vote_description, get_vote_result
+    from curve_dao.vote_utils import MissingVote, decode_vote_data, vote_data
+
+    rich_console().log(f"Decoding {vote_type} VoteID: {vote_id}")
+
+    # final votes are served from the local cache; the session only reads
+    # the chain for votes that can still change
+    session = DaoSession()
 
     try:
-        script = get_vote_script(vote_id, vote_type)
+        result = get_vote_result(vote_type, vote_id, session)
     except MissingVote:
-        RICH_CONSOLE.log(
+        rich_console().log(
             f"[red] VoteID not found in the {vote_type} DAO voting contract [/red]"
         )
         return
 
-    # need to find a way to query events with boa to fetch the ipfs link and description of the vote.
+    # the description is best effort: the vote is decoded without it
     try:
-        description = get_description_from_vote_id(vote_id, vote_type)
-        RICH_CONSOLE.log(description)
-    except:
-        pass
+        description = get_vote_description(vote_type, vote_id)
+    except Exception as e:
+        description = f"Could not fetch the vote description: {e}"
+    if description is not None:
+        rich_console().log(description)
 
-    # decoding the vote script
-    votes = decode_vote_script(script)
+    # decoded vote script
+    for formatted_output in result["actions"]:
+        rich_console().log(formatted_output)
+
+    # decoding vote data
+    results = decode_vote_data(vote_data(result["vote"], result["vote_time"]), vote_type)
+    rich_console().log(results["formatted_output"])
+
+
+
+@cli.command(
+    name="decode-script",
+    short_help="Decode a raw EVM script without touching the chain",
+)
+
+@click.option(
+    "--script",
+    "-s",
+    type=str,
+    required=True,
+    help="Hex encoded EVM script, e.g. the `script` field of `getVote`")
+
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Only use ABIs from the local cache, never call Etherscan")
+
+
+def decode_script(script: str, offline: bool):
+    """
+    Function to decode a raw Aragon EVM script.
+
+    Decoding with: $ python3 scripts/decode_executable.py decode-script --offline --script 0x00000001...
+    """
+
+    from curve_dao.abi_cache import AbiCache
+    from curve_dao.vote_utils import decode_vote_script
+
+    abi_cache = AbiCache(offline=offline)
+    votes = decode_vote_script(bytes.fromhex(script.removeprefix("0x")), abi_cache)
     for vote in votes:
-        formatted_output = vote["formatted_output"]
-        RICH_CONSOLE.log(formatted_output)
+        rich_console().log(vote["formatted_output"])
 
-    # fetching vote data
-    data = get_vote_data(vote_id, vote_type)
 
-    # decoding vote data
-    results = decode_vote_data(data, vote_type)
-    RICH_CONSOLE.log(results["formatted_output"])
+
+@cli.command(
+    name="decode-range",
+    short_help="Decode a range of Curve DAO proposals as JSON lines",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter"]),
+    required=True,
+)
+
+@click.option("--from", "from_id", type=int, default=0, help="First vote ID")
+
+@click.option("--to", "to_id", type=int, default=None, help="Last vote ID (inclusive)")
+
+@click.option("--all", "all_votes", is_flag=True, help="Decode every vote since genesis")
+
+@click.option("--workers", "-w", type=int, default=None, help="Decoding processes")
+
+@click.option("--output", "-o", type=click.File("w"), default="-")
+
+@click.option("--descriptions", is_flag=True, help="Include the IPFS description of every vote")
+
+
+def decode_range(
+    vote_type: str,
+    from_id: int,
+    to_id: int,
+    all_votes: bool,
+    workers: int,
+    output,
+    descriptions: bool,
+):
+    """
+    Function to decode many Curve DAO votes at once, one JSON object per line.
+
+    Decoding with: $ python3 scripts/decode_executable.py decode-range --vote-type ownership --all
+    """
+
+    from curve_dao.abi_cache import AbiCache
+    from curve_dao.bulk import decode_votes
+    from curve_dao.rpc import RpcClient
+    from curve_dao.session import default_rpc_url
+    from curve_dao.voting_reader import VotingReader
+
+    if to_id is None and not all_votes:
+        raise click.UsageError("Pass --to or --all")
+
+    rpc = RpcClient(default_rpc_url())
+    # pin every read to the same block
+    block = int(rpc.call("eth_blockNumber"), 16)
+
+    if all_votes:
+        from_id = 0
+        reader = VotingReader.for_vote_type(rpc, vote_type, block_identifier=block)
+        to_id = reader.votes_length() - 1
+
+    votes = decode_votes(
+        vote_type,
+        range(from_id, to_id + 1),
+        rpc,
+        AbiCache(),
+        block_identifier=block,
+        workers=workers,
+        descriptions=descriptions,
+    )
+    for vote in votes:
+        output.write(json.dumps(vote, default=_json_default) + "\n")
+        output.flush()
+
+
+@cli.command(
+    name="simulate",
+    short_help="Simulate passing and executing Curve DAO proposals on a mainnet fork",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter"]),
+    required=True,
+)
+
+@click.option("--vote-id", "-v", "vote_ids", type=int, multiple=True, required=True)
+
+@click.option("--workers", "-w", type=int, default=None, help="Simulation processes")
+
+@click.option("--profile", is_flag=True, help="Break gas down per action and contract")
+
+
+def simulate(vote_type: str, vote_ids, workers: int, profile: bool):
+    """
+    Function to simulate a batch of votes concurrently, each on its own copy of the fork.
+
+    Simulating with: $ python3 scripts/decode_executable.py simulate -t ownership -v 500 -v 501
+    """
+
+    from curve_dao.batch_simulate import simulate_votes
+
+    for report in simulate_votes(vote_type, vote_ids, workers=workers, profile=profile):
+        if report.executed:
+            status = f"[green]Executed[/] (gas used: {report.gas_used}, events: {len(report.logs)})"
+        else:
+            status = f"[red]Failed[/]: {report.error}"
+        rich_console().log(
+            f"[bold]Vote {report.vote_id}[/] @ block {report.block_number}: {status} "
+            f"in {report.duration:.1f}s"
+        )
+        for action in report.state_diff[1:]:
+            slots = sum(len(changed) for changed in action["storage"].values())
+            rich_console().log(
+                f" ├─ {action['target']}: {slots} storage slots changed, "
+                f"{len(action['logs'])} events"
+            )
+        if report.profile:
+            _log_profile(report.profile)
+
+
+@cli.command(
+    name="profile-script",
+    short_help="Profile the gas used by each action of an EVM script before proposing it",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter"]),
+    required=True,
+)
+
+@click.option(
+    "--script",
+    "-s",
+    type=str,
+    required=True,
+    help="Hex encoded EVM script, as passed to `newVote`")
+
+
+def profile_evm_script(vote_type: str, script: str):
+    """
+    Function to execute an EVM script on a mainnet fork as the voting contract and profile its gas.
+
+    Profiling with: $ python3 scripts/decode_executable.py profile-script -t ownership --script 0x00000001...
+    """
+
+    from curve_dao.profile import profile_script
+
+    _log_profile(profile_script(vote_type, bytes.fromhex(script.removeprefix("0x"))))
+
+
+def _log_profile(report):
+    lines = [f"[bold]Gas used[/]: {report['gas_used']} (block gas limit: {report['block_gas_limit']})"]
+    for action in report["actions"]:
+        top_opcodes = sorted(action["opcodes"].items(), key=lambda i: -i[1])[:5]
+        lines.append(
+            f" ├─ {action['target']}: {action['gas_used']} gas, top opcodes: "
+            + ", ".join(f"{name} x{count}" for name, count in top_opcodes)
+        )
+    for contract in report["hot_contracts"]:
+        lines.append(
+            f" ├─ [grey]hot[/] {contract['address']}: {contract['self_gas']} gas "
+            f"in {contract['calls']} calls"
+        )
+    lines[-1] = lines[-1].replace("├─", "└─")
+    rich_console().log("\n".join(lines))
+
+    if report["near_block_gas_limit"]:
+        rich_console().log("[red]Warning[/]: the script is approaching the block gas limit")
+
+
+@cli.command(
+    name="stats",
+    short_help="Summarize the outcomes of a range of Curve DAO proposals",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(["ownership", "parameter"]),
+    required=True,
+)
+
+@click.option("--from", "from_id", type=int, default=0, help="First vote ID")
+
+@click.option("--to", "to_id", type=int, default=None, help="Last vote ID (inclusive)")
+
+@click.option("--output", "-o", type=click.File("w"), default=None, help="Per-vote stats as JSON lines")
+
+
+def stats(vote_type: str, from_id: int, to_id: int, output):
+    """
+    Function to compute support, quorum and outcome statistics over a range of votes.
+
+    Summarizing with: $ python3 scripts/decode_executable.py stats --vote-type ownership
+    """
+
+    from curve_dao.rpc import RpcClient
+    from curve_dao.session import default_rpc_url
+    from curve_dao.vote_stats import OUTCOME_LABELS, read_vote_stats, summarize_vote_stats
+    from curve_dao.voting_reader import VotingReader
+
+    rpc = RpcClient(default_rpc_url())
+    # pin every read to the same block
+    block = int(rpc.call("eth_blockNumber"), 16)
+    reader = VotingReader.for_vote_type(rpc, vote_type, block_identifier=block)
+    if to_id is None:
+        to_id = reader.votes_length() - 1
+
+    vote_stats = read_vote_stats(reader, range(from_id, to_id + 1))
+
+    if output is not None:
+        columns = {key: values.tolist() for key, values in vote_stats.items()}
+        for i in range(len(columns["vote_id"])):
+            row = {key: values[i] for key, values in columns.items()}
+            row["outcome"] = OUTCOME_LABELS[row["outcome"]]
+            output.write(json.dumps(row) + "\n")
+
+    summary = summarize_vote_stats(vote_stats)
+    votes = summary.pop("votes")
+    lines = [f"[bold]Votes[/]: {votes} ({vote_type}, {from_id} - {to_id})"]
+    lines += [f" ├─ [grey]{label}[/]: {count}" for label, count in summary.pop("outcomes").items()]
+    lines += [f" ├─ [grey]{key}[/]: {value}" for key, value in summary.items()]
+    lines[-1] = lines[-1].replace("├─", "└─")
+    rich_console().log("\n".join(lines))
+
+
+@cli.command(
+    name="seed-descriptions",
+    short_help="Import vote descriptions into the local IPFS store",
+)
+
+@click.argument("archive", type=click.Path(exists=True))
+
+
+def seed_descriptions(archive: str):
+    """
+    Function to pre-seed the local IPFS store from a directory or tar archive of files named by CID.
+
+    Seeding with: $ python3 scripts/decode_executable.py seed-descriptions descriptions.tar.gz
+    """
+
+    from curve_dao.ipfs_store import IpfsStore
+
+    imported = IpfsStore().import_archive(archive)
+    rich_console().log(f"Imported {imported} descriptions")
+
+
+@cli.command(
+    name="index-events",
+    short_help="Index StartVote, CastVote and ExecuteVote events locally",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(VOTE_TYPES),
+    multiple=True,
+    help="Voting contracts to index, defaults to all",
+)
+
+@click.option("--to-block", type=int, default=None, help="Last block to index")
+
+
+def index_events(vote_type, to_block):
+    """
+    Function to bring the local vote event index up to date, resuming from its checkpoint.
+
+    Indexing with: $ python3 scripts/decode_executable.py index-events
+    """
+
+    from curve_dao.rpc import RpcClient
+    from curve_dao.session import default_rpc_url
+    from curve_dao.vote_events import VoteEventIndexer, VoteEventStore
+
+    indexer = VoteEventIndexer(RpcClient(default_rpc_url()), VoteEventStore())
+    indexed = indexer.sync(vote_type or VOTE_TYPES, to_block=to_block)
+    for indexed_type, logs in indexed.items():
+        checkpoint = indexer.store.get_checkpoint(indexed_type)
+        rich_console().log(f"{indexed_type}: {len(logs)} new events (synced to block {checkpoint})")
+
+
+@cli.command(
+    name="watch",
+    short_help="Follow the voting contracts and emit their events as JSON lines",
+)
+
+@click.option(
+    "--vote-type",
+    "-t",
+    type=click.Choice(VOTE_TYPES),
+    multiple=True,
+    help="Voting contracts to follow, defaults to all",
+)
+
+@click.option("--webhook", type=str, default=None, help="POST every event to this URL instead of stdout")
+
+@click.option("--from-block", type=int, default=None, help="Where contracts never indexed before start, defaults to the head")
+
+@click.option("--confirmations", type=int, default=None, help="Blocks behind head to stay, defaults to 12")
+
+@click.option("--poll-interval", type=float, default=None, help="Seconds between polls, defaults to 12")
+
+
+def watch(vote_type, webhook, from_block, confirmations, poll_interval):
+    """
+    Function to follow new votes, casts and executions as they land, resuming from the event index checkpoint.
+
+    Watching with: $ python3 scripts/decode_executable.py watch --webhook http://localhost:8000/votes
+    """
+
+    from curve_dao.abi_cache import AbiCache
+    from curve_dao.rpc import RpcClient
+    from curve_dao.session import default_rpc_url
+    from curve_dao.transport import get_session
+    from curve_dao.vote_events import CONFIRMATIONS, VoteEventIndexer, VoteEventStore
+    from curve_dao.watch import POLL_INTERVAL, VoteWatcher
+
+    if confirmations is None:
+        confirmations = CONFIRMATIONS
+    if poll_interval is None:
+        poll_interval = POLL_INTERVAL
+
+    indexer = VoteEventIndexer(
+        RpcClient(default_rpc_url()), VoteEventStore(), confirmations=confirmations
+    )
+    watcher = VoteWatcher(indexer, AbiCache(), vote_type or VOTE_TYPES, poll_interval)
+    watcher.start_at(watcher.head() + 1 if from_block is None else from_block)
+
+    for event in watcher.watch():
+        line = json.dumps(event, default=_json_default)
+        if webhook:
+            response = get_session().post(
+                webhook, data=line, headers={"Content-Type": "application/json"}, timeout=10
+            )
+            response.raise_for_status()
+        else:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
 
 
 if __name__ == '__main__':
-    decode()
+    cli()
@@ -0,0 +1,145 @@
+import pytest
+from eth_abi import decode, encode
+
+from curve_dao.abi_cache import AbiCache
+from curve_dao.addresses import MULTICALL3
+from curve_dao.evm_script import CALLSCRIPT_ID
+from curve_dao.multicall import AGGREGATE3_SELECTOR
+from curve_dao.transport import get_session
+from curve_dao.voting_reader import GET_VOTE_TYPES, _selector
+
+PARAMETER_AGENT = "0x4EEb3bA4f221cA16ed4A0cC7254E2E32DF948c5f"
+POOL_OWNER = "0xeCb456EA5365865EbAb8a2661B0c503410e9B347"
+POOL = "0xDC24316b9AE028F1497c275EB9192a3Ea0f67022"
+
+AGENT_ABI = [
+    {
+        "type": "function",
+        "name": "execute",
+        "inputs": [
+            {"name": "_target", "type": "address"},
+            {"name": "_ethValue", "type": "uint256"},
+            {"name": "_data", "type": "bytes"},
+        ],
+    }
+]
+POOL_OWNER_ABI = [
+    {
+        "type": "function",
+        "name": "commit_new_fee",
+        "inputs": [
+            {"name": "_pool", "type": "address"},
+            {"name": "new_fee", "type": "uint256"},
+            {"name": "new_admin_fee", "type": "uint256"},
+        ],
+    }
+]
+
+
+def agent_action(agent, target, calldata):
+    agent_calldata = bytes.fromhex("b61d27f6") + encode(
+        ["address", "uint256", "bytes"], [target, 0, calldata]
+    )
+    return bytes.fromhex(agent[2:]) + len(agent_calldata).to_bytes(4, "big") + agent_calldata
+
+
+@pytest.fixture
+def offline_abi_cache(tmp_path):
+    abi_cache = AbiCache(root=tmp_path, offline=True)
+    abi_cache.put(PARAMETER_AGENT, AGENT_ABI)
+    abi_cache.put(POOL_OWNER, POOL_OWNER_ABI)
+    return abi_cache
+
+
+@pytest.fixture
+def parameter_vote_script():
+    """EVM script of parameter vote 69: commit_new_fee via the parameter agent."""
+    calldata = bytes.fromhex("cfca0bdb") + encode(
+        ["address", "uint256", "uint256"], [POOL, 1000000, 5000000000]
+    )
+    return CALLSCRIPT_ID + agent_action(PARAMETER_AGENT, POOL_OWNER, calldata)
+
+
+class Revert(Exception):
+    pass
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeVotingNode:
+    """Stand-in JSON-RPC node serving one Aragon voting contract and Multicall3."""
+
+    def __init__(self, votes, script):
+        self.votes = votes
+        self.script = script
+        self.requests = 0
+
+    def post(self, url, json, timeout):
+        self.requests += 1
+        if isinstance(json, list):
+            return FakeResponse([self._answer(call) for call in json])
+        return FakeResponse(self._answer(json))
+
+    def _answer(self, call):
+        try:
+            result = self._eth_call(call["params"][0])
+        except Revert:
+            return {"id": call["id"], "error": {"code": 3, "message": "execution reverted"}}
+        return {"id": call["id"], "result": "0x" + result.hex()}
+
+    def _eth_call(self, tx):
+        data = bytes.fromhex(tx["data"][2:])
+        if tx["to"] != MULTICALL3:
+            return self._voting_call(data)
+
+        assert data[:4] == AGGREGATE3_SELECTOR
+        (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+        results = []
+        for _, _, calldata in calls:
+            try:
+                results.append((True, self._voting_call(calldata)))
+            except Revert:
+                results.append((False, b""))
+        return encode(["(bool,bytes)[]"], [results])
+
+    def _voting_call(self, data):
+        selector = data[:4]
+        if selector == _selector("getVote(uint256)"):
+            vote_id = int.from_bytes(data[4:36], "big")
+            if vote_id not in self.votes:
+                raise Revert
+            return encode(GET_VOTE_TYPES, [*self.votes[vote_id], self.script])
+        if selector == _selector("canExecute(uint256)"):
+            vote_id = int.from_bytes(data[4:36], "big")
+            return encode(["bool"], [vote_id in self.votes and not self.votes[vote_id][0]])
+        if selector == _selector("votesLength()"):
+            return encode(["uint256"], [len(self.votes)])
+        if selector == _selector("voteTime()"):
+            return encode(["uint256"], [604800])
+        if selector == _selector("supportRequiredPct()"):
+            return encode(["uint256"], [3 * 10**17])
+        if selector == _selector("minAcceptQuorumPct()"):
+            return encode(["uint256"], [15 * 10**16])
+        raise Revert
+
+
+VOTES = {
+    0: (False, True, 1600000000, 100, 3 * 10**17, 15 * 10**16, 10**24, 0, 2 * 10**24),
+    1: (True, False, 1700000000, 200, 3 * 10**17, 15 * 10**16, 0, 10**24, 2 * 10**24),
+}
+
+
+@pytest.fixture
+def fake_node(monkeypatch, parameter_vote_script):
+    node = FakeVotingNode(VOTES, parameter_vote_script)
+    monkeypatch.setattr(get_session(), "post", node.post)
+    return node
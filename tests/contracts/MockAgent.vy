@@ -0,0 +1,10 @@
+# pragma version ~=0.4.0
+"""
+@notice Aragon Agent stand-in: forwards `execute` calls, reverting with them.
+"""
+
+
+@external
+@payable
+def execute(_target: address, _ethValue: uint256, _data: Bytes[1024]) -> Bytes[1024]:
+    return raw_call(_target, _data, max_outsize=1024, value=_ethValue)
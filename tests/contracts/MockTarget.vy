@@ -0,0 +1,16 @@
+# pragma version ~=0.4.0
+"""
+@notice Contract a vote script configures: one storage slot and one event.
+"""
+
+event ValueSet:
+    value: uint256
+
+value: public(uint256)
+
+
+@external
+def set_value(_value: uint256):
+    assert _value != 0, "zero value"
+    self.value = _value
+    log ValueSet(value=_value)
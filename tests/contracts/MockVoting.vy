@@ -0,0 +1,128 @@
+# pragma version ~=0.4.0
+"""
+@notice Aragon Voting stand-in: the getVote/vote/canExecute/executeVote
+        interface of contracts/Voting.json, with each vote's outcome set by
+        its creator and CallsScript execution of the vote script.
+"""
+
+VOTE_TIME: constant(uint64) = 604800
+SUPPORT_REQUIRED: constant(uint64) = 510000000000000000
+MIN_ACCEPT_QUORUM: constant(uint64) = 300000000000000000
+PCT_BASE: constant(uint256) = 10**18
+MAX_SCRIPT: constant(uint256) = 2048
+MAX_ACTIONS: constant(uint256) = 16
+
+struct Vote:
+    executed: bool
+    start_date: uint64
+    snapshot_block: uint64
+    yea: uint256
+    nay: uint256
+    voting_power: uint256
+    script: Bytes[MAX_SCRIPT]
+
+event ExecuteVote:
+    voteId: indexed(uint256)
+
+votes: HashMap[uint256, Vote]
+votesLength: public(uint256)
+
+
+@external
+def newVote(_script: Bytes[MAX_SCRIPT], _voting_power: uint256) -> uint256:
+    vote_id: uint256 = self.votesLength
+    self.votes[vote_id] = Vote(
+        executed=False,
+        start_date=convert(block.timestamp, uint64),
+        snapshot_block=convert(block.number - 1, uint64),
+        yea=0,
+        nay=0,
+        voting_power=_voting_power,
+        script=_script,
+    )
+    self.votesLength = vote_id + 1
+    return vote_id
+
+
+@view
+@internal
+def _is_open(_vote: Vote) -> bool:
+    return not _vote.executed and block.timestamp < convert(
+        _vote.start_date + VOTE_TIME, uint256
+    )
+
+
+@view
+@internal
+def _can_execute(_vote: Vote) -> bool:
+    if _vote.executed or self._is_open(_vote):
+        return False
+    total: uint256 = _vote.yea + _vote.nay
+    support: uint256 = convert(SUPPORT_REQUIRED, uint256)
+    quorum: uint256 = convert(MIN_ACCEPT_QUORUM, uint256)
+    return (
+        _vote.yea * PCT_BASE > total * support
+        and _vote.yea * PCT_BASE > _vote.voting_power * quorum
+    )
+
+
+@view
+@external
+def voteTime() -> uint64:
+    return VOTE_TIME
+
+
+@view
+@external
+def getVote(_vote_id: uint256) -> (
+    bool, bool, uint64, uint64, uint64, uint64, uint256, uint256, uint256, Bytes[MAX_SCRIPT]
+):
+    v: Vote = self.votes[_vote_id]
+    assert v.voting_power != 0, "VOTING_NO_VOTE"
+    return (
+        self._is_open(v),
+        v.executed,
+        v.start_date,
+        v.snapshot_block,
+        SUPPORT_REQUIRED,
+        MIN_ACCEPT_QUORUM,
+        v.yea,
+        v.nay,
+        v.voting_power,
+        v.script,
+    )
+
+
+@view
+@external
+def canExecute(_vote_id: uint256) -> bool:
+    return self._can_execute(self.votes[_vote_id])
+
+
+@external
+def vote(_vote_id: uint256, _supports: bool, _executes_if_decided: bool):
+    assert self._is_open(self.votes[_vote_id]), "VOTING_CAN_NOT_VOTE"
+    # every voter holds a majority of the voting power
+    stake: uint256 = self.votes[_vote_id].voting_power // 2 + 1
+    if _supports:
+        self.votes[_vote_id].yea += stake
+    else:
+        self.votes[_vote_id].nay += stake
+
+
+@external
+def executeVote(_vote_id: uint256):
+    assert self._can_execute(self.votes[_vote_id]), "VOTING_CAN_NOT_EXECUTE"
+    self.votes[_vote_id].executed = True
+    log ExecuteVote(voteId=_vote_id)
+
+    # CallsScript: spec id, then (address, uint32 length, calldata) per action
+    script: Bytes[MAX_SCRIPT] = self.votes[_vote_id].script
+    offset: uint256 = 4
+    for i: uint256 in range(MAX_ACTIONS):
+        if offset >= len(script):
+            break
+        target: address = convert(convert(slice(script, offset, 20), bytes20), address)
+        size: uint256 = convert(slice(script, offset + 20, 4), uint256)
+        raw_call(target, slice(script, offset + 24, size))
+        offset += 24 + size
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from curve_dao.abi_cache import AbiCache, MissingAbi
+
+PROXY = "0x40907540d8a6C65c637785e8f8B742ae6b0b9968"
+IMPLEMENTATION = "0x3A93C17FC82CC33420d1809dDA9Fb715cc89dd37"
+
+PROXY_ABI = [{"type": "function", "name": "implementation", "inputs": []}]
+IMPL_ABI = [
+    {
+        "type": "function",
+        "name": "execute",
+        "inputs": [
+            {"name": "_target", "type": "address"},
+            {"name": "_ethValue", "type": "uint256"},
+            {"name": "_data", "type": "bytes"},
+        ],
+    }
+]
+
+
+@pytest.fixture
+def abi_cache(tmp_path):
+    return AbiCache(root=tmp_path, offline=True)
+
+
+def test_put_and_get(abi_cache, tmp_path):
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+
+    # a fresh instance reads it back from disk
+    assert AbiCache(root=tmp_path, offline=True).get_abi(IMPLEMENTATION) == IMPL_ABI
+
+
+def test_blobs_are_content_addressed(abi_cache):
+    abi_cache.put(PROXY, IMPL_ABI)
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+
+    assert len(list((abi_cache.root / "blobs").iterdir())) == 1
+
+
+def test_proxy_resolves_implementation(abi_cache):
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+    abi_cache.put(PROXY, PROXY_ABI, implementation=IMPLEMENTATION)
+
+    assert abi_cache.get_abi(PROXY) == IMPL_ABI + PROXY_ABI
+    assert abi_cache.get_implementation(PROXY) == IMPLEMENTATION
+
+
+def test_offline_miss(abi_cache):
+    with pytest.raises(MissingAbi):
+        abi_cache.get_abi(PROXY)
+
+
+def test_unverified_contract(abi_cache):
+    abi_cache.put(PROXY, None)
+
+    with pytest.raises(MissingAbi):
+        abi_cache.get_abi(PROXY)
+
+
+def test_invalidate(abi_cache):
+    abi_cache.put(PROXY, PROXY_ABI)
+    abi_cache.invalidate(PROXY)
+
+    with pytest.raises(MissingAbi):
+        abi_cache.get_abi(PROXY)
+
+
+def test_stale_proxy_is_refetched(tmp_path, monkeypatch):
+    abi_cache = AbiCache(root=tmp_path, ttl=60)
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+    abi_cache.put(PROXY, PROXY_ABI, implementation=IMPLEMENTATION)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    fresh_cache = AbiCache(root=tmp_path, ttl=60)
+    fetched = []
+
+    def fetch(address):
+        fetched.append(address)
+        return fresh_cache.put(address, PROXY_ABI, implementation=IMPLEMENTATION)
+
+    monkeypatch.setattr(fresh_cache, "_fetch", fetch)
+    fresh_cache.get_abi(PROXY)
+    fresh_cache.get_abi(PROXY)
+
+    # the verified implementation never expires, the proxy is fetched once
+    assert fetched == [PROXY]
+
+
+def test_selector_index(abi_cache):
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+    abi_cache.put(PROXY, PROXY_ABI, implementation=IMPLEMENTATION)
+
+    index = abi_cache.get_selector_index(PROXY)
+    assert index["0xb61d27f6"] == IMPL_ABI[0]
+    assert "0x5c60da1b" in index  # implementation()
+
+    # the index of the blob is persisted next to it
+    assert len(list((abi_cache.root / "blobs").glob("*.selectors.json"))) == 2
+
+
+def test_global_selector_lookup(abi_cache, tmp_path):
+    abi_cache.put(IMPLEMENTATION, IMPL_ABI)
+
+    fresh_cache = AbiCache(root=tmp_path, offline=True)
+    assert fresh_cache.lookup_selector("0xb61d27f6") == IMPL_ABI[0]
+    assert fresh_cache.lookup_selector("0xdeadbeef") is None
@@ -0,0 +1,47 @@
+import pytest
+from eth_abi import encode
+
+from curve_dao.abi_cache import MissingAbi
+from curve_dao.calldata import CalldataEncoder, MissingFunction
+from curve_dao.vote_utils import prepare_evm_script
+
+from .conftest import PARAMETER_AGENT, POOL, POOL_OWNER
+
+TARGET = {"agent": PARAMETER_AGENT}
+
+
+def test_prepare_evm_script(offline_abi_cache, parameter_vote_script):
+    script = prepare_evm_script(
+        TARGET,
+        [(POOL_OWNER, "commit_new_fee", POOL, 1000000, 5000000000)],
+        offline_abi_cache,
+    )
+
+    assert script == parameter_vote_script
+
+
+def test_abi_read_once_per_function(offline_abi_cache, monkeypatch):
+    encoder = CalldataEncoder(offline_abi_cache)
+    calls = []
+    get_abi = offline_abi_cache.get_abi
+
+    def counting_get_abi(address):
+        calls.append(address)
+        return get_abi(address)
+
+    monkeypatch.setattr(offline_abi_cache, "get_abi", counting_get_abi)
+
+    for fee in range(50):
+        calldata = encoder.encode(POOL_OWNER, "commit_new_fee", POOL, fee, 0)
+        assert calldata[4:] == encode(["address", "uint256", "uint256"], [POOL, fee, 0])
+
+    assert calls == [POOL_OWNER]
+
+
+def test_unknown_function(offline_abi_cache):
+    encoder = CalldataEncoder(offline_abi_cache)
+
+    with pytest.raises(MissingFunction):
+        encoder.encode(POOL_OWNER, "commit_new_fee", POOL, 1)
+    with pytest.raises(MissingAbi):
+        encoder.encode(POOL, "commit_new_fee", POOL, 1, 2)
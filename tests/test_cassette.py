@@ -0,0 +1,117 @@
+import io
+import json
+
+import pytest
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from curve_dao import ipfs, transport
+from curve_dao.abi_cache import AbiCache
+from curve_dao.cassette import MissingInteraction
+from curve_dao.rpc import RpcClient
+
+RPC_URL = "https://eth-mainnet.g.alchemy.com/v2/abcdefghijklmnopqrstuvwxyz012345"
+API_KEY = "SECRETETHERSCANKEY"
+TOKEN = "0xD533a949740bb3306d119CC777fa900bA034cd52"
+ABI = [{"type": "function", "name": "symbol", "inputs": [], "outputs": [{"type": "string"}]}]
+
+
+class FakeUpstream:
+    """Node, Etherscan and gateway that answer every request they get, batches in reverse."""
+
+    def __init__(self):
+        self.requests = []
+
+    def send(self, adapter, request):
+        self.requests.append(request)
+        if request.url.startswith(RPC_URL):
+            payload = json.loads(request.body)
+            if isinstance(payload, list):
+                body = [self._result(call) for call in reversed(payload)]
+            else:
+                body = self._result(payload)
+            content = json.dumps(body).encode()
+        elif request.url.startswith("https://api.etherscan.io"):
+            result = {"ABI": json.dumps(ABI), "Proxy": "0", "Implementation": ""}
+            content = json.dumps({"status": "1", "result": [result]}).encode()
+        else:
+            content = bytes(range(256))
+
+        raw = HTTPResponse(
+            body=io.BytesIO(content), status=200, reason="OK", preload_content=False
+        )
+        return adapter.build_response(request, raw)
+
+    @staticmethod
+    def _result(call):
+        return {"jsonrpc": "2.0", "id": call["id"], "result": f"{call['method']}:{call['params']}"}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    upstream = FakeUpstream()
+    monkeypatch.setattr(
+        HTTPAdapter, "send", lambda adapter, request, **kwargs: upstream.send(adapter, request)
+    )
+    monkeypatch.setattr(transport, "_SESSION", None)
+    return upstream
+
+
+def test_record_then_replay(upstream, tmp_path):
+    transport.use_cassette(tmp_path, "record")
+    rpc = RpcClient(RPC_URL)
+    recorded = rpc.call("eth_blockNumber")
+    batch = rpc.batch([("eth_chainId", []), ("eth_getBalance", [TOKEN, "latest"])])
+    assert batch == ["eth_chainId:[]", f"eth_getBalance:['{TOKEN}', 'latest']"]
+
+    # replayed with other JSON-RPC ids, and without the network
+    transport.use_cassette(tmp_path, "replay")
+    sent = len(upstream.requests)
+    rpc._ids = iter(range(100, 200))
+    assert rpc.call("eth_blockNumber") == recorded
+    assert rpc.batch([("eth_chainId", []), ("eth_getBalance", [TOKEN, "latest"])]) == batch
+    assert len(upstream.requests) == sent
+
+    # a request that was never recorded
+    with pytest.raises(MissingInteraction):
+        rpc.call("eth_gasPrice")
+
+
+def test_credentials_not_recorded(upstream, tmp_path):
+    transport.use_cassette(tmp_path, "record")
+    RpcClient(RPC_URL).call("eth_blockNumber")
+    AbiCache(tmp_path / "abis", api_key=API_KEY).get_abi(TOKEN)
+
+    recorded = "".join(path.read_text() for path in tmp_path.glob("*.json"))
+    assert "abcdefghijklmnopqrstuvwxyz012345" not in recorded
+    assert API_KEY not in recorded
+
+    # replayed with another key
+    transport.use_cassette(tmp_path, "replay")
+    assert AbiCache(tmp_path / "other", api_key="OTHERKEY").get_abi(TOKEN) == ABI
+
+
+def test_streamed_binary_body(upstream, tmp_path):
+    transport.use_cassette(tmp_path, "record")
+    content = ipfs._get_from_public_gateway("https://ipfs.io/ipfs", "QmVote1", timeout=5)
+    assert content == bytes(range(256))
+
+    transport.use_cassette(tmp_path, "replay")
+    upstream.requests.clear()
+    assert ipfs._get_from_public_gateway("https://ipfs.io/ipfs", "QmVote1", timeout=5) == content
+    assert upstream.requests == []
+
+
+def test_reset_session_keeps_cassette_from_env(upstream, tmp_path, monkeypatch):
+    transport.use_cassette(tmp_path, "record")
+    recorded = RpcClient(RPC_URL).call("eth_blockNumber")
+
+    # as in a forked worker: a new session, replaying the same cassette
+    monkeypatch.setenv("CURVE_DAO_CASSETTE", str(tmp_path))
+    parent = transport.get_session()
+    transport.reset_session()
+    assert transport.get_session() is not parent
+
+    upstream.requests.clear()
+    assert RpcClient(RPC_URL).call("eth_blockNumber") == recorded
+    assert upstream.requests == []
@@ -0,0 +1,25 @@
+from curve_dao.bulk import decode_votes
+from curve_dao.rpc import RpcClient
+
+from .conftest import POOL_OWNER
+
+
+def test_decode_range(fake_node, offline_abi_cache):
+    results = list(
+        decode_votes(
+            "parameter",
+            range(3),
+            RpcClient("http://localhost:8545"),
+            offline_abi_cache,
+            workers=2,
+        )
+    )
+
+    # all three getVote calls go out in a single request
+    assert fake_node.requests == 1
+    assert [r["vote_id"] for r in results] == [0, 1, 2]
+    assert results[0]["executed"] is True
+    assert results[1]["open"] is True
+    assert results[0]["actions"][0]["target"] == POOL_OWNER
+    assert results[0]["actions"][0]["function"] == "commit_new_fee"
+    assert results[2]["error"] == "vote does not exist"
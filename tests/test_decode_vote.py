@@ -0,0 +1,25 @@
+import pytest
+
+from curve_dao.evm_script import parse_evm_script
+from curve_dao.vote_utils import decode_vote_script
+
+from .conftest import PARAMETER_AGENT, POOL, POOL_OWNER
+
+
+def test_decode_vote_script_offline(offline_abi_cache, parameter_vote_script):
+    votes = decode_vote_script(parameter_vote_script, offline_abi_cache)
+
+    assert len(votes) == 1
+    assert votes[0]["agent"] == PARAMETER_AGENT
+    assert votes[0]["target"] == POOL_OWNER
+    assert votes[0]["function"] == "commit_new_fee"
+    assert votes[0]["inputs"] == [
+        ("_pool", POOL),
+        ("new_fee", 1000000),
+        ("new_admin_fee", 5000000000),
+    ]
+
+
+def test_parse_truncated_script(parameter_vote_script):
+    with pytest.raises(ValueError):
+        parse_evm_script(parameter_vote_script[:-1])
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+from eth_utils import to_checksum_address
+
+from curve_dao.evm_script import CALLSCRIPT_ID, build_evm_script, parse_evm_script
+
+
+def random_actions(rng, max_actions=60, max_calldata=600):
+    return [
+        (
+            to_checksum_address(rng.randbytes(20)),
+            rng.randbytes(rng.randint(0, max_calldata)),
+        )
+        for _ in range(rng.randint(0, max_actions))
+    ]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_round_trip(seed):
+    rng = random.Random(seed)
+    actions = random_actions(rng)
+
+    script = build_evm_script(actions)
+
+    assert script[:4] == CALLSCRIPT_ID
+    assert len(script) == 4 + sum(24 + len(calldata) for _, calldata in actions)
+    assert [(t, bytes(c)) for t, c in parse_evm_script(script)] == actions
+    # re-encoding the parsed script gives back the same bytes
+    assert build_evm_script(parse_evm_script(script)) == script
+
+
+def test_matches_concatenated_script(parameter_vote_script):
+    actions = parse_evm_script(parameter_vote_script)
+    assert build_evm_script(actions) == parameter_vote_script
+
+
+def test_parse_does_not_copy_calldata():
+    script = build_evm_script([("0x" + "11" * 20, b"\x01" * 100)])
+    ((_, calldata),) = parse_evm_script(script)
+
+    assert isinstance(calldata, memoryview)
+    assert calldata.obj is script
+    assert calldata.readonly
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_truncated_scripts_are_rejected(seed):
+    rng = random.Random(seed)
+    actions = random_actions(rng, max_actions=5) + [("0x" + "22" * 20, b"\x02" * 8)]
+    script = build_evm_script(actions)
+
+    # cut anywhere inside the last action's 32 bytes
+    with pytest.raises(ValueError):
+        parse_evm_script(script[: rng.randint(len(script) - 31, len(script) - 1)])
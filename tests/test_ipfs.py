@@ -0,0 +1,193 @@
+import io
+import json
+import tarfile
+import threading
+import time
+
+import pytest
+import requests
+import urllib3
+
+from curve_dao import ipfs
+from curve_dao.addresses import get_dao_voting_contract
+from curve_dao.ipfs_store import IpfsStore, compute_cids
+from curve_dao.vote_record import VoteRecord
+
+from .test_vote_events import FakeLogsNode, start_vote
+
+
+def _description(text):
+    content = json.dumps({"text": text}).encode()
+    cid = next(c for c in compute_cids(content) if c.startswith("Qm"))
+    return cid, content
+
+
+class FakeStreamResponse:
+    def __init__(self, content):
+        self.raw = io.BytesIO(content)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeIpfs:
+    """Infura that is down, and public gateways that serve every pinned file."""
+
+    def __init__(self, files):
+        self.files = files
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def post(self, url, auth, timeout, stream):
+        raise requests.ConnectionError("infura is down")
+
+    def get(self, url, timeout, stream):
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        return FakeStreamResponse(self.files[url.rsplit("/", 1)[-1]])
+
+
+@pytest.fixture
+def files():
+    return dict(_description(f"vote {i}") for i in range(20))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = IpfsStore(tmp_path)
+    monkeypatch.setattr(ipfs, "get_ipfs_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def fake_ipfs(monkeypatch, files, store):
+    fake = FakeIpfs(files)
+    monkeypatch.setattr(ipfs, "get_session", lambda: fake)
+    monkeypatch.setattr(ipfs, "RETRY_BACKOFF", 0)
+    return fake
+
+
+def test_falls_back_to_public_gateway(fake_ipfs, files):
+    cid = next(iter(files))
+
+    assert ipfs.get_description_from_ipfs_hash(cid) == json.loads(files[cid])
+
+
+def test_concurrency_is_bounded(fake_ipfs, files):
+    descriptions = ipfs.get_descriptions_from_ipfs_hashes(files, concurrency=4)
+
+    assert descriptions == {cid: json.loads(content) for cid, content in files.items()}
+    assert 1 < fake_ipfs.max_in_flight <= 4
+
+
+def test_descriptions_are_stored_locally(fake_ipfs, files, store):
+    ipfs.get_descriptions_from_ipfs_hashes(files)
+    fake_ipfs.files = {}  # unpinned everywhere
+
+    descriptions = ipfs.get_descriptions_from_ipfs_hashes(files)
+
+    assert descriptions == {cid: json.loads(content) for cid, content in files.items()}
+    assert fake_ipfs.requests == len(files)
+
+
+def test_unresolvable_hash(fake_ipfs, files, monkeypatch):
+    monkeypatch.setattr(ipfs, "PUBLIC_IPFS_GATEWAYS", [])
+
+    description = ipfs.get_description_from_ipfs_hash(next(iter(files)))
+
+    assert isinstance(description, ipfs.DescriptionError)
+    assert description.startswith("IPFS connection error")
+
+
+def test_infura_tar_stream(store, monkeypatch):
+    # nested braces used to cut the description short
+    cid, content = _description("{nested} {braces}" * 1000)
+
+    archive = io.BytesIO()
+    with tarfile.open(fileobj=archive, mode="w") as tar:
+        directory = tarfile.TarInfo("wrapper")
+        directory.type = tarfile.DIRTYPE
+        tar.addfile(directory)
+        info = tarfile.TarInfo(f"wrapper/{cid}")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+
+    class FakeInfura:
+        def post(self, url, auth, timeout, stream):
+            return FakeStreamResponse(archive.getvalue())
+
+    monkeypatch.setattr(ipfs, "get_session", lambda: FakeInfura())
+
+    assert ipfs.get_description_from_ipfs_hash(cid) == json.loads(content)
+    assert store.get(cid) == content
+
+
+def test_plain_text_description_in_store(fake_ipfs, store):
+    content = b"Kill the gauges of the deprecated pools"
+    cid = next(c for c in compute_cids(content) if c.startswith("Qm"))
+    store.put(cid, content)
+
+    assert ipfs.get_description_from_ipfs_hash(cid) == content.decode()
+    assert fake_ipfs.requests == 0
+
+
+def test_connection_reset_mid_stream(files, store, monkeypatch):
+    class ResetStream(io.BytesIO):
+        def read(self, *args):
+            raise urllib3.exceptions.ProtocolError("Connection broken", ConnectionResetError())
+
+    class FakeGateway:
+        def post(self, url, auth, timeout, stream):
+            raise requests.ConnectionError("infura is down")
+
+        def get(self, url, timeout, stream):
+            response = FakeStreamResponse(b"")
+            response.raw = ResetStream()
+            return response
+
+    monkeypatch.setattr(ipfs, "get_session", lambda: FakeGateway())
+    monkeypatch.setattr(ipfs, "RETRY_BACKOFF", 0)
+
+    description = ipfs.get_description_from_ipfs_hash(next(iter(files)))
+
+    assert description.startswith("IPFS connection error")
+
+
+def test_ipfs_hashes_of_distant_votes():
+    # StartVote is in the block after the snapshot block
+    voting = get_dao_voting_contract("ownership").lower()
+    start_blocks = {1: 11_000_000, 2: 11_000_500, 3: 15_000_000, 4: 19_000_000}
+    node = FakeLogsNode(
+        [(voting, start_vote(block, i, f"QmVote{i}")) for i, block in start_blocks.items()],
+        head=20_000_000,
+        max_range=2_500,
+    )
+    votes = {
+        i: VoteRecord(False, True, 0, block - 1, 0, 0, 0, 0, 0, b"")
+        for i, block in start_blocks.items()
+    }
+
+    ipfs_hashes = ipfs.get_ipfs_hashes_from_votes("ownership", votes, node, block_range=10_000)
+
+    assert ipfs_hashes == {i: f"QmVote{i}" for i in start_blocks}
+    # halved twice, then one request per cluster of votes
+    assert [to_block - from_block + 1 for from_block, to_block in node.requests] == [
+        10_000,
+        5_000,
+        2_500,
+        2_500,
+        2_500,
+    ]
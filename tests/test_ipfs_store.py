@@ -0,0 +1,56 @@
+import tarfile
+
+import pytest
+
+from curve_dao.ipfs_store import CidMismatch, IpfsStore, compute_cids
+
+EMPTY_FILE_CID = "QmbFMke1KXqnYyBBWxB74N4c5SBnJMVAiMNRcGu6x1AwQH"
+HELLO_WORLD_CID = "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o"
+HELLO_WORLD_RAW_CID = "bafkreifjjcie6lypi6ny7amxnfftagclbuxndqonfipmb64f2km2devei4"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return IpfsStore(tmp_path)
+
+
+def test_compute_cids():
+    assert EMPTY_FILE_CID in compute_cids(b"")
+    assert HELLO_WORLD_CID in compute_cids(b"hello world\n")
+    assert HELLO_WORLD_RAW_CID in compute_cids(b"hello world\n")
+
+
+def test_put_and_get(store):
+    store.put(HELLO_WORLD_CID, b"hello world\n")
+
+    assert store.get(HELLO_WORLD_CID) == b"hello world\n"
+
+
+def test_put_rejects_mismatched_content(store):
+    with pytest.raises(CidMismatch):
+        store.put(HELLO_WORLD_CID, b"goodbye world\n")
+
+    assert store.get(HELLO_WORLD_CID) is None
+
+
+def test_corrupted_file_is_dropped(store):
+    store.put(HELLO_WORLD_CID, b"hello world\n")
+    store._path(HELLO_WORLD_CID).write_bytes(b"tampered")
+
+    assert store.get(HELLO_WORLD_CID) is None
+    assert not store._path(HELLO_WORLD_CID).exists()
+
+
+def test_import_archive(store, tmp_path):
+    seed_dir = tmp_path / "seed"
+    seed_dir.mkdir()
+    (seed_dir / f"{HELLO_WORLD_CID}.json").write_bytes(b"hello world\n")
+    (seed_dir / EMPTY_FILE_CID).write_bytes(b"not empty")
+
+    archive = tmp_path / "seed.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        tar.add(seed_dir, arcname="descriptions")
+
+    assert store.import_archive(archive) == 1
+    assert store.get(HELLO_WORLD_CID) == b"hello world\n"
+    assert store.get(EMPTY_FILE_CID) is None
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from curve_dao.profile import ExecutionProfiler
+
+from .conftest import PARAMETER_AGENT, POOL, POOL_OWNER
+
+VOTING = "0xBCfF8B0b9419b9A88c44546519b1e909cF330399"
+
+
+class FakeOpcode:
+    def __init__(self, mnemonic):
+        self.mnemonic = mnemonic
+
+    def __call__(self, computation):
+        pass
+
+
+class FakeComputationClass:
+    opcodes = {0x54: FakeOpcode("SLOAD"), 0xF1: FakeOpcode("CALL")}
+
+
+class FakeComputation:
+    def __init__(self, to, gas_used, data=b"", is_error=False):
+        self.msg = SimpleNamespace(to=bytes.fromhex(to[2:]), data=data)
+        self.gas_used = gas_used
+        self.is_error = is_error
+        self.children = []
+
+    def get_gas_used(self):
+        return self.gas_used
+
+    def call(self, child):
+        self.children.append(child)
+        return child
+
+    def execute(self, *opcodes):
+        for opcode in opcodes:
+            FakeComputationClass.opcodes[opcode](computation=self)
+
+
+def test_profile_per_action():
+    agent_calldata = b"\xb6\x1d\x27\xf6"
+    root = FakeComputation(VOTING, 16_000_000)
+    agent = root.call(FakeComputation(PARAMETER_AGENT, 15_000_000, agent_calldata))
+    owner = agent.call(FakeComputation(POOL_OWNER, 14_000_000))
+    pool = owner.call(FakeComputation(POOL, 10_000_000))
+
+    profiler = ExecutionProfiler(FakeComputationClass)
+    original_opcodes = dict(FakeComputationClass.opcodes)
+    with profiler.record():
+        root.execute(0x54, 0xF1)
+        agent.execute(0xF1)
+        owner.execute(0xF1)
+        pool.execute(0x54, 0x54)
+
+    assert FakeComputationClass.opcodes == original_opcodes
+
+    report = profiler.profile(root, [(PARAMETER_AGENT, agent_calldata)])
+
+    assert report["gas_used"] == 16_000_000
+    assert report["overhead_gas"] == 1_000_000
+    assert report["near_block_gas_limit"] is True
+
+    (action,) = report["actions"]
+    assert action["gas_used"] == 15_000_000
+    assert action["opcodes"] == {"CALL": 2, "SLOAD": 2}
+    assert action["calls"]["children"][0]["self_gas"] == 4_000_000
+
+    assert report["hot_contracts"][0] == {"address": POOL, "self_gas": 10_000_000, "calls": 1}
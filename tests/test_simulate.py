@@ -0,0 +1,207 @@
+import io
+import json
+from pathlib import Path
+
+import boa
+import pytest
+from boa.vm.fork import CachingRPC
+from eth_utils import to_canonical_address, to_checksum_address
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+from curve_dao import transport
+from curve_dao.abi_cache import AbiCache
+from curve_dao.addresses import get_dao_voting_contract
+from curve_dao.batch_simulate import simulate_votes
+from curve_dao.calldata import encode_agent_execute
+from curve_dao.evm_script import build_evm_script
+from curve_dao.session import DaoSession
+from curve_dao.simulate import simulate
+
+CONTRACTS = Path(__file__).parent / "contracts"
+VOTING_ABI = Path(__file__).parents[1] / "contracts" / "Voting.json"
+RPC_URL = "http://localhost:8545"
+VOTING = to_checksum_address(get_dao_voting_contract("parameter"))
+AGENT = to_checksum_address("0x000000000000000000000000000000000000a9e7")
+TARGET = to_checksum_address("0x000000000000000000000000000000000000c0de")
+
+# every test forks into an env of its own, which boa's per-test anchor can't span
+pytestmark = pytest.mark.ignore_isolation
+
+
+class FakeForkNode:
+    """Node serving the state of a local boa env to the requests a fork makes."""
+
+    def __init__(self, env):
+        self.env = env
+        self.requests = 0
+
+    def send(self, adapter, request):
+        payload = json.loads(request.body)
+        if isinstance(payload, list):
+            body = [self._answer(call) for call in payload]
+        else:
+            body = self._answer(payload)
+        raw = HTTPResponse(
+            body=io.BytesIO(json.dumps(body).encode()),
+            status=200,
+            reason="OK",
+            preload_content=False,
+        )
+        return adapter.build_response(request, raw)
+
+    def _answer(self, call):
+        self.requests += 1
+        try:
+            return {"jsonrpc": "2.0", "id": call["id"], "result": self._result(call)}
+        except KeyError:
+            error = {"code": -32601, "message": f"the method {call['method']} does not exist"}
+            return {"jsonrpc": "2.0", "id": call["id"], "error": error}
+
+    def _result(self, call):
+        method, params = call["method"], call["params"]
+        if method == "eth_chainId":
+            return "0x1"
+        if method == "eth_getBlockByNumber":
+            return {
+                "number": hex(self.env.evm.patch.block_number),
+                "timestamp": hex(self.env.evm.patch.timestamp),
+                "parentHash": "0x" + "00" * 32,
+            }
+
+        state = self.env.evm.vm.state
+        address = to_canonical_address(params[0])
+        if method == "eth_getBalance":
+            return hex(state.get_balance(address))
+        if method == "eth_getTransactionCount":
+            return hex(state.get_nonce(address))
+        if method == "eth_getCode":
+            return "0x" + state.get_code(address).hex()
+        if method == "eth_getStorageAt":
+            value = state.get_storage(address, int(params[1], 16))
+            return "0x" + value.to_bytes(32, "big").hex()
+        raise KeyError(method)
+
+
+@pytest.fixture
+def chain():
+    """Env holding a parameter voting contract with a vote that passes and one that reverts."""
+    env = boa.Env()
+    with boa.swap_env(env):
+        voting = boa.load(CONTRACTS / "MockVoting.vy", override_address=VOTING)
+        boa.load(CONTRACTS / "MockAgent.vy", override_address=AGENT)
+        target = boa.load(CONTRACTS / "MockTarget.vy", override_address=TARGET)
+
+        for value in (42, 0):
+            calldata = target.set_value.prepare_calldata(value)
+            script = build_evm_script([(AGENT, encode_agent_execute(TARGET, calldata))])
+            voting.newVote(script, 10**24)
+    return env
+
+
+@pytest.fixture
+def fork_node(chain, tmp_path, monkeypatch):
+    node = FakeForkNode(chain)
+    monkeypatch.setattr(
+        HTTPAdapter, "send", lambda adapter, request, **kwargs: node.send(adapter, request)
+    )
+    # keep boa's on-disk fork cache out of the home directory and of other tests
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(CachingRPC, "_loaded", {})
+    return node
+
+
+@pytest.fixture
+def voting_abi_cache(tmp_path):
+    abi_cache = AbiCache(root=tmp_path / "cache", offline=True)
+    abi_cache.put(VOTING, json.loads(VOTING_ABI.read_text()))
+    return abi_cache
+
+
+@pytest.fixture
+def fork_env():
+    with boa.swap_env(boa.Env()):
+        yield
+
+
+def test_simulate_executes_vote(fork_node, voting_abi_cache, fork_env):
+    session = DaoSession(RPC_URL, block_identifier="latest", abi_cache=voting_abi_cache)
+
+    report = simulate(0, "parameter", session)
+
+    assert report.executed is True
+    assert report.block_number == fork_node.env.evm.patch.block_number
+    assert [log["address"] for log in report.logs] == [VOTING, TARGET]
+    (_, action) = report.state_diff
+    assert to_checksum_address(action["target"]) == AGENT
+    assert action["storage"] == {TARGET: {"0x0": {"before": "0x0", "after": "0x2a"}}}
+
+
+def test_simulate_profiles_recorded_writes(fork_node, voting_abi_cache, fork_env):
+    session = DaoSession(RPC_URL, block_identifier="latest", abi_cache=voting_abi_cache)
+
+    report = simulate(0, "parameter", session, profile=True)
+
+    (action,) = report.profile["actions"]
+    assert action["opcodes"]["SSTORE"] == 1
+    assert "0x55" not in action["opcodes"]
+    assert report.state_diff[1]["storage"] == {TARGET: {"0x0": {"before": "0x0", "after": "0x2a"}}}
+
+
+def test_simulate_reverting_vote(fork_node, voting_abi_cache, fork_env):
+    session = DaoSession(RPC_URL, block_identifier="latest", abi_cache=voting_abi_cache)
+
+    with pytest.raises(boa.BoaError):
+        simulate(1, "parameter", session)
+
+
+def test_simulate_votes(fork_node, voting_abi_cache, fork_env):
+    block_number = fork_node.env.evm.patch.block_number
+
+    # one worker runs all three jobs, on the same fork
+    reports = simulate_votes(
+        "parameter",
+        [0, 1, 0],
+        rpc_url=RPC_URL,
+        block_number=block_number,
+        abi_cache=voting_abi_cache,
+        workers=1,
+    )
+
+    assert [r.vote_id for r in reports] == [0, 1, 0]
+    assert all(r.block_number == block_number for r in reports)
+
+    executed, reverted, executed_again = reports
+    assert executed.executed is True and executed.error is None
+    assert reverted.executed is False
+    assert "zero value" in reverted.error
+
+    # the first execution was rolled back before the next job
+    assert executed_again.executed is True
+    assert executed_again.state_diff == executed.state_diff
+
+
+def test_simulate_replayed_from_cassette(fork_node, voting_abi_cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(transport, "_SESSION", None)
+    transport.use_cassette(tmp_path / "cassette", "record")
+    with boa.swap_env(boa.Env()):
+        session = DaoSession(RPC_URL, block_identifier="latest", abi_cache=voting_abi_cache)
+        recorded = simulate(0, "parameter", session)
+
+    # a fresh fork, without boa's on-disk cache of the first one or the network
+    transport.use_cassette(tmp_path / "cassette", "replay")
+    (tmp_path / "replay").mkdir()
+    monkeypatch.setenv("HOME", str(tmp_path / "replay"))
+    monkeypatch.setattr(CachingRPC, "_loaded", {})
+    monkeypatch.setattr(
+        HTTPAdapter,
+        "send",
+        lambda adapter, request, **kwargs: pytest.fail(f"request to the network: {request.url}"),
+    )
+    with boa.swap_env(boa.Env()):
+        session = DaoSession(RPC_URL, block_identifier="latest", abi_cache=voting_abi_cache)
+        replayed = simulate(0, "parameter", session)
+
+    assert replayed.block_number == recorded.block_number
+    assert replayed.logs == recorded.logs
+    assert replayed.state_diff == recorded.state_diff
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+CLI = ROOT / "scripts" / "decode_executable.py"
+
+# microseconds `--help` may spend importing; it takes ~40ms (click) on a
+# laptop, the headroom is for slow CI machines
+HELP_IMPORT_BUDGET = 300_000
+
+BACKENDS = {"boa", "vyper", "rich", "numpy", "eth_abi", "eth_utils", "requests"}
+
+
+def import_times(*args, cache_dir):
+    """Runs the CLI under `-X importtime`; returns the cumulative time of each top-level import."""
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join([str(ROOT), os.environ.get("PYTHONPATH", "")]),
+        CURVE_DAO_CACHE_DIR=str(cache_dir),
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", str(CLI), *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = (len(name) - len(name.lstrip()) == 1, int(cumulative))
+    return modules
+
+
+def loaded_backends(modules):
+    return BACKENDS & {name.split(".")[0] for name in modules}
+
+
+def test_help_is_fast(tmp_path):
+    modules = import_times("--help", cache_dir=tmp_path)
+
+    assert loaded_backends(modules) == set()
+    total = sum(cumulative for top_level, cumulative in modules.values() if top_level)
+    assert total < HELP_IMPORT_BUDGET
+
+
+@pytest.mark.parametrize("command", ["decode", "simulate", "stats", "watch"])
+def test_command_help_is_fast(tmp_path, command):
+    assert loaded_backends(import_times(command, "--help", cache_dir=tmp_path)) == set()
+
+
+def test_offline_decode_skips_boa(tmp_path):
+    modules = import_times(
+        "decode-script", "--offline", "--script", "0x00000001", cache_dir=tmp_path
+    )
+
+    assert loaded_backends(modules) <= {"rich", "eth_abi", "eth_utils", "requests"}
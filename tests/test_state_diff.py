@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+from curve_dao.state_diff import SSTORE, StorageRecorder
+
+from .conftest import PARAMETER_AGENT, POOL, POOL_OWNER
+
+VOTING = "0xBCfF8B0b9419b9A88c44546519b1e909cF330399"
+
+
+class FakeState:
+    def __init__(self):
+        self.storage = {}
+
+    def get_storage(self, address, slot):
+        return self.storage.get((address, slot), 0)
+
+
+class FakeComputation:
+    """Call frame exposing the parts of a py-evm computation the recorder uses."""
+
+    def __init__(self, state, to, data=b"", is_error=False):
+        self.state = state
+        address = bytes.fromhex(to[2:])
+        self.msg = SimpleNamespace(to=address, storage_address=address, data=data)
+        self.is_error = is_error
+        self.children = []
+        self._log_entries = []
+        self._stack = []
+
+    def stack_pop_ints(self, num_items):
+        return tuple(self._stack.pop() for _ in range(num_items))
+
+    def stack_push_int(self, value):
+        self._stack.append(value)
+
+    def sstore(self, computation_class, slot, value):
+        self.stack_push_int(value)
+        self.stack_push_int(slot)
+        computation_class.opcodes[SSTORE](computation=self)
+
+    def call(self, child):
+        self.children.append(child)
+        return child
+
+
+def original_sstore(computation):
+    slot, value = computation.stack_pop_ints(2)
+    computation.state.storage[(computation.msg.storage_address, slot)] = value
+
+
+class FakeComputationClass:
+    opcodes = {SSTORE: original_sstore}
+
+
+def test_writes_grouped_per_action():
+    state = FakeState()
+    state.storage[(bytes.fromhex(POOL[2:]), 1)] = 400
+
+    root = FakeComputation(state, VOTING)
+    agent_calldata = b"\xb6\x1d\x27\xf6" + b"\x01" * 32
+    agent = root.call(FakeComputation(state, PARAMETER_AGENT, agent_calldata))
+    owner = agent.call(FakeComputation(state, POOL_OWNER))
+    pool = owner.call(FakeComputation(state, POOL))
+    reverted = owner.call(FakeComputation(state, POOL, is_error=True))
+    pool._log_entries.append((1, bytes.fromhex(POOL[2:]), (7,), b"\x2a"))
+    root._log_entries.append((2, bytes.fromhex(VOTING[2:]), (9,), b""))
+
+    recorder = StorageRecorder(FakeComputationClass)
+    with recorder.record():
+        root.sstore(FakeComputationClass, 0, 1)
+        pool.sstore(FakeComputationClass, 1, 500)
+        pool.sstore(FakeComputationClass, 1, 600)
+        owner.sstore(FakeComputationClass, 2, 0)  # unchanged
+        reverted.sstore(FakeComputationClass, 3, 1)
+
+    assert FakeComputationClass.opcodes[SSTORE] is original_sstore
+
+    vote_group, action_group = recorder.diff(root, [(PARAMETER_AGENT, agent_calldata)])
+
+    assert vote_group["target"] is None
+    assert vote_group["storage"] == {VOTING: {"0x0": {"before": "0x0", "after": "0x1"}}}
+    assert [log["topics"] for log in vote_group["logs"]] == [["0x" + "00" * 31 + "09"]]
+
+    assert action_group["target"] == PARAMETER_AGENT
+    assert action_group["storage"] == {POOL: {"0x1": {"before": "0x190", "after": "0x258"}}}
+    assert action_group["logs"] == [
+        {"address": POOL, "topics": ["0x" + "00" * 31 + "07"], "data": "0x2a"}
+    ]
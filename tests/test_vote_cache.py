@@ -0,0 +1,120 @@
+import pytest
+
+import curve_dao.vote_cache as vote_cache
+from curve_dao.ipfs import DescriptionError
+from curve_dao.rpc import RpcError
+from curve_dao.session import DaoSession
+from curve_dao.vote_cache import VoteCache, get_vote_description, get_vote_result, is_final
+from curve_dao.vote_events import VoteEventStore
+from curve_dao.vote_record import VoteRecord
+from curve_dao.vote_utils import MissingVote
+
+from .conftest import VOTES
+
+IPFS_HASH = "QmVoteDescription"
+
+
+@pytest.fixture
+def lookup(fake_node, offline_abi_cache, tmp_path, monkeypatch):
+    # StartVote logs are served from the event store, descriptions from IPFS
+    store = VoteEventStore(tmp_path / "events.sqlite")
+    monkeypatch.setattr(store, "get_ipfs_hash", lambda vote_type, vote_id: IPFS_HASH)
+    monkeypatch.setattr(vote_cache, "get_vote_event_store", lambda: store)
+    monkeypatch.setattr(
+        vote_cache, "get_description_from_ipfs_hash", lambda h: f"description of {h}"
+    )
+
+    cache = VoteCache(root=tmp_path)
+    session = DaoSession(
+        "http://localhost:8545", block_identifier="latest", abi_cache=offline_abi_cache
+    )
+
+    def lookup(vote_id):
+        result = get_vote_result("parameter", vote_id, session, cache)
+        return result | {"description": get_vote_description("parameter", vote_id, cache)}
+
+    return lookup
+
+
+def test_final_vote_served_locally(lookup, fake_node):
+    result = lookup(0)
+    requests = fake_node.requests
+
+    assert result["final"] is True
+    assert result["vote"] == VoteRecord(*VOTES[0], fake_node.script)
+    assert result["vote_time"] == 604800
+    assert "commit_new_fee" in result["actions"][0]
+    assert result["description"] == f"description of {IPFS_HASH}"
+
+    assert lookup(0) == result
+    assert fake_node.requests == requests
+
+
+def test_open_vote_refreshed_with_one_call(lookup, fake_node):
+    result = lookup(1)
+    assert result["final"] is False
+
+    requests = fake_node.requests
+    fake_node.votes = {1: (*VOTES[1][:6], 5 * 10**23, *VOTES[1][7:])}
+
+    assert lookup(1)["vote"].yea == 5 * 10**23
+    assert fake_node.requests == requests + 1
+
+
+def test_ipfs_hash_lookup_failure(lookup, fake_node, monkeypatch):
+    def fail(*args):
+        raise RpcError("eth_getLogs: query timeout exceeded")
+
+    monkeypatch.setattr(vote_cache, "get_ipfs_hashes_from_votes", fail)
+    result = lookup(0)
+    assert result["ipfs_hash"] is None
+    assert result["description"] is None
+
+    # retried on the next call
+    monkeypatch.setattr(vote_cache, "get_ipfs_hashes_from_votes", lambda *args: {0: IPFS_HASH})
+    assert lookup(0)["description"] == f"description of {IPFS_HASH}"
+
+
+def test_final_vote_without_start_vote_log(lookup, fake_node, monkeypatch):
+    monkeypatch.setattr(vote_cache, "get_ipfs_hashes_from_votes", lambda *args: {})
+    assert lookup(0)["description"] is None
+
+    requests = fake_node.requests
+    monkeypatch.setattr(vote_cache, "get_ipfs_hashes_from_votes", pytest.fail)
+    assert lookup(0)["description"] is None
+    assert fake_node.requests == requests
+
+
+def test_description_fetched_once(lookup, monkeypatch):
+    assert lookup(0)["description"] == f"description of {IPFS_HASH}"
+
+    monkeypatch.setattr(vote_cache, "get_description_from_ipfs_hash", pytest.fail)
+    assert lookup(0)["description"] == f"description of {IPFS_HASH}"
+
+
+def test_description_fetch_failure(lookup, monkeypatch):
+    error = DescriptionError("IPFS timed out.  Possibly the description is no longer pinned.")
+    monkeypatch.setattr(vote_cache, "get_description_from_ipfs_hash", lambda h: error)
+    assert lookup(0)["description"] == error
+    assert lookup(1)["description"] == error
+
+    # kept for the final vote, retried for the open one
+    monkeypatch.setattr(
+        vote_cache, "get_description_from_ipfs_hash", lambda h: f"description of {h}"
+    )
+    assert lookup(0)["description"] == error
+    assert lookup(1)["description"] == f"description of {IPFS_HASH}"
+
+
+def test_missing_vote(lookup):
+    with pytest.raises(MissingVote):
+        lookup(2)
+
+
+def test_is_final():
+    assert is_final(VoteRecord(*VOTES[0], b""))
+    # passed but not executed yet
+    assert not is_final(VoteRecord(False, False, *VOTES[0][2:], b""))
+    # rejected
+    assert is_final(VoteRecord(False, False, *VOTES[1][2:], b""))
+    assert not is_final(VoteRecord(*VOTES[1], b""))
@@ -0,0 +1,69 @@
+import pytest
+
+from curve_dao.vote_record import VoteRecord
+from curve_dao.vote_utils import decode_vote_data
+
+# ownership vote 404, tallies as in ape/tests/test_vote_data.py
+VOTE_404 = (
+    False,
+    True,
+    1692475643,
+    17950218,
+    510000000000000000,
+    300000000000000000,
+    459475144503577289039481284,
+    0,
+    625546146444045385843289050,
+    b"\x00\x00\x00\x01",
+)
+
+
+def test_vote_record_fields():
+    vote = VoteRecord.from_tuple(VOTE_404)
+
+    assert vote.open is False
+    assert vote.executed is True
+    assert vote.start_date == 1692475643
+    assert vote.snapshot_block == 17950218
+    assert vote.yea == 459475144503577289039481284
+    assert vote.voting_power == 625546146444045385843289050
+    assert vote.script == b"\x00\x00\x00\x01"
+
+
+def test_vote_record_wrong_length():
+    with pytest.raises(ValueError):
+        VoteRecord.from_tuple(VOTE_404[:-1])
+
+
+def vote_data(yea, nay, voting_power):
+    return {
+        "yea": yea,
+        "nay": nay,
+        "votingPower": voting_power,
+        "open": False,
+        "executed": False,
+        "startDate": 1692475643,
+        "supportRequired": 510000000000000000,
+        "minAcceptQuorum": 300000000000000000,
+        "voteTime": 604800,
+    }
+
+
+def test_decode_vote_data():
+    vote = VoteRecord.from_tuple(VOTE_404)
+    results = decode_vote_data(vote_data(vote.yea, vote.nay, vote.voting_power), "ownership")
+
+    assert results["passed"] is True
+    assert results["support"] == 10**18
+    assert results["quorum"] == vote.yea * 10**18 // vote.voting_power
+    assert results["end"] == 1692475643 + 604800
+    assert "Support[/]: 100.00% (Required: 51.00%)" in results["formatted_output"]
+    assert "Quorum[/]: 73.45% (Minimum: 30.00%)" in results["formatted_output"]
+
+
+def test_decode_vote_data_threshold_is_exclusive():
+    # exactly 51% support does not pass
+    results = decode_vote_data(vote_data(51 * 10**24, 49 * 10**24, 10**26), "ownership")
+
+    assert results["passed"] is False
+    assert "Support Not Met" in results["formatted_output"]
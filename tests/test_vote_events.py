@@ -0,0 +1,153 @@
+import pytest
+
+from curve_dao.addresses import get_dao_voting_contract
+from curve_dao.ipfs import get_ipfs_hash_from_vote_id
+from curve_dao.rpc import RpcError
+from curve_dao.vote_events import (
+    CAST_VOTE_TOPIC,
+    EXECUTE_VOTE_TOPIC,
+    GENESIS_BLOCK,
+    START_VOTE_TOPIC,
+    VoteEventIndexer,
+    VoteEventStore,
+)
+
+try:
+    from eth_abi import encode_abi
+except ImportError:
+    from eth_abi import encode as encode_abi
+
+CREATOR = "0x7a16fF8270133F063aAb6C9977183D9e72835428"
+VOTER = "0x989AEb4d175e16225E39E87d0D97A3360524AD80"
+
+
+def _topic(value):
+    if isinstance(value, str):
+        return "0x" + bytes.fromhex(value[2:]).rjust(32, b"\x00").hex()
+    return "0x" + value.to_bytes(32, "big").hex()
+
+
+def _log(block, index, topics, types, values):
+    return {
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": _topic(block * 1000 + index),
+        "topics": topics,
+        "data": "0x" + encode_abi(types, values).hex(),
+    }
+
+
+def start_vote(block, vote_id, ipfs_hash):
+    return _log(
+        block,
+        0,
+        [START_VOTE_TOPIC, _topic(vote_id), _topic(CREATOR)],
+        ["string", "uint256", "uint256", "uint256", "uint256"],
+        [f"ipfs:{ipfs_hash}", 2500 * 10**18, 0, 600_000_000 * 10**18, 10**24],
+    )
+
+
+def cast_vote(block, index, vote_id, voter, supports, stake):
+    return _log(
+        block,
+        index,
+        [CAST_VOTE_TOPIC, _topic(vote_id), _topic(voter)],
+        ["bool", "uint256"],
+        [supports, stake],
+    )
+
+
+def execute_vote(block, vote_id):
+    return _log(block, 0, [EXECUTE_VOTE_TOPIC, _topic(vote_id)], [], [])
+
+
+class FakeLogsNode:
+    def __init__(self, logs, head, max_range=None):
+        self.logs = logs
+        self.head = head
+        self.max_range = max_range
+        self.requests = []
+
+    def call(self, method, params=None):
+        if method == "eth_blockNumber":
+            return hex(self.head)
+
+        query = params[0]
+        from_block, to_block = int(query["fromBlock"], 16), int(query["toBlock"], 16)
+        self.requests.append((from_block, to_block))
+        if self.max_range and to_block - from_block + 1 > self.max_range:
+            raise RpcError("query returned more than 10000 results")
+
+        voting = query["address"].lower()
+        return [
+            log
+            for log_voting, log in self.logs
+            if log_voting == voting and from_block <= int(log["blockNumber"], 16) <= to_block
+        ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return VoteEventStore(tmp_path / "events.sqlite")
+
+
+@pytest.fixture
+def node():
+    voting = get_dao_voting_contract("ownership").lower()
+    logs = [
+        (voting, start_vote(GENESIS_BLOCK + 100, 7, "QmVote7")),
+        (voting, cast_vote(GENESIS_BLOCK + 150, 3, 7, VOTER, True, 10**24)),
+        (voting, cast_vote(GENESIS_BLOCK + 150, 5, 7, CREATOR, False, 3 * 10**23)),
+        (voting, execute_vote(GENESIS_BLOCK + 60_000, 7)),
+    ]
+    return FakeLogsNode(logs, head=GENESIS_BLOCK + 70_000)
+
+
+def test_index_and_query(node, store):
+    indexer = VoteEventIndexer(node, store, confirmations=12)
+    indexer.sync(["ownership"])
+
+    assert store.get_checkpoint("ownership") == node.head - 12
+    assert store.get_ipfs_hash("ownership", 7) == "QmVote7"
+    assert store.get_start_vote("ownership", 7)["creator"] == CREATOR
+    assert store.is_executed("ownership", 7)
+
+    casts = store.get_casts("ownership", 7)
+    assert [(c["voter"], c["supports"], int(c["stake"])) for c in casts] == [
+        (VOTER, 1, 10**24),
+        (CREATOR, 0, 3 * 10**23),
+    ]
+    assert len(store.get_voter_history(VOTER.lower())) == 1
+
+    # other contracts and votes are untouched
+    assert store.get_ipfs_hash("parameter", 7) is None
+    assert store.get_checkpoint("parameter") is None
+
+
+def test_sync_resumes_from_checkpoint(node, store):
+    VoteEventIndexer(node, store).sync(["ownership"], to_block=GENESIS_BLOCK + 50_000)
+    assert not store.is_executed("ownership", 7)
+
+    node.requests.clear()
+    VoteEventIndexer(node, store).sync(["ownership"], to_block=GENESIS_BLOCK + 65_000)
+
+    assert node.requests[0][0] == GENESIS_BLOCK + 50_001
+    assert store.is_executed("ownership", 7)
+    # re-indexed logs don't duplicate rows
+    assert len(store.get_casts("ownership", 7)) == 2
+
+
+def test_block_range_shrinks_on_node_limit(node, store):
+    node.max_range = 3000
+    indexer = VoteEventIndexer(node, store, block_range=10_000)
+    indexer.sync(["ownership"], to_block=GENESIS_BLOCK + 20_000)
+
+    assert indexer.block_range == 2500
+    assert store.get_ipfs_hash("ownership", 7) == "QmVote7"
+
+
+def test_ipfs_hash_lookup_uses_index(node, store):
+    VoteEventIndexer(node, store).sync(["ownership"])
+
+    # no session: the lookup must not touch the node
+    assert get_ipfs_hash_from_vote_id("ownership", 7, event_store=store) == "QmVote7"
@@ -0,0 +1,48 @@
+import pytest
+
+from curve_dao.addresses import get_dao_voting_contract
+from curve_dao.multicall import aggregate
+from curve_dao.rpc import RpcClient
+from curve_dao.voting_reader import VotingParams, VotingReader, _selector
+
+
+@pytest.fixture(params=[True, False], ids=["multicall", "batch"])
+def reader(request, fake_node):
+    return VotingReader.for_vote_type(
+        RpcClient("http://localhost:8545"), "parameter", use_multicall=request.param
+    )
+
+
+def test_get_params(reader, fake_node):
+    assert reader.get_params() == VotingParams(
+        votes_length=2,
+        vote_time=604800,
+        support_required_pct=3 * 10**17,
+        min_accept_quorum_pct=15 * 10**16,
+    )
+    assert fake_node.requests == 1
+
+
+def test_get_votes(reader, fake_node):
+    votes = reader.get_votes(range(100))
+
+    assert fake_node.requests == 1
+    assert votes[0].executed is True
+    assert votes[1].open is True
+    assert votes[2:] == [None] * 98
+
+
+def test_can_execute(reader, fake_node):
+    assert reader.can_execute([0, 1, 2]) == [True, False, False]
+
+
+def test_multicall_chunks_share_one_request(fake_node):
+    voting = get_dao_voting_contract("parameter")
+    get_vote = _selector("getVote(uint256)")
+    calls = [(voting, get_vote + i.to_bytes(32, "big")) for i in range(50)]
+
+    results = aggregate(RpcClient("http://localhost:8545"), calls, chunk_size=10)
+
+    assert len(results) == 50
+    assert results[0] is not None and results[2] is None
+    assert fake_node.requests == 1
@@ -0,0 +1,95 @@
+import pytest
+import requests
+
+from curve_dao.addresses import get_dao_voting_contract
+from curve_dao.rpc import RpcClient
+from curve_dao.transport import get_session
+from curve_dao.vote_events import GENESIS_BLOCK, VoteEventIndexer, VoteEventStore
+import curve_dao.watch as watch
+from curve_dao.watch import VoteWatcher
+
+from .conftest import VOTES, FakeResponse, FakeVotingNode
+from .test_vote_events import VOTER, FakeLogsNode, cast_vote, execute_vote, start_vote
+
+
+@pytest.fixture
+def node(monkeypatch, parameter_vote_script):
+    """Serves eth_getLogs and eth_blockNumber from a FakeLogsNode, eth_calls from a FakeVotingNode."""
+    voting = get_dao_voting_contract("parameter").lower()
+    logs_node = FakeLogsNode(
+        [
+            (voting, start_vote(GENESIS_BLOCK + 100, 1, "QmVote1")),
+            (voting, cast_vote(GENESIS_BLOCK + 150, 0, 1, VOTER, True, 10**24)),
+            (voting, execute_vote(GENESIS_BLOCK + 25_000, 1)),
+        ],
+        head=GENESIS_BLOCK + 30_000,
+    )
+    voting_node = FakeVotingNode(VOTES, parameter_vote_script)
+
+    def post(url, json, timeout):
+        if isinstance(json, dict) and json["method"] != "eth_call":
+            return FakeResponse(
+                {"id": json["id"], "result": logs_node.call(json["method"], json["params"])}
+            )
+        return voting_node.post(url, json, timeout)
+
+    monkeypatch.setattr(get_session(), "post", post)
+    return logs_node
+
+
+@pytest.fixture
+def watcher(node, offline_abi_cache, tmp_path):
+    store = VoteEventStore(tmp_path / "events.sqlite")
+    indexer = VoteEventIndexer(RpcClient("http://localhost:8545"), store, confirmations=0)
+    return VoteWatcher(indexer, offline_abi_cache, ["parameter"], poll_interval=0)
+
+
+def test_poll_decodes_new_votes(watcher, node):
+    events = list(watcher.poll())
+
+    assert [(e["event"], e["vote_id"]) for e in events] == [
+        ("StartVote", 1),
+        ("CastVote", 1),
+        ("ExecuteVote", 1),
+    ]
+    assert all(e["vote_type"] == "parameter" for e in events)
+    assert events[0]["metadata"] == "ipfs:QmVote1"
+    assert events[0]["actions"][0]["function"] == "commit_new_fee"
+    assert events[1]["voter"] == VOTER and events[1]["stake"] == 10**24
+
+    # resumes from the checkpoint
+    assert watcher.indexer.store.get_checkpoint("parameter") == node.head
+    assert list(watcher.poll()) == []
+
+
+def test_range_checkpointed_once_consumed(watcher, node):
+    watcher.indexer.block_range = 10_000
+    events = watcher.poll()
+
+    assert next(events)["event"] == "StartVote"
+    assert next(events)["event"] == "CastVote"
+    # the first range is still unacknowledged
+    assert watcher.indexer.store.get_checkpoint("parameter") is None
+
+    assert next(events)["event"] == "ExecuteVote"
+    # the first two ranges are acknowledged, the one being consumed is not
+    assert watcher.indexer.store.get_checkpoint("parameter") == GENESIS_BLOCK + 19_999
+
+
+def test_start_at(watcher, node):
+    watcher.start_at(GENESIS_BLOCK + 200)
+
+    assert [e["event"] for e in watcher.poll()] == ["ExecuteVote"]
+
+
+def test_etherscan_failure(watcher, node, monkeypatch):
+    def timeout(script, abi_cache):
+        raise requests.Timeout("api.etherscan.io: read timed out")
+
+    monkeypatch.setattr(watch, "decode_script_actions", timeout)
+    events = list(watcher.poll())
+
+    # the vote is still reported, without its actions
+    assert [e["event"] for e in events] == ["StartVote", "CastVote", "ExecuteVote"]
+    assert "actions" not in events[0]
+    assert events[0]["error"] == "api.etherscan.io: read timed out"